@@ -21,22 +21,19 @@ def unregister():
     reg.unregister_classes()
 
 
-# When refreshing the addon, reload all modules
+# When refreshing the addon, drop all loaded submodules so that they get
+# imported fresh. Tool implementations are only imported again once used
 if locals().get('LOADED'):
     LOADED = False
-    from importlib import reload
+    from importlib import import_module
     from sys import modules
 
-    modules[__name__] = reload(modules[__name__])
-    to_reload = {}
-    for name, module in modules.items():
-        if name.startswith(f"{__package__}."):
-            to_reload[name] = module
+    for name in [n for n in modules if n.startswith(f"{__package__}.")]:
+        del modules[name]
 
-    for name, module in to_reload.items():
-        globals()[name] = reload(module)
+    reg = import_module(".register", __package__)
 
-    del reload, modules
+    del import_module, modules
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,337 @@
+"""Headless batch runner
+
+Applies the add-on's tools to a list of .blend files, each in its own
+background Blender process, and writes a JSON report with timings and
+errors per file.
+
+Usage (plain python or inside blender):
+    python batch.py --blender <blender> --tools <tool>[,<tool>...]
+        [--jobs N] [--report report.json] [--save] <file.blend> [...]
+
+    blender --background --python batch.py -- --tools <tool>[,<tool>...]
+        <file.blend> [...]
+
+Available tools: remove_empty, remove_unused, bake_cyclic,
+symmetrize_action, symmetrize_lattice
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+ADDON_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ADDON_MODULE = "blender_tools_113d"
+
+
+###############################################################################
+# worker side, runs inside of blender
+
+def load_addon():
+    """Loads and registers the add-on from the directory of this file"""
+
+    if ADDON_MODULE in sys.modules:
+        return sys.modules[ADDON_MODULE]
+
+    spec = importlib.util.spec_from_file_location(
+        ADDON_MODULE,
+        os.path.join(ADDON_DIRECTORY, "__init__.py"),
+        submodule_search_locations=[ADDON_DIRECTORY])
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_MODULE] = module
+    spec.loader.exec_module(module)
+    module.register()
+    return module
+
+
+def _call_operator(operator, **properties):
+    if not operator.poll():
+        return {'CANCELLED'}, "Operator can not run in this context"
+
+    result = operator('EXEC_DEFAULT', **properties)
+
+    if 'CANCELLED' in result:
+        return result, "Operator was cancelled"
+
+    return result, None
+
+
+def _run_operator(operator, objects, **properties):
+    import bpy
+
+    # nothing to do for this tool
+    if len(objects) == 0:
+        return set(), None
+
+    with bpy.context.temp_override(
+            active_object=objects[0],
+            object=objects[0],
+            selected_objects=objects,
+            selected_editable_objects=objects):
+
+        return _call_operator(operator, **properties)
+
+
+def _tool_remove_empty(scene):
+    import bpy
+
+    return [_run_operator(
+        bpy.ops.t113d.remove_empty_groups,
+        [o for o in scene.objects
+         if o.type == 'MESH' and len(o.vertex_groups) > 0])]
+
+
+def _tool_remove_unused(scene):
+    import bpy
+
+    return [_run_operator(
+        bpy.ops.t113d.remove_unused_weights,
+        [o for o in scene.objects
+         if len(o.vertex_groups) > 0
+         and any(m.type == 'ARMATURE' for m in o.modifiers)],
+        mode='SCENE')]
+
+
+def _tool_bake_cyclic(scene):
+    import bpy
+
+    # works on the actions of the file, which do not need any objects
+    if len(bpy.data.actions) == 0:
+        return [(set(), None)]
+
+    return [_call_operator(bpy.ops.t113d.bake_cyclic_action, mode='ALL')]
+
+
+def _tool_symmetrize_action(scene):
+    import bpy
+
+    results = []
+    for obj in scene.objects:
+        if (obj.type != 'ARMATURE'
+                or obj.animation_data is None
+                or obj.animation_data.action is None):
+            continue
+
+        frame_range = obj.animation_data.action.frame_range
+        results.append(_run_operator(
+            bpy.ops.t113d.symmetrize_action,
+            [obj],
+            use_custom_offset=True,
+            custom_offset=(frame_range[1] - frame_range[0]) * 0.5))
+
+    return results
+
+
+def _tool_symmetrize_lattice(scene):
+    import bpy
+
+    return [_run_operator(
+        bpy.ops.t113d.symmetrize_lattice,
+        [o for o in scene.objects if o.type == 'LATTICE'])]
+
+
+TOOLS = {
+    "remove_empty": _tool_remove_empty,
+    "remove_unused": _tool_remove_unused,
+    "bake_cyclic": _tool_bake_cyclic,
+    "symmetrize_action": _tool_symmetrize_action,
+    "symmetrize_lattice": _tool_symmetrize_lattice,
+}
+
+
+def _run_worker(args):
+    import bpy
+
+    report = {"file": bpy.data.filepath, "tools": []}
+
+    try:
+        load_addon()
+
+        for tool in args.tools:
+            start = time.perf_counter()
+            entry = {"tool": tool, "error": None}
+
+            try:
+                results = TOOLS[tool](bpy.context.scene)
+                errors = [e for _, e in results if e is not None]
+                entry["results"] = [sorted(r) for r, _ in results]
+                if len(errors) > 0:
+                    entry["error"] = "; ".join(errors)
+
+            except Exception:
+                entry["error"] = traceback.format_exc()
+
+            entry["time"] = time.perf_counter() - start
+            report["tools"].append(entry)
+
+        if args.save:
+            bpy.ops.wm.save_mainfile()
+
+    except Exception:
+        report["error"] = traceback.format_exc()
+
+    with open(args.result, "w", encoding="utf-8") as file:
+        json.dump(report, file)
+
+
+###############################################################################
+# controller side, distributes the files over worker processes
+
+def _process_file(args, filepath: str):
+    handle, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+
+    command = [
+        args.blender,
+        "--background",
+        "--factory-startup",
+        filepath,
+        "--python", os.path.abspath(__file__),
+        "--",
+        "--worker",
+        "--result", result_path,
+        "--tools", ",".join(args.tools)]
+
+    if args.save:
+        command.append("--save")
+
+    start = time.perf_counter()
+    entry = {"file": filepath, "tools": [], "error": None}
+
+    try:
+        process = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=args.timeout)
+
+        entry["returncode"] = process.returncode
+
+        with open(result_path, encoding="utf-8") as file:
+            content = file.read()
+
+        if len(content) == 0:
+            entry["error"] = (
+                "Worker did not produce a result:\n" + process.stderr[-4000:])
+        else:
+            result = json.loads(content)
+            entry["tools"] = result["tools"]
+            entry["error"] = result.get("error")
+
+    except subprocess.TimeoutExpired:
+        entry["error"] = f"Timed out after {args.timeout} seconds"
+
+    finally:
+        os.remove(result_path)
+
+    entry["time"] = time.perf_counter() - start
+    entry["success"] = (
+        entry["error"] is None
+        and all(t["error"] is None for t in entry["tools"]))
+
+    status = "OK" if entry["success"] else "FAILED"
+    print(f"[{status}] {filepath} ({entry['time']:.2f}s)", flush=True)
+
+    return entry
+
+
+def _run_controller(args):
+    files = [os.path.abspath(f) for f in args.files]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        entries = list(pool.map(lambda f: _process_file(args, f), files))
+
+    report = {
+        "blender": args.blender,
+        "tools": args.tools,
+        "jobs": args.jobs,
+        "time": time.perf_counter() - start,
+        "files": entries,
+    }
+
+    with open(args.report, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    failed = sum(not e["success"] for e in entries)
+    print(
+        f"Processed {len(entries)} file(s), {failed} failed,"
+        f" report written to {args.report}")
+
+    return 1 if failed > 0 else 0
+
+
+def _get_default_blender():
+    try:
+        import bpy
+        return bpy.app.binary_path
+    except ImportError:
+        return "blender"
+
+
+def _parse_tools(value: str):
+    tools = [t.strip() for t in value.split(",") if len(t.strip()) > 0]
+
+    for tool in tools:
+        if tool not in TOOLS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown tool \"{tool}\", choose from {', '.join(TOOLS)}")
+
+    return tools
+
+
+def _parse_args(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        description="Applies tools to .blend files in background processes")
+
+    parser.add_argument("files", nargs="*", help=".blend files to process")
+    parser.add_argument(
+        "--tools", type=_parse_tools, required=True,
+        help="comma separated tools to apply, in order")
+    parser.add_argument(
+        "--blender", default=_get_default_blender(),
+        help="blender executable used for the workers")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of blender processes to run in parallel")
+    parser.add_argument(
+        "--timeout", type=float, default=None,
+        help="seconds after which a file is considered failed")
+    parser.add_argument(
+        "--report", default="batch_report.json",
+        help="path of the JSON report")
+    parser.add_argument(
+        "--save", action="store_true",
+        help="save the processed files")
+
+    parser.add_argument(
+        "--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+
+def main():
+    # when run through blender, only arguments after "--" are ours
+    argv = sys.argv[1:]
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+
+    args = _parse_args(argv)
+
+    if args.worker:
+        _run_worker(args)
+        return 0
+
+    return _run_controller(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
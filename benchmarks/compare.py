@@ -0,0 +1,71 @@
+"""Compares two benchmark result files
+
+Usage:
+    python benchmarks/compare.py <baseline.json> <current.json>
+        [--threshold 0.1]
+
+Exits with 1 if the median time of any case regressed by more than the
+threshold (relative).
+"""
+
+import argparse
+import json
+import sys
+
+
+def _load(path: str):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="relative median slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    baseline = _load(args.baseline)
+    current = _load(args.current)
+
+    for name in ("size", "blender"):
+        if baseline["meta"].get(name) != current["meta"].get(name):
+            print(
+                f"Warning: {name} differs"
+                f" ({baseline['meta'].get(name)}"
+                f" vs {current['meta'].get(name)})")
+
+    regressions = []
+    print(f"{'case':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+
+    for name, case in current["cases"].items():
+        base_case = baseline["cases"].get(name)
+        if base_case is None or "error" in base_case or "error" in case:
+            print(f"{name:<32}{'-':>12}{'-':>12}{'-':>10}")
+            continue
+
+        base_time = base_case["median"]
+        time = case["median"]
+        change = (time - base_time) / base_time if base_time > 0 else 0
+
+        marker = ""
+        if change > args.threshold:
+            regressions.append(name)
+            marker = " !"
+
+        print(
+            f"{name:<32}{base_time * 1000:>10.2f}ms{time * 1000:>10.2f}ms"
+            f"{change:>+10.1%}{marker}")
+
+    if len(regressions) > 0:
+        print(f"Regressed: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
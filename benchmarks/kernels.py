@@ -0,0 +1,214 @@
+"""Kernel microbenchmarks
+
+Times the bpy independent algorithms of the add-on, as well as the cyclic
+bake on stand-in keyframe data, in plain python. Uses blender's modules
+when run inside of blender, and the stand-ins in standin/ otherwise.
+
+Usage:
+    python benchmarks/kernels.py [--repeat N] [--output results.json]
+
+The results use the same format as run_benchmarks.py, so they can be
+compared with compare.py.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+
+try:
+    import bpy
+except ImportError:
+    sys.path.insert(0, os.path.join(BENCHMARK_DIRECTORY, "standin"))
+    import bpy
+
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
+
+from source import kernels  # noqa: E402
+from source.bake_cyclic_action import BakeCyclicAction  # noqa: E402
+
+
+class _BakeOperator(BakeCyclicAction, bpy.types.Operator):
+    bl_idname = "t113d.bake_cyclic_action"
+    mode = 'ACTIVE'
+    use_reduce = False
+    reduce_tolerance = 0.001
+
+
+###############################################################################
+# cases, each a setup returning the function to time
+
+def _setup_pairing():
+    names = []
+    for i in range(2000):
+        names.extend((f"bone_{i}.L", f"bone_{i}.R", f"bone_{i}_mid"))
+
+    def run():
+        kernels.get_symmetrized_name.cache_clear()
+        kernels.BonePairingTable(names)
+
+    return run
+
+
+def _setup_lattice_mirror():
+    rng = np.random.default_rng(0)
+    coordinates = rng.normal(0, 1, (64 ** 3, 3)).astype(np.float32)
+
+    def run():
+        kernels.get_mirror_map.cache_clear()
+        mirror_map = kernels.get_mirror_map((64, 64, 64), 'X', 'POSITIVE')
+        kernels.mirror_coordinates(coordinates, mirror_map, 'X')
+
+    return run
+
+
+def _setup_empty_groups():
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, 250, 4_000_000, dtype=np.int32)
+
+    def run():
+        kernels.get_empty_groups(np.unique(groups), 500)
+
+    return run
+
+
+def _setup_cycle_repeats():
+    frames = np.arange(0, 101, dtype=np.float32)
+    interpolations = np.full(len(frames), 2, dtype=np.int32)
+
+    def run():
+        for target in range(-10_000, 0, 7):
+            kernels.get_cycle_repeats(
+                frames, interpolations, {2}, target, 0.0, 100.0)
+
+    return run
+
+
+def _setup_reduce():
+    frames = np.arange(0, 2001, dtype=np.float64)
+    values = np.sin(frames / 100 * 2 * np.pi)
+    slopes = np.cos(frames / 100 * 2 * np.pi) * 2 * np.pi / 100
+
+    co = np.column_stack((frames, values))
+    handle_offsets = np.column_stack((np.full(len(frames), 1 / 3), slopes / 3))
+    bezier = np.ones(len(frames), dtype=bool)
+
+    def run():
+        for _ in range(10):
+            kernels.reduce_keyframes(
+                co, co - handle_offsets, co + handle_offsets, bezier, 0.001)
+
+    return run
+
+
+def _setup_bake():
+    bpy.data.actions.clear()
+
+    action = bpy.data.actions.new("Cyclic")
+    action.use_cyclic = True
+    action.use_frame_range = True
+    action.frame_start = 0
+    action.frame_end = 2000.5
+
+    rng = np.random.default_rng(0)
+    frames = np.arange(0, 101, dtype=np.float32)
+
+    for i in range(100):
+        fcurve = action.fcurves.new(f"[\"prop_{i}\"]")
+        values = rng.normal(0, 1, len(frames)).astype(np.float32)
+        values[-1] = values[0]
+
+        fcurve.keyframe_points.add(len(frames))
+        fcurve.keyframe_points.foreach_set(
+            "co", np.column_stack((frames, values)).ravel())
+        fcurve.modifiers.new('CYCLES')
+
+    operator = _BakeOperator()
+
+    def run():
+        operator._divisible_interpolations = {0, 1, 2}
+        if operator._bake_action(action) is None:
+            raise RuntimeError(operator._error_message)
+
+    return run
+
+
+CASES = {
+    "kernel_pairing": _setup_pairing,
+    "kernel_lattice_mirror": _setup_lattice_mirror,
+    "kernel_empty_groups": _setup_empty_groups,
+    "kernel_cycle_repeats": _setup_cycle_repeats,
+    "kernel_reduce": _setup_reduce,
+    "kernel_bake": _setup_bake,
+}
+
+
+###############################################################################
+
+def _run_case(setup, repeat: int):
+    times = []
+    for _ in range(repeat):
+        run = setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Times the add-on's kernels in plain python")
+    parser.add_argument(
+        "--repeat", type=int, default=5,
+        help="number of timed runs per case")
+    parser.add_argument(
+        "--output", default="kernel_results.json",
+        help="path of the JSON results")
+
+    argv = sys.argv[1:]
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "blender": bpy.app.version_string,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "timestamp": datetime.datetime.now().isoformat(),
+            "size": "kernels",
+            "repeat": args.repeat,
+        },
+        "cases": {},
+    }
+
+    for name, setup in CASES.items():
+        case = _run_case(setup, args.repeat)
+        results["cases"][name] = case
+        print(f"{name}: {case['median'] * 1000:.2f} ms", flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""Operator benchmarks
+
+Generates synthetic workloads, times the execution of every operator of
+the add-on on them and writes the results as JSON, which can be compared
+between versions with compare.py.
+
+Usage:
+    blender --background --factory-startup
+        --python benchmarks/run_benchmarks.py --
+        [--size small|medium|large] [--repeat N] [--filter <text>]
+        [--output results.json]
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import bpy
+import numpy as np
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+
+for directory in (ROOT_DIRECTORY, BENCHMARK_DIRECTORY):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+import batch  # noqa: E402
+import scenes  # noqa: E402
+
+
+###############################################################################
+# cases, each a setup returning (operator, objects, properties)
+
+def _select(obj: bpy.types.Object, ratio: float):
+    mesh = obj.data
+    selected = np.random.default_rng(0).random(len(mesh.vertices)) < ratio
+    mesh.vertices.foreach_set("select", selected)
+    mesh.use_paint_mask_vertex = True
+    obj.vertex_groups.active_index = 0
+
+
+def _setup_remove_empty(size):
+    obj = scenes.create_weighted_mesh(size)
+    return bpy.ops.t113d.remove_empty_groups, [obj], {}
+
+
+def _setup_remove_unused(size):
+    obj = scenes.create_weighted_mesh(size, bound=True)
+    return bpy.ops.t113d.remove_unused_weights, [obj], {"mode": 'SCENE'}
+
+
+def _setup_cleanup_weights(normalize: bool):
+    # normalizing writes distinct weights, one group call per assignment,
+    # removals alone only take one call per group
+    def setup(size):
+        obj = scenes.create_weighted_mesh(size)
+        return (
+            bpy.ops.t113d.cleanup_weights,
+            [obj],
+            {"threshold": 0.15, "limit": 2, "normalize": normalize})
+
+    return setup
+
+
+def _setup_average_weight(group_mode, use_islands: bool = False):
+    def setup(size):
+        obj = scenes.create_weighted_mesh(size)
+        _select(obj, 0.1)
+        return (
+            bpy.ops.paint_weight.average,
+            [obj],
+            {"group_mode": group_mode, "use_islands": use_islands})
+
+    return setup
+
+
+def _setup_smooth_weights(size):
+    obj = scenes.create_weighted_mesh(size)
+    _select(obj, 0.5)
+    return (
+        bpy.ops.paint_weight.smooth_selected,
+        [obj],
+        {"group_mode": 'ALL', "iterations": 20})
+
+
+def _setup_mirror_weights(warm: bool):
+    def setup(size):
+        obj = scenes.create_weighted_mesh(size)
+
+        # pairs of .L/.R groups on the mesh that is symmetric along X
+        for group in obj.vertex_groups:
+            side = "LR"[group.index % 2]
+            group.name = f"bone_{group.index // 2}.{side}"
+
+        mirror_weights = importlib.import_module(
+            batch.ADDON_MODULE + ".source.mirror_weights")
+        caches = importlib.import_module(
+            batch.ADDON_MODULE + ".source.caches")
+
+        # the new mesh may get the address of a removed one
+        caches.clear_all()
+        if warm:
+            mirror_weights.get_vertex_mirror(obj.data, 0, 0.001)
+
+        return (
+            bpy.ops.t113d.mirror_weights,
+            [obj],
+            {"axis": 'X', "tolerance": 0.001})
+
+    return setup
+
+
+def _setup_symmetrize_lattice(size):
+    obj = scenes.create_lattice(size)
+    return (
+        bpy.ops.t113d.symmetrize_lattice,
+        [obj],
+        {"shape_keys": 'ALL'})
+
+
+def _setup_bake_cyclic(reduce: bool):
+    def setup(size):
+        obj = scenes.create_cyclic_action_object(size)
+        return (
+            bpy.ops.t113d.bake_cyclic_action,
+            [obj],
+            {"mode": 'ACTIVE', "use_reduce": reduce})
+
+    return setup
+
+
+def _setup_symmetrize_action(incremental: bool):
+    def setup(size):
+        obj = scenes.create_animated_armature(size)
+        properties = {
+            "method": 'DIRECT',
+            "use_incremental": incremental,
+            "use_custom_offset": True,
+            "custom_offset": size["keyframes"] * 0.5,
+        }
+
+        if incremental:
+            # first run stores the fingerprints, the timed one skips
+            _execute(bpy.ops.t113d.symmetrize_action, [obj], properties)
+
+        return bpy.ops.t113d.symmetrize_action, [obj], properties
+
+    return setup
+
+
+CASES = {
+    "remove_empty": _setup_remove_empty,
+    "remove_unused": _setup_remove_unused,
+    "cleanup_weights": _setup_cleanup_weights(True),
+    "cleanup_weights_remove_only": _setup_cleanup_weights(False),
+    "average_weight_active": _setup_average_weight('ACTIVE'),
+    "average_weight_all": _setup_average_weight('ALL'),
+    # the sparse random selection splits into many small islands
+    "average_weight_islands": _setup_average_weight('ALL', True),
+    "smooth_weights": _setup_smooth_weights,
+    "mirror_weights": _setup_mirror_weights(False),
+    "mirror_weights_cached": _setup_mirror_weights(True),
+    "symmetrize_lattice": _setup_symmetrize_lattice,
+    "bake_cyclic": _setup_bake_cyclic(False),
+    "bake_cyclic_reduced": _setup_bake_cyclic(True),
+    "symmetrize_action": _setup_symmetrize_action(False),
+    "symmetrize_action_incremental": _setup_symmetrize_action(True),
+}
+
+
+###############################################################################
+
+def _execute(operator, objects, properties):
+    with bpy.context.temp_override(
+            active_object=objects[0],
+            object=objects[0],
+            selected_objects=objects,
+            selected_editable_objects=objects):
+
+        start = time.perf_counter()
+        result = operator('EXEC_DEFAULT', **properties)
+        duration = time.perf_counter() - start
+
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"{operator.idname_py()} returned {result}")
+
+    return duration
+
+
+def _run_case(setup, size: dict, repeat: int):
+    times = []
+
+    for _ in range(repeat):
+        scenes.clear_data()
+        operator, objects, properties = setup(size)
+        times.append(_execute(operator, objects, properties))
+
+    # separate run for memory, as tracing slows down python code
+    scenes.clear_data()
+    operator, objects, properties = setup(size)
+
+    tracemalloc.start()
+    _execute(operator, objects, properties)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    scenes.clear_data()
+
+    return {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "python_peak_memory": peak,
+    }
+
+
+def _get_max_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # kilobytes on linux, bytes on macos
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        description="Times the add-on's operators on synthetic workloads")
+
+    parser.add_argument(
+        "--size", choices=scenes.SIZES, default="small",
+        help="workload size preset")
+    parser.add_argument(
+        "--repeat", type=int, default=5,
+        help="number of timed runs per case")
+    parser.add_argument(
+        "--filter", default="",
+        help="only run cases whose name contains this text")
+    parser.add_argument(
+        "--output", default="benchmark_results.json",
+        help="path of the JSON results")
+
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = []
+    if "--" in sys.argv:
+        argv = sys.argv[sys.argv.index("--") + 1:]
+
+    args = _parse_args(argv)
+    size = scenes.SIZES[args.size]
+
+    addon = batch.load_addon()
+
+    results = {
+        "meta": {
+            "blender": bpy.app.version_string,
+            "addon": ".".join(str(v) for v in addon.bl_info["version"]),
+            "commit": _get_git_commit(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "timestamp": datetime.datetime.now().isoformat(),
+            "size": args.size,
+            "repeat": args.repeat,
+        },
+        "cases": {},
+    }
+
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+
+        print(f"{name}...", end=" ", flush=True)
+        try:
+            case = _run_case(setup, size, args.repeat)
+            print(f"{case['median'] * 1000:.2f} ms", flush=True)
+        except Exception as error:
+            case = {"error": str(error)}
+            print(f"FAILED: {error}", flush=True)
+
+        results["cases"][name] = case
+
+    results["meta"]["max_rss"] = _get_max_rss()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"Results written to {args.output}")
+    return 1 if any("error" in c for c in results["cases"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
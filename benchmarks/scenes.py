@@ -0,0 +1,259 @@
+"""Synthetic workloads for the benchmarks"""
+
+import math
+import bpy
+import numpy as np
+
+SIZES = {
+    "small": {
+        "vertices": 10_000,
+        "groups": 100,
+        "lattice": 16,
+        "shape_keys": 2,
+        "bones": 20,
+        "keyframes": 100,
+        "bake_curves": 100,
+        "bake_repeats": 10,
+    },
+    "medium": {
+        "vertices": 500_000,
+        "groups": 300,
+        "lattice": 32,
+        "shape_keys": 4,
+        "bones": 100,
+        "keyframes": 1000,
+        "bake_curves": 1000,
+        "bake_repeats": 50,
+    },
+    "large": {
+        "vertices": 2_000_000,
+        "groups": 500,
+        "lattice": 64,
+        "shape_keys": 8,
+        "bones": 300,
+        "keyframes": 2000,
+        "bake_curves": 3000,
+        "bake_repeats": 100,
+    },
+}
+
+# transform channels and their array lengths animated on every bone
+CHANNELS = (
+    ("location", 3),
+    ("rotation_quaternion", 4),
+    ("scale", 3),
+)
+
+
+def clear_data():
+    """Removes all data created by the workloads"""
+    ids = []
+    for collection in (
+            bpy.data.objects,
+            bpy.data.meshes,
+            bpy.data.lattices,
+            bpy.data.armatures,
+            bpy.data.actions):
+        ids.extend(collection)
+
+    bpy.data.batch_remove(ids)
+
+
+def _link(name: str, data):
+    obj = bpy.data.objects.new(name, data)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def create_grid_mesh(name: str, vertex_count: int):
+    """Creates a quad grid centered on the origin, symmetric along X"""
+
+    size = max(2, math.ceil(math.sqrt(vertex_count)))
+
+    xs, ys = np.meshgrid(np.linspace(-1, 1, size), np.linspace(-1, 1, size))
+    co = np.column_stack(
+        (xs.ravel(), ys.ravel(), np.zeros(size * size))).astype(np.float32)
+
+    indices = np.arange(size * size).reshape(size, size)
+    quads = np.stack((
+        indices[:-1, :-1],
+        indices[:-1, 1:],
+        indices[1:, 1:],
+        indices[1:, :-1]), axis=-1).reshape(-1, 4)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set("vertex_index", quads.ravel().astype(np.int32))
+
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set(
+        "loop_start", np.arange(0, quads.size, 4, dtype=np.int32))
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set(
+            "loop_total", np.full(len(quads), 4, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+    mesh.validate()
+
+    return _link(name, mesh)
+
+
+def add_vertex_groups(
+        obj: bpy.types.Object,
+        group_count: int,
+        groups_per_vertex: int = 4,
+        empty_ratio: float = 0.5):
+    """Adds vertex groups, of which the first (1 - empty_ratio) get weights
+    assigned, each vertex being in several consecutive groups"""
+
+    vertex_count = len(obj.data.vertices)
+    used_count = max(1, int(group_count * (1 - empty_ratio)))
+    vertices = np.arange(vertex_count)
+
+    for g in range(group_count):
+        group = obj.vertex_groups.new(name=f"bone_{g}")
+        if g >= used_count:
+            continue
+
+        mask = (vertices - g) % used_count < groups_per_vertex
+        indices = np.flatnonzero(mask)
+        group.add(indices.tolist(), (g % 10 + 1) / 10, 'REPLACE')
+
+
+def create_armature(name: str, bone_names: list[str]):
+    armature = bpy.data.armatures.new(name)
+    obj = _link(name, armature)
+
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+
+    for i, bone_name in enumerate(bone_names):
+        bone = armature.edit_bones.new(bone_name)
+        x = (i % 2 * 2 - 1) * (1 + i // 2 * 0.01)
+        bone.head = (x, 0, 0)
+        bone.tail = (x, 0, 1)
+
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+
+def create_weighted_mesh(size: dict, bound: bool = False):
+    obj = create_grid_mesh("Mesh", size["vertices"])
+    add_vertex_groups(obj, size["groups"])
+
+    if bound:
+        # only every other group has a deforming bone
+        armature = create_armature(
+            "Armature",
+            [f"bone_{g}" for g in range(0, size["groups"], 2)])
+
+        modifier = obj.modifiers.new("Armature", 'ARMATURE')
+        modifier.object = armature
+
+    return obj
+
+
+def create_lattice(size: dict):
+    resolution = size["lattice"]
+
+    lattice = bpy.data.lattices.new("Lattice")
+    lattice.points_u = resolution
+    lattice.points_v = resolution
+    lattice.points_w = resolution
+
+    obj = _link("Lattice", lattice)
+
+    rng = np.random.default_rng(0)
+    count = len(lattice.points)
+
+    co = np.empty(count * 3, dtype=np.float32)
+    lattice.points.foreach_get("co_deform", co)
+    lattice.points.foreach_set(
+        "co_deform", co + rng.normal(0, 0.01, co.shape).astype(np.float32))
+
+    obj.shape_key_add(name="Basis")
+    for i in range(size["shape_keys"]):
+        key_block = obj.shape_key_add(name=f"Key {i}")
+        key_block.data.foreach_set(
+            "co", co + rng.normal(0, 0.05, co.shape).astype(np.float32))
+
+    return obj
+
+
+def _fill_fcurve(
+        fcurve: bpy.types.FCurve,
+        frames: np.ndarray,
+        values: np.ndarray):
+
+    co = np.column_stack((frames, values)).astype(np.float32)
+    fcurve.keyframe_points.add(len(co))
+    fcurve.keyframe_points.foreach_set("co", co.ravel())
+    fcurve.update()
+
+
+def create_animated_armature(size: dict):
+    """Armature with animated left side bones, for symmetrizing"""
+
+    bone_names = []
+    for i in range(size["bones"]):
+        bone_names.extend((f"bone_{i}.L", f"bone_{i}.R"))
+
+    obj = create_armature("Rig", bone_names)
+
+    action = bpy.data.actions.new("Symmetrize")
+    obj.animation_data_create().action = action
+
+    keyframes = size["keyframes"]
+    frames = np.arange(keyframes, dtype=np.float64)
+    rng = np.random.default_rng(0)
+
+    for i in range(size["bones"]):
+        bone_name = f"bone_{i}.L"
+        for channel, length in CHANNELS:
+            for index in range(length):
+                fcurve = action.fcurves.new(
+                    f"pose.bones[\"{bone_name}\"].{channel}",
+                    index=index,
+                    action_group=bone_name)
+
+                _fill_fcurve(fcurve, frames, rng.normal(0, 1, keyframes))
+
+                if index == 0 and i % 4 == 0:
+                    fcurve.modifiers.new('CYCLES')
+
+    return obj
+
+
+def create_cyclic_action_object(size: dict):
+    """Object with a cyclic action covering several cycles, for baking"""
+
+    obj = _link("Cyclic", None)
+
+    action = bpy.data.actions.new("Cyclic")
+    obj.animation_data_create().action = action
+
+    keyframes = max(2, size["keyframes"] // 10)
+    frames = np.arange(keyframes, dtype=np.float64)
+    rng = np.random.default_rng(0)
+
+    for i in range(size["bake_curves"]):
+        if i < 3:
+            fcurve = action.fcurves.new("location", index=i)
+        else:
+            fcurve = action.fcurves.new(f"[\"prop_{i}\"]", index=0)
+
+        values = rng.normal(0, 1, keyframes)
+        values[-1] = values[0]
+
+        _fill_fcurve(fcurve, frames, values)
+        fcurve.modifiers.new('CYCLES')
+
+    action.use_frame_range = True
+    action.use_cyclic = True
+    action.frame_start = 0
+    action.frame_end = (keyframes - 1) * size["bake_repeats"] + 0.5
+
+    return obj
@@ -0,0 +1,14 @@
+"""Placeholder for blender's bmesh module, so that the modules using it can
+be imported. Mesh data is not backed by the stand-ins"""
+
+
+def new():
+    raise NotImplementedError("bmesh is not available outside of blender")
+
+
+def from_edit_mesh(mesh):
+    raise NotImplementedError("bmesh is not available outside of blender")
+
+
+def update_edit_mesh(mesh):
+    raise NotImplementedError("bmesh is not available outside of blender")
@@ -0,0 +1,35 @@
+"""Minimal stand-in for the parts of blender's python API that the add-on
+uses, so that its modules can be imported and its keyframe code run in
+plain python.
+
+Only keyframe data (actions, fcurves, keyframe points and modifiers) is
+actually backed by storage. Everything else only exists so that the
+modules can be imported. Put the parent directory on sys.path before
+importing the add-on's modules to use it.
+"""
+
+from . import app, msgbus, path, props, types, utils
+
+
+class _Actions(list):
+
+    def new(self, name: str):
+        action = types.Action(name)
+        self.append(action)
+        return action
+
+    def remove(self, action):
+        super().remove(action)
+
+
+class _Data:
+
+    def __init__(self):
+        self.actions = _Actions()
+
+
+context = types.Context()
+data = _Data()
+
+__all__ = ["app", "context", "data", "msgbus", "path", "props", "types",
+           "utils"]
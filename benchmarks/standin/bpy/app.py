@@ -0,0 +1,19 @@
+import tempfile
+
+
+class _Handlers:
+
+    def __init__(self):
+        self.load_post = []
+
+    @staticmethod
+    def persistent(function):
+        return function
+
+
+binary_path = ""
+background = True
+tempdir = tempfile.gettempdir()
+version = (0, 0, 0)
+version_string = "stand-in"
+handlers = _Handlers()
@@ -0,0 +1,6 @@
+def subscribe_rna(key, owner, args, notify, options=set()):
+    pass
+
+
+def clear_by_owner(owner):
+    pass
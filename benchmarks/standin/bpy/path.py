@@ -0,0 +1,5 @@
+import os
+
+
+def abspath(path: str):
+    return os.path.abspath(path)
@@ -0,0 +1,19 @@
+"""Properties only get recorded as (function, keywords), like the deferred
+properties of blender before a class is registered"""
+
+
+def _deferred(name: str):
+    def function(**keywords):
+        return (function, keywords)
+
+    function.__name__ = name
+    return function
+
+
+BoolProperty = _deferred("BoolProperty")
+CollectionProperty = _deferred("CollectionProperty")
+EnumProperty = _deferred("EnumProperty")
+FloatProperty = _deferred("FloatProperty")
+IntProperty = _deferred("IntProperty")
+PointerProperty = _deferred("PointerProperty")
+StringProperty = _deferred("StringProperty")
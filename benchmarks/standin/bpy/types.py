@@ -0,0 +1,477 @@
+"""Stand-in types. Keyframe data is stored in numpy arrays, the same way
+foreach_get and foreach_set expose it in blender. Types that are not
+defined here resolve to empty placeholder classes"""
+
+import contextlib
+import copy
+import numpy as np
+from mathutils import Vector
+
+
+class bpy_struct:
+    pass
+
+
+###############################################################################
+# registrable types
+
+class Operator(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_description = ""
+    bl_options = set()
+
+    def __init__(self, **properties):
+        self.reports = []
+        for name, value in properties.items():
+            setattr(self, name, value)
+
+    def report(self, type: set, message: str):
+        self.reports.append((next(iter(type)), message))
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class AddonPreferences(bpy_struct):
+    bl_idname = ""
+
+
+class Menu(bpy_struct):
+
+    @classmethod
+    def append(cls, draw_function):
+        pass
+
+    @classmethod
+    def prepend(cls, draw_function):
+        pass
+
+    @classmethod
+    def remove(cls, draw_function):
+        pass
+
+
+class Panel(bpy_struct):
+    pass
+
+
+###############################################################################
+# context
+
+class _Preferences:
+
+    def __init__(self):
+        self.addons = {}
+
+
+class Context(bpy_struct):
+
+    def __init__(self):
+        self.active_object = None
+        self.object = None
+        self.selected_objects = []
+        self.selected_editable_objects = []
+        self.mode = 'OBJECT'
+        self.scene = None
+        self.view_layer = None
+        self.area = None
+        self.blend_data = None
+        self.preferences = _Preferences()
+
+    @contextlib.contextmanager
+    def temp_override(self, **overrides):
+        previous = {name: getattr(self, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                setattr(self, name, value)
+
+
+class Event(bpy_struct):
+    pass
+
+
+###############################################################################
+# keyframes
+
+class _EnumItem:
+
+    def __init__(self, identifier: str, value: int):
+        self.identifier = identifier
+        self.value = value
+
+
+class _Property:
+
+    def __init__(self, enum_items: tuple[str, ...] = ()):
+        self.enum_items = {
+            identifier: _EnumItem(identifier, value)
+            for value, identifier in enumerate(enum_items)}
+
+
+class _RNA:
+
+    def __init__(self, properties: dict[str, _Property]):
+        self.properties = properties
+
+
+# enum items in the order of their values in blender
+HANDLE_TYPES = ('FREE', 'AUTO', 'VECTOR', 'ALIGNED', 'AUTO_CLAMPED')
+INTERPOLATIONS = (
+    'CONSTANT', 'LINEAR', 'BEZIER', 'SINE', 'QUAD', 'CUBIC', 'QUART',
+    'QUINT', 'EXPO', 'CIRC', 'BACK', 'BOUNCE', 'ELASTIC')
+EASINGS = ('AUTO', 'EASE_IN', 'EASE_OUT', 'EASE_IN_OUT')
+KEYFRAME_TYPES = (
+    'KEYFRAME', 'EXTREME', 'BREAKDOWN', 'JITTER', 'MOVING_HOLD')
+
+# name: (array type, values per keyframe, default, enum items)
+KEYFRAME_STORAGE = {
+    "co": (np.float32, 2, 0.0, None),
+    "handle_left": (np.float32, 2, 0.0, None),
+    "handle_right": (np.float32, 2, 0.0, None),
+    "handle_left_type": (np.int32, 1, 4, HANDLE_TYPES),
+    "handle_right_type": (np.int32, 1, 4, HANDLE_TYPES),
+    "interpolation": (np.int32, 1, 2, INTERPOLATIONS),
+    "easing": (np.int32, 1, 0, EASINGS),
+    "type": (np.int32, 1, 0, KEYFRAME_TYPES),
+    "amplitude": (np.float32, 1, 0.8, None),
+    "back": (np.float32, 1, 1.70158, None),
+    "period": (np.float32, 1, 4.1, None),
+    "select_control_point": (np.bool_, 1, True, None),
+    "select_left_handle": (np.bool_, 1, True, None),
+    "select_right_handle": (np.bool_, 1, True, None),
+}
+
+_VECTORS = ("co", "handle_left", "handle_right")
+
+
+class _VectorView:
+    """Writable view of a 2D vector of a keyframe"""
+
+    def __init__(self, array: np.ndarray, index: int):
+        self._array = array
+        self._index = index
+
+    @property
+    def x(self):
+        return float(self._array[self._index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._array[self._index, 0] = value
+
+    @property
+    def y(self):
+        return float(self._array[self._index, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._array[self._index, 1] = value
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index: int):
+        return float(self._array[self._index, index])
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __add__(self, other):
+        return Vector(self) + other
+
+    def __sub__(self, other):
+        return Vector(self) - other
+
+
+class Keyframe(bpy_struct):
+    bl_rna = _RNA({
+        name: _Property(items or ())
+        for name, (_, _, _, items) in KEYFRAME_STORAGE.items()})
+
+    def __init__(self, points: "FCurveKeyframePoints", index: int):
+        object.__setattr__(self, "_points", points)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name: str):
+        if name == "co_ui":
+            name = "co"
+
+        array = self._points._data[name]
+        if name in _VECTORS:
+            return _VectorView(array, self._index)
+
+        value = array[self._index]
+        items = KEYFRAME_STORAGE[name][3]
+        if items is not None:
+            return items[int(value)]
+
+        return value.item()
+
+    def __setattr__(self, name: str, value):
+        data = self._points._data
+        index = self._index
+
+        if name == "co_ui":
+            # moves the handles along with the control point
+            offset = np.asarray(tuple(value), np.float32) - data["co"][index]
+            for vector in _VECTORS:
+                data[vector][index] += offset
+            return
+
+        items = KEYFRAME_STORAGE[name][3]
+        if items is not None:
+            value = items.index(value)
+        elif name in _VECTORS:
+            value = tuple(value)
+
+        data[name][index] = value
+
+
+class FCurveKeyframePoints(bpy_struct):
+
+    def __init__(self):
+        self._data = {
+            name: np.zeros((0, size) if size > 1 else 0, dtype=dtype)
+            for name, (dtype, size, _, _) in KEYFRAME_STORAGE.items()}
+
+    def __len__(self):
+        return len(self._data["co"])
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("keyframe index out of range")
+        return Keyframe(self, index)
+
+    def __iter__(self):
+        return (Keyframe(self, i) for i in range(len(self)))
+
+    def add(self, count: int = 1):
+        for name, (dtype, size, default, _) in KEYFRAME_STORAGE.items():
+            shape = (count, size) if size > 1 else count
+            self._data[name] = np.concatenate(
+                (self._data[name], np.full(shape, default, dtype=dtype)))
+
+    def clear(self):
+        for name, array in self._data.items():
+            self._data[name] = array[:0]
+
+    def _reorder(self, order: np.ndarray):
+        for name, array in self._data.items():
+            self._data[name] = array[order]
+
+    def sort(self):
+        self._reorder(np.argsort(self._data["co"][:, 0], kind='stable'))
+
+    def insert(self, frame: float, value: float, options=set(),
+               keyframe_type='KEYFRAME'):
+        # like blender, keyframes within the threshold only get their value
+        # replaced, keeping their frame
+        frames = self._data["co"][:, 0]
+        existing = np.flatnonzero(np.abs(frames - frame) < 0.01)
+
+        if len(existing) > 0:
+            keyframe = Keyframe(self, int(existing[0]))
+            keyframe.co_ui = (keyframe.co.x, value)
+            return keyframe
+
+        self.add(1)
+        index = len(self) - 1
+        for name in _VECTORS:
+            self._data[name][index] = (frame, value)
+
+        self.sort()
+        return self[int(np.flatnonzero(
+            self._data["co"][:, 0] == np.float32(frame))[0])]
+
+    def remove(self, keyframe: Keyframe, fast: bool = False):
+        keep = np.ones(len(self), dtype=bool)
+        keep[keyframe._index] = False
+        self._reorder(keep)
+
+    def foreach_get(self, name: str, seq):
+        seq[:] = self._data[name].ravel()
+
+    def foreach_set(self, name: str, seq):
+        array = self._data[name]
+        if len(seq) != array.size:
+            raise RuntimeError(
+                f"foreach_set: expected {array.size} values, got {len(seq)}")
+
+        self._data[name] = np.asarray(seq, dtype=array.dtype).reshape(
+            array.shape)
+
+
+###############################################################################
+# fcurves and actions
+
+class FModifier(bpy_struct):
+
+    def __init__(self, type: str):
+        self.type = type
+        self.active = True
+        self.mute = False
+        self.show_expanded = True
+        self.use_restricted_range = False
+        self.use_influence = False
+        self.influence = 1.0
+
+        # cycles
+        self.mode_before = 'REPEAT'
+        self.mode_after = 'REPEAT'
+        self.cycles_before = 0
+        self.cycles_after = 0
+
+
+class FModifierCycles(FModifier):
+    pass
+
+
+class FCurveModifiers(list):
+
+    def new(self, type: str):
+        modifier = FModifier(type)
+        self.append(modifier)
+        return modifier
+
+
+class FCurve(bpy_struct):
+
+    def __init__(self, data_path: str, index: int = 0, group=None):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = group
+        self.keyframe_points = FCurveKeyframePoints()
+        self.modifiers = FCurveModifiers()
+        self.select = False
+        self.hide = False
+        self.lock = False
+        self.mute = False
+        self.extrapolation = 'CONSTANT'
+
+    def update(self):
+        self.keyframe_points.sort()
+
+    def evaluate(self, frame: float):
+        """Evaluates the curve with linear interpolation between keyframes
+        (constant for constant ones), which is enough for the frames the
+        tools sample. Cycles modifiers wrap the frame into the cycle"""
+
+        data = self.keyframe_points._data
+        frames = data["co"][:, 0].astype(np.float64)
+        values = data["co"][:, 1].astype(np.float64)
+
+        if len(frames) == 0:
+            return 0.0
+
+        if (any(m.type == 'CYCLES' for m in self.modifiers)
+                and frames[-1] > frames[0]):
+            cycle = frames[-1] - frames[0]
+            frame = frames[0] + (frame - frames[0]) % cycle
+
+        index = int(np.searchsorted(frames, frame, side='right')) - 1
+        if index < 0:
+            return float(values[0])
+        if index >= len(frames) - 1:
+            return float(values[-1])
+
+        interpolation = INTERPOLATIONS[data["interpolation"][index]]
+        if interpolation == 'CONSTANT':
+            return float(values[index])
+
+        factor = (frame - frames[index]) / (frames[index + 1] - frames[index])
+        return float(
+            values[index] + (values[index + 1] - values[index]) * factor)
+
+
+class ActionFCurves(list):
+
+    def new(self, data_path: str, index: int = 0, action_group: str = ""):
+        if self.find(data_path, index=index) is not None:
+            raise RuntimeError(
+                f"F-Curve '{data_path}[{index}]' already exists")
+
+        fcurve = FCurve(data_path, index, action_group or None)
+        self.append(fcurve)
+        return fcurve
+
+    def find(self, data_path: str, index: int = 0):
+        for fcurve in self:
+            if fcurve.data_path == data_path and fcurve.array_index == index:
+                return fcurve
+        return None
+
+
+class Action(bpy_struct):
+
+    def __init__(self, name: str):
+        self.name = name
+        self.fcurves = ActionFCurves()
+        self.id_root = 'OBJECT'
+        self.use_fake_user = False
+        self.use_frame_range = False
+        self.use_cyclic = False
+        self.frame_start = 0.0
+        self.frame_end = 0.0
+        self._properties = {}
+
+    @property
+    def frame_range(self):
+        if self.use_frame_range:
+            return (self.frame_start, max(self.frame_end, self.frame_start))
+
+        frames = [
+            float(f.keyframe_points._data["co"][i, 0])
+            for f in self.fcurves if len(f.keyframe_points) > 0
+            for i in (0, -1)]
+
+        if len(frames) == 0:
+            return (0.0, 0.0)
+        return (min(frames), max(frames))
+
+    def copy(self):
+        import bpy
+
+        result = copy.deepcopy(self)
+        bpy.data.actions.append(result)
+        return result
+
+    def get(self, key, default=None):
+        return self._properties.get(key, default)
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def __contains__(self, key):
+        return key in self._properties
+
+
+###############################################################################
+
+_placeholders: dict[str, type] = {}
+
+
+def __getattr__(name: str):
+    """Any other type resolves to an empty placeholder class, so that type
+    annotations and menus can be used"""
+
+    if name.startswith("__"):
+        raise AttributeError(name)
+
+    result = _placeholders.get(name)
+    if result is None:
+        base = Menu if "_MT_" in name else bpy_struct
+        result = _placeholders[name] = type(name, (base,), {})
+
+    return result
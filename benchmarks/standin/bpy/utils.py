@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+
+def register_class(cls):
+    pass
+
+
+def unregister_class(cls):
+    pass
+
+
+def user_resource(resource_type: str, *, path: str = "", create=False):
+    result = os.path.join(
+        tempfile.gettempdir(), "standin", resource_type.lower(), path)
+    if create:
+        os.makedirs(result, exist_ok=True)
+    return result
@@ -0,0 +1,34 @@
+"""Minimal stand-in for blender's mathutils module"""
+
+
+class Vector(tuple):
+
+    def __new__(cls, values=(0.0, 0.0, 0.0)):
+        return super().__new__(cls, (float(v) for v in values))
+
+    @property
+    def x(self):
+        return self[0]
+
+    @property
+    def y(self):
+        return self[1]
+
+    @property
+    def z(self):
+        return self[2]
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __mul__(self, scalar: float):
+        return Vector(a * scalar for a in self)
+
+    def __neg__(self):
+        return Vector(-a for a in self)
+
+    def copy(self):
+        return Vector(self)
@@ -1,22 +1,27 @@
 import bpy
 
+# only the lightweight modules get imported here, the tool implementations
+# get imported once their operator is first used
 from .source import (
-    average_weight,
-    remove_empty_weights,
-    remove_unused_weights,
-    symmetrize_action,
-    symmetrize_lattice,
-    bake_cyclic_action,
+    operators,
+    bone_pairing,
+    caches,
+    preferences,
     menus
 )
 
 classes = [
-    average_weight.T113D_OT_AverageWeight,
-    remove_empty_weights.T113D_OT_RemoveEmptyWeights,
-    remove_unused_weights.T113D_OT_RemoveUnusedWeights,
-    symmetrize_lattice.T113D_OT_SymmetryizeLattice,
-    bake_cyclic_action.T113D_OT_BakeCyclicAction,
-    symmetrize_action.T113D_OT_SymmetrizeAction
+    preferences.T113D_Preferences,
+    operators.T113D_OT_AverageWeight,
+    operators.T113D_OT_SmoothWeights,
+    operators.T113D_OT_RemoveEmptyWeights,
+    operators.T113D_OT_RemoveUnusedWeights,
+    operators.T113D_OT_CleanupWeights,
+    operators.T113D_OT_MirrorWeights,
+    operators.T113D_OT_SymmetryizeLattice,
+    operators.T113D_OT_BakeCyclicAction,
+    operators.T113D_PG_SymmetrizeActionEntry,
+    operators.T113D_OT_SymmetrizeAction
 ]
 
 
@@ -27,11 +32,15 @@ def register_classes():
         bpy.utils.register_class(cls)
 
     menus.attach_menus()
+    bone_pairing.register()
+    caches.register()
 
 
 def unregister_classes():
     """Unloading classes loaded in register(), as well as various cleanup"""
 
+    caches.unregister()
+    bone_pairing.unregister()
     menus.detach_menus()
 
     for cls in classes:
@@ -1,12 +1,11 @@
 import bpy
+import numpy as np
 
+from . import instrumentation, kernels, vertex_weights
 
-class T113D_OT_AverageWeight(bpy.types.Operator):
-    """Average the weights of the selected vertices"""
-    bl_idname = "paint_weight.average"
-    bl_label = "Average weight"
-    bl_description = "Average the weights of the selected vertices"
-    bl_options = {'UNDO'}
+
+class AverageWeight:
+    """Implementation of operators.T113D_OT_AverageWeight"""
 
     @classmethod
     def poll(cls, context):
@@ -15,31 +14,142 @@ class T113D_OT_AverageWeight(bpy.types.Operator):
             active is not None
             and active.type == "MESH"
             and len(active.vertex_groups) > 0
-            and active.data.use_paint_mask
-            or active.data.use_paint_mask_vertex
-            and active.vertex_groups.active is not None
+            and (active.data.use_paint_mask
+                 or active.data.use_paint_mask_vertex)
         )
 
+    def _get_groups(self, obj: bpy.types.Object):
+        if self.group_mode == 'ACTIVE':
+            active = obj.vertex_groups.active
+            return [] if active is None else [active]
+
+        groups = [g for g in obj.vertex_groups if not g.lock_weight]
+
+        if self.group_mode == 'BONES':
+            bone_names = vertex_weights.get_object_deform_bone_names(
+                obj, selected_only=True)
+            groups = [g for g in groups if g.name in bone_names]
+
+        return groups
+
+    @staticmethod
+    def _get_edges(mesh: bpy.types.Mesh):
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        return edges.reshape(-1, 2)
+
+    def _average_islands(
+            self,
+            obj: bpy.types.Object,
+            groups: list[bpy.types.VertexGroup],
+            selected: np.ndarray):
+
+        mesh: bpy.types.Mesh = obj.data
+        islands, island_count = kernels.get_islands(
+            self._get_edges(mesh), selected)
+
+        previous = vertex_weights.read_vertex_weights(mesh)
+        vertices, group_indices, weights = previous
+
+        group_count = len(groups)
+        group_slots = np.full(
+            max(int(group_indices.max(initial=-1)) + 1,
+                max(g.index for g in groups) + 1),
+            -1)
+        group_slots[[g.index for g in groups]] = np.arange(group_count)
+
+        # sums and assignment counts per (island, group)
+        slots = group_slots[group_indices]
+        mask = selected[vertices] & (slots >= 0)
+        cells = islands[vertices[mask]] * group_count + slots[mask]
+
+        size = island_count * group_count
+        sums = np.bincount(cells, weights[mask], minlength=size)
+        assigned = np.bincount(cells, minlength=size) > 0
+
+        island_sizes = np.bincount(islands[selected], minlength=island_count)
+        averages = sums / np.repeat(island_sizes, group_count)
+
+        # the active group always gets the selection assigned, other groups
+        # only on islands where any selected vertex was in them
+        if self.group_mode == 'ACTIVE':
+            assigned[:] = True
+
+        # every selected vertex receives the averages of its island
+        rows = np.flatnonzero(selected)
+        new_vertices = np.repeat(rows, group_count)
+        new_cells = (
+            np.repeat(islands[rows], group_count) * group_count
+            + np.tile(np.arange(group_count), len(rows)))
+
+        new_assigned = assigned[new_cells]
+        new_vertices = new_vertices[new_assigned]
+        new_cells = new_cells[new_assigned]
+
+        group_array = np.array([g.index for g in groups])
+        keep = ~(selected[vertices] & (slots >= 0))
+
+        vertices = np.concatenate((vertices[keep], new_vertices))
+        order = np.argsort(vertices, kind='stable')
+
+        vertex_weights.write_vertex_weights(
+            obj,
+            previous,
+            vertices[order],
+            np.concatenate((
+                group_indices[keep],
+                group_array[new_cells % group_count].astype(
+                    group_indices.dtype)))[order],
+            np.concatenate((
+                weights[keep],
+                averages[new_cells].astype(weights.dtype)))[order],
+            selected)
+
+        return island_count
+
+    @instrumentation.instrumented
     def execute(self, context):
 
         active = context.active_object
-        if active.data.use_paint_mask or active.data.use_paint_mask_vertex:
-            group = active.vertex_groups.active
+        mesh: bpy.types.Mesh = active.data
+
+        groups = self._get_groups(active)
+        if len(groups) == 0:
+            self.report({'WARNING'}, "No vertex groups to average")
+            return {'CANCELLED'}
+
+        selected = np.zeros(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+
+        indices = np.flatnonzero(selected)
+        if len(indices) == 0:
+            return {'CANCELLED'}
+
+        if self.use_islands:
+            island_count = self._average_islands(active, groups, selected)
+            self.report({'INFO'}, f"Averaged {island_count} island(s)")
+            return {'FINISHED'}
+
+        vertices, group_indices, weights = \
+            vertex_weights.read_vertex_weights(mesh)
+
+        mask = selected[vertices]
+        group_indices = group_indices[mask]
+        weights = weights[mask]
 
-            selected_verts = [v for v in active.data.vertices if v.select]
+        minlength = len(active.vertex_groups)
+        sums = np.bincount(group_indices, weights, minlength=minlength)
+        assigned = np.bincount(group_indices, minlength=minlength)
 
-            weight = 0
-            indices = []
-            for v in selected_verts:
-                try:
-                    weight += group.weight(v.index)
-                except RuntimeError:
-                    weight = weight
-                indices.append(v.index)
+        averages = sums / len(indices)
+        indices = indices.tolist()
 
-            weight /= len(selected_verts)
+        for group in groups:
+            # the active group always gets the selection assigned,
+            # other groups only if any selected vertex was in them
+            if self.group_mode != 'ACTIVE' and assigned[group.index] == 0:
+                continue
 
-            for v in selected_verts:
-                group.add(indices, weight, 'REPLACE')
+            group.add(indices, float(averages[group.index]), 'REPLACE')
 
         return {'FINISHED'}
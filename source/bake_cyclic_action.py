@@ -1,28 +1,32 @@
 import bpy
+import numpy as np
 from bpy.types import Context
 from mathutils import Vector
-import math
 
+from . import instrumentation, kernels
+from .keyframe_snapshot import (
+    KeyframeSnapshot,
+    VALUE_PROPERTIES,
+    get_enum_value
+)
 
-class T113D_OT_BakeCyclicAction(bpy.types.Operator):
-    bl_idname = "t113d.bake_cyclic_action"
-    bl_label = "Bake cyclic action"
-    bl_description = (
-        "bakes the cyclic action so that keyframes"
-        " are only in the actions frame range"
-    )
-    bl_options = {'UNDO'}
+BAKED_SUFFIX = "_baked"
+
+# custom property marking baked actions, holding the name of the source
+BAKED_PROPERTY = "t113d_baked_from"
+
+
+class BakeCyclicAction:
+    """Implementation of operators.T113D_OT_BakeCyclicAction"""
 
     _error_message: str
+    _divisible_interpolations: set[int]
+    # baked action: (keyframes before, keyframes after reduction)
+    _reduced: dict[bpy.types.Action, tuple[int, int]]
 
     @classmethod
     def poll(cls, context):
-        return (
-            context.mode in ["OBJECT", "POSE"]
-            and context.active_object is not None
-            and context.active_object.animation_data is not None
-            and context.active_object.animation_data.action is not None
-        )
+        return context.mode in ["OBJECT", "POSE"]
 
     @staticmethod
     def _verify_modifiers(fcurve: bpy.types.FCurve):
@@ -46,43 +50,32 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
         )
 
     @staticmethod
-    def _get_keyframe_before(fcurve: bpy.types.FCurve, frame: float):
-
-        previous_keyframe = None
-        for keyframe in fcurve.keyframe_points:
-            if keyframe.co.x > frame:
-                break
+    def _get_keyframe_before(
+            fcurve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
+            frame: float):
 
-            previous_keyframe = keyframe
+        index = snapshot.index_before(frame)
 
-        if previous_keyframe is None:
+        if index < 0:
             raise LookupError(
                 f"No keyframe before frame {frame}"
                 f" on fcurve {fcurve.data_path}")
 
-        return previous_keyframe
+        return index
 
     @staticmethod
     def _bake_non_cyclic(
             fcurve: bpy.types.FCurve,
-            start_frame: float,
-            end_frame: float):
-
-        try:
-            T113D_OT_BakeCyclicAction._get_keyframe_before(fcurve, start_frame)
-        except LookupError:
-            fcurve.keyframe_points.insert(
-                start_frame,
-                fcurve.keyframe_points[0].co.y
-            ).interpolation = 'CONSTANT'
+            snapshot: KeyframeSnapshot,
+            start_frame: float):
 
-        try:
-            T113D_OT_BakeCyclicAction._get_keyframe_before(fcurve, end_frame)
-        except LookupError:
-            last_keyframe_index = len(fcurve.keyframe_points) - 1
+        # a keyframe inserted at the start frame also lies before the end
+        # frame, so only the start needs to be checked
+        if snapshot.index_before(start_frame) < 0:
             fcurve.keyframe_points.insert(
                 start_frame,
-                fcurve.keyframe_points[last_keyframe_index].co.y
+                float(snapshot["co"][0, 1])
             ).interpolation = 'CONSTANT'
 
         return True
@@ -90,69 +83,52 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
     def _get_repeats(
             self,
             fcurve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
             target_frame: float,
             source_frame: float,
             source_range: float):
 
-        if target_frame == source_frame:
-            return 0
+        repeats, cut_frame = kernels.get_cycle_repeats(
+            snapshot.frames,
+            snapshot["interpolation"],
+            self._divisible_interpolations,
+            target_frame,
+            source_frame,
+            source_range)
 
-        result = math.ceil(
-            (source_frame - target_frame) / source_range)
-
-        real_target_frame = target_frame + source_range * result
-        keyframe = T113D_OT_BakeCyclicAction._get_keyframe_before(
-            fcurve, real_target_frame)
-
-        if (keyframe.co.x != real_target_frame
-                and keyframe.interpolation
-                not in ['CONSTANT', 'LINEAR', 'BEZIER']):
+        if repeats is None:
             self._error_message = (
                 f"{fcurve.data_path}[{fcurve.array_index}] Does not repeat on"
                 " a dividable interpolation type!"
-                f" See frame {real_target_frame}"
+                f" See frame {cut_frame}"
             )
-            return None
 
-        return max(result, 0)
+        return repeats
 
     @staticmethod
     def _add_repeats(
             fcurve: bpy.types.FCurve,
-            points: list[bpy.types.Keyframe],
-            repeats: float,
+            repeats_to_end: int,
+            repeats_to_start: int,
             offset: float):
 
-        if repeats == 0:
+        if repeats_to_end == 0 and repeats_to_start == 0:
             return
 
-        add_num = repeats * len(points)
-        fcurve.keyframe_points.add(add_num)
-        new_points = iter(fcurve.keyframe_points[-add_num:])
-
-        for p in points:
-            for i in range(repeats):
-                kf = next(new_points)
-
-                kf.co = Vector((
-                    p.co.x + (i + 1) * offset,
-                    p.co.y
-                ))
-
-                kf.amplitude = p.amplitude
-                kf.back = p.back
-                kf.easing = p.easing
-                kf.handle_left = kf.co + (p.handle_left - p.co)
-                kf.handle_left_type = p.handle_left_type
-                kf.handle_right = kf.co + (p.handle_right - p.co)
-                kf.handle_right_type = p.handle_right_type
-                kf.interpolation = p.interpolation
-                kf.period = p.period
-                kf.type = p.type
+        snapshot = KeyframeSnapshot.from_fcurve(fcurve)
+        count = len(snapshot)
+
+        # new keyframes are selected, like the ones added through RNA
+        KeyframeSnapshot.concatenate([
+            snapshot,
+            snapshot.repeated(1, count, repeats_to_end, offset),
+            snapshot.repeated(0, count - 1, repeats_to_start, -offset)
+        ]).write(fcurve, VALUE_PROPERTIES)
 
     def _bake_cyclic(
             self,
             fcurve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
             start_frame: float,
             end_frame: float):
 
@@ -168,7 +144,7 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
         ###################################################################
         # check repeating frames
 
-        if abs(first_keyframe.co.y - last_keyframe.co.y) > 0.001:
+        if not kernels.is_cycle_closed(snapshot["co"][[0, -1], 1]):
             self._error_message = (
                 f"{fcurve.data_path}[{fcurve.array_index}] First and last"
                 " keyframes do not carry the same value!"
@@ -179,12 +155,12 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
         # determine repeats
 
         repeats_to_start = self._get_repeats(
-            fcurve, start_frame, first_frame, frame_range)
+            fcurve, snapshot, start_frame, first_frame, frame_range)
         if repeats_to_start is None:
             return False
 
         repeats_to_end = self._get_repeats(
-            fcurve, end_frame, last_frame, -frame_range)
+            fcurve, snapshot, end_frame, last_frame, -frame_range)
         if repeats_to_end is None:
             return False
 
@@ -210,29 +186,53 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
         ###################################################################
         # adding the repeats
 
-        points = list(fcurve.keyframe_points)
-
-        self._add_repeats(fcurve, points[1:], repeats_to_end, frame_range)
-        self._add_repeats(fcurve, points[:-1], repeats_to_start, -frame_range)
+        self._add_repeats(
+            fcurve, repeats_to_end, repeats_to_start, frame_range)
 
         fcurve.update()
 
         return True
 
     @staticmethod
-    def _get_create_keyframe(fcurve: bpy.types.FCurve, frame: float):
-        result = T113D_OT_BakeCyclicAction._get_keyframe_before(
-            fcurve, frame)
+    def _get_create_keyframe(
+            fcurve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
+            frame: float):
+        """Returns the index of the keyframe on the frame, inserting one if
+        needed, together with the (possibly updated) snapshot"""
+
+        index = snapshot.index_of(frame)
+        if index >= 0:
+            return index, snapshot
+
+        BakeCyclicAction._get_keyframe_before(fcurve, snapshot, frame)
+
+        value = fcurve.evaluate(frame)
+        fcurve.keyframe_points.insert(frame, value)
+
+        # blender replaces the value of a keyframe close to the frame
+        # instead of inserting one
+        snapshot = KeyframeSnapshot.from_fcurve(fcurve)
+        index = snapshot.index_of(frame)
+        if index < 0:
+            raise LookupError(
+                f"Could not insert a keyframe on frame {frame}"
+                f" on fcurve {fcurve.data_path}, another one is too close")
 
-        if result.co.x != frame:
-            value = fcurve.evaluate(frame)
-            result = fcurve.keyframe_points.insert(frame, value)
+        return index, snapshot
 
-        for i, kf in enumerate(fcurve.keyframe_points):
-            if kf.co.x == frame:
-                return i
+    @staticmethod
+    def _trim(
+            fcurve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
+            start_index: int,
+            end_index: int):
+        """Removes all keyframes outside of the (inclusive) index range"""
+
+        if start_index == 0 and end_index == len(snapshot) - 1:
+            return
 
-        raise IndexError("Index not found")
+        snapshot.sliced(start_index, end_index + 1).write(fcurve)
 
     def _process(self, action: bpy.types.Action):
         start_frame = action.frame_range[0]
@@ -264,54 +264,228 @@ class T113D_OT_BakeCyclicAction(bpy.types.Operator):
                 )
                 return
 
+            snapshot = KeyframeSnapshot.from_fcurve(fcurve)
+
             success = False
             if len(fcurve.modifiers) == 0:
-                success = self._bake_non_cyclic(fcurve, start_frame, end_frame)
+                with instrumentation.measure("bake_non_cyclic"):
+                    success = self._bake_non_cyclic(
+                        fcurve, snapshot, start_frame)
             else:
-                success = self._bake_cyclic(fcurve, start_frame, end_frame)
+                with instrumentation.measure("bake_cyclic"):
+                    success = self._bake_cyclic(
+                        fcurve, snapshot, start_frame, end_frame)
 
             if not success:
                 return
 
-            fcurve.keyframe_points.sort()
+            with instrumentation.measure("sort"):
+                fcurve.keyframe_points.sort()
+                snapshot = KeyframeSnapshot.from_fcurve(fcurve)
 
-            to_delete_start = self._get_create_keyframe(fcurve, start_frame)
-            to_delete_end_index = self._get_create_keyframe(
-                fcurve, end_frame) + 1
-            to_delete_end = len(fcurve.keyframe_points) - to_delete_end_index
+            with instrumentation.measure("trim"):
+                start_index, snapshot = self._get_create_keyframe(
+                    fcurve, snapshot, start_frame)
+                end_index, snapshot = self._get_create_keyframe(
+                    fcurve, snapshot, end_frame)
 
-            for _ in range(to_delete_end):
-                fcurve.keyframe_points.remove(
-                    fcurve.keyframe_points[to_delete_end_index],
-                    fast=True)
+                self._trim(fcurve, snapshot, start_index, end_index)
 
-            for _ in range(to_delete_start):
-                fcurve.keyframe_points.remove(
-                    fcurve.keyframe_points[0],
-                    fast=True)
+    def _reduce(self, action: bpy.types.Action):
+        """Removes keyframes that the remaining ones reproduce within the
+        tolerance, returns the keyframe counts before and after"""
+
+        bezier = get_enum_value("interpolation", 'BEZIER')
+        free = get_enum_value("handle_left_type", 'FREE')
+        before = 0
+        after = 0
+
+        for fcurve in action.fcurves:
+            snapshot = KeyframeSnapshot.from_fcurve(fcurve)
+            before += len(snapshot)
+
+            kept, handle_left, handle_right, changed = \
+                kernels.reduce_keyframes(
+                    snapshot["co"],
+                    snapshot["handle_left"],
+                    snapshot["handle_right"],
+                    snapshot["interpolation"] == bezier,
+                    self.reduce_tolerance)
+
+            after += len(kept)
+            if len(kept) == len(snapshot):
+                continue
+
+            # the changed handles must not be recalculated by blender
+            reduced = snapshot.taken(kept)
+            reduced.data["handle_left"] = handle_left.astype(np.float32)
+            reduced.data["handle_right"] = handle_right.astype(np.float32)
+            reduced.data["handle_left_type"][changed] = free
+            reduced.data["handle_right_type"][changed] = free
+
+            reduced.write(fcurve)
+            fcurve.update()
+
+        return before, after
+
+    def _bake_action(self, base_action: bpy.types.Action):
+        """Bakes a copy of the action, returns None on failure"""
 
-    def execute(self, context: Context):
-        base_action = context.active_object.animation_data.action
         self._error_message = None
 
         if not base_action.use_cyclic:
             self._error_message = (
                 f"The action {base_action.name} is not cyclic"
             )
+            return None
+
+        action: bpy.types.Action = base_action.copy()
+        action.name = base_action.name + BAKED_SUFFIX
+        action[BAKED_PROPERTY] = base_action.name
+
+        try:
+            self._process(action)
+        except LookupError as error:
+            self._error_message = str(error)
+
+        if self._error_message is not None:
+            bpy.data.actions.remove(action)
+            return None
+
+        if self.use_reduce:
+            with instrumentation.measure("reduce"):
+                self._reduced[action] = self._reduce(action)
+
+        return action
+
+    def _get_report(
+            self,
+            base_action: bpy.types.Action,
+            action: bpy.types.Action):
+        message = f"{base_action.name}: baked to {action.name}"
+
+        if action in self._reduced:
+            before, after = self._reduced[action]
+            message += f", reduced {before} to {after} keyframes"
+
+        return message
+
+    @staticmethod
+    def _get_baked_copies():
+        """The baked copy of each source action name"""
+
+        baked_copies: dict[str, bpy.types.Action] = {}
+        for action in bpy.data.actions:
+            source = action.get(BAKED_PROPERTY)
+            if source is not None:
+                baked_copies.setdefault(source, action)
+
+        return baked_copies
+
+    def _get_batch_actions(self, context: Context):
+        if self.mode == 'ALL':
+            actions = list(bpy.data.actions)
 
         else:
+            actions = []
+            for obj in context.selected_objects:
+                if obj.animation_data is None:
+                    continue
 
-            action: bpy.types.Action = base_action.copy()
-            action.name = base_action.name + "_baked"
+                for track in obj.animation_data.nla_tracks:
+                    actions.extend(
+                        s.action for s in track.strips
+                        if s.action is not None)
+
+        # each action only gets baked once, no matter how often it is used,
+        # and baked copies never again
+        return [
+            a for a in dict.fromkeys(actions)
+            if a.use_cyclic and BAKED_PROPERTY not in a]
+
+    def _execute_batch(self, context: Context):
+        baked: dict[bpy.types.Action, bpy.types.Action] = {}
+        existing: dict[bpy.types.Action, bpy.types.Action] = {}
+        failed: dict[bpy.types.Action, str] = {}
+
+        baked_copies = self._get_baked_copies()
+
+        for base_action in self._get_batch_actions(context):
+            # running the batch again reuses the earlier bakes
+            action = baked_copies.get(base_action.name)
+            if action is not None:
+                existing[base_action] = action
+                continue
 
-            self._process(action)
+            action = self._bake_action(base_action)
+            if action is None:
+                failed[base_action] = self._error_message
+            else:
+                baked[base_action] = action
 
-            if self._error_message is not None:
-                bpy.data.actions.remove(action)
+                # nothing else uses the copies, keep them when saving
+                if self.mode == 'ALL':
+                    action.use_fake_user = True
 
-        if self._error_message is not None:
+        if self.mode == 'NLA':
+            for obj in context.selected_objects:
+                if obj.animation_data is None:
+                    continue
+
+                for track in obj.animation_data.nla_tracks:
+                    for strip in track.strips:
+                        if strip.action in baked:
+                            strip.action = baked[strip.action]
+                        elif strip.action in existing:
+                            strip.action = existing[strip.action]
+
+        for base_action, action in baked.items():
+            self.report({'INFO'}, self._get_report(base_action, action))
+
+        for base_action, action in existing.items():
+            self.report(
+                {'INFO'},
+                f"{base_action.name}: already baked to {action.name}")
+
+        for base_action, error in failed.items():
+            self.report({'WARNING'}, f"{base_action.name}: {error}")
+
+        self.report(
+            {'INFO'},
+            f"Baked {len(baked)} action(s), {len(existing)} already baked,"
+            f" {len(failed)} failed"
+        )
+
+        if len(baked) == 0 and len(failed) > 0:
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
+
+    @instrumentation.instrumented
+    def execute(self, context: Context):
+        self._divisible_interpolations = {
+            get_enum_value("interpolation", i)
+            for i in ['CONSTANT', 'LINEAR', 'BEZIER']}
+        self._reduced = {}
+
+        if self.mode != 'ACTIVE':
+            return self._execute_batch(context)
+
+        obj = context.active_object
+        if (obj is None
+                or obj.animation_data is None
+                or obj.animation_data.action is None):
+            self.report({'ERROR'}, "The active object has no action")
+            return {'CANCELLED'}
+
+        base_action = obj.animation_data.action
+        action = self._bake_action(base_action)
+
+        if action is None:
             self.report({'ERROR'}, self._error_message)
             return {'CANCELLED'}
         else:
-            context.active_object.animation_data.action = action
+            obj.animation_data.action = action
+            if self.use_reduce:
+                self.report({'INFO'}, self._get_report(base_action, action))
             return {'FINISHED'}
@@ -0,0 +1,72 @@
+import bpy
+
+# the pairing itself lives in the kernels, which only get imported once
+# needed, as this module is loaded on registration
+from . import preferences
+
+
+def get_custom_pairs():
+    """Custom left/right name pairs from the add-on preferences"""
+    from . import kernels
+
+    prefs = preferences.get_preferences()
+    if prefs is None:
+        return ()
+    return kernels.parse_custom_pairs(prefs.custom_side_pairs)
+
+
+# armature pointer: (signature, kernels.BonePairingTable)
+_tables: dict[int, tuple[tuple, object]] = {}
+_msgbus_owner = object()
+
+
+def get_pairing_table(armature: bpy.types.Armature):
+    """Returns the (cached) pairing table of an armature. The cache is
+    validated against the bone names, as the bone rename and file load
+    notifications do not cover undo or background mode"""
+
+    from . import kernels
+
+    custom_pairs = get_custom_pairs()
+    names = tuple(b.name for b in armature.bones)
+    signature = (hash(names), custom_pairs)
+
+    key = armature.as_pointer()
+    cached = _tables.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    table = kernels.BonePairingTable(names, custom_pairs)
+    _tables[key] = (signature, table)
+    return table
+
+
+def clear_cache():
+    _tables.clear()
+
+
+def _subscribe():
+    for bone_type in (bpy.types.Bone, bpy.types.EditBone):
+        bpy.msgbus.subscribe_rna(
+            key=(bone_type, "name"),
+            owner=_msgbus_owner,
+            args=(),
+            notify=clear_cache)
+
+
+@bpy.app.handlers.persistent
+def _on_load_post(*args):
+    # loading a file clears all subscriptions and invalidates the pointers
+    clear_cache()
+    _subscribe()
+
+
+def register():
+    _subscribe()
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(_on_load_post)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    clear_cache()
@@ -0,0 +1,33 @@
+"""Caches of the tools keyed by data pointers, which become invalid when a
+file gets loaded. Registered on startup, the tools only create their caches
+once they get imported"""
+
+import bpy
+
+_caches: list[dict] = []
+
+
+def new_cache():
+    """Returns a dictionary that gets cleared whenever a file is loaded"""
+    cache = {}
+    _caches.append(cache)
+    return cache
+
+
+def clear_all():
+    for cache in _caches:
+        cache.clear()
+
+
+@bpy.app.handlers.persistent
+def _on_load_post(*args):
+    clear_all()
+
+
+def register():
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(_on_load_post)
+    clear_all()
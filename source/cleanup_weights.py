@@ -0,0 +1,69 @@
+import bpy
+import numpy as np
+
+from . import instrumentation, kernels, vertex_weights
+
+
+class CleanupWeights:
+    """Implementation of operators.T113D_OT_CleanupWeights"""
+
+    @classmethod
+    def poll(cls, context):
+        return len(vertex_weights.get_weighted_objects(context)) > 0
+
+    def _get_group_masks(self, obj: bpy.types.Object, group_count: int):
+        cleaned = np.ones(group_count, dtype=bool)
+        locked = np.zeros(group_count, dtype=bool)
+
+        deform_bones = None
+        if self.group_select_mode == 'BONE_DEFORM':
+            deform_bones = vertex_weights.get_object_deform_bone_names(obj)
+
+        for group in obj.vertex_groups:
+            locked[group.index] = group.lock_weight
+            if deform_bones is not None:
+                cleaned[group.index] = group.name in deform_bones
+
+        return cleaned, locked
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        removed = 0
+        changed_count = 0
+        objects = vertex_weights.get_weighted_objects(context)
+
+        for obj in objects:
+            mesh: bpy.types.Mesh = obj.data
+
+            vertices, groups, weights = vertex_weights.read_vertex_weights(
+                mesh)
+            if len(vertices) == 0:
+                continue
+
+            # assignments may reference groups that no longer exist
+            group_count = max(len(obj.vertex_groups), int(groups.max()) + 1)
+            cleaned, locked = self._get_group_masks(obj, group_count)
+
+            result = kernels.clean_weights(
+                vertices, groups, weights, cleaned, locked,
+                self.threshold,
+                self.limit,
+                self.normalize)
+
+            changed = result[3]
+            if not changed.any():
+                continue
+
+            vertex_weights.write_vertex_weights(
+                obj, (vertices, groups, weights), *result)
+
+            removed += len(vertices) - len(result[0])
+            changed_count += int(np.count_nonzero(changed))
+
+        self.report(
+            {'INFO'},
+            f"Removed {removed} weight(s), changed {changed_count} vertices"
+            f" on {len(objects)} object(s)"
+        )
+
+        return {'FINISHED'}
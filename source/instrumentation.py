@@ -0,0 +1,252 @@
+"""Opt-in timing and memory instrumentation of the operators
+
+When enabled in the add-on preferences (or through `enable()` from a
+script), every instrumented operator records the wall time and call count
+of each of its phases. The results of a run get reported to the info log
+and appended to a log file as JSON lines, and all results of the session
+can be queried with `get_results()`.
+
+Memory tracing is a separate opt-in, as tracemalloc slows down every
+allocation. It only happens if no one else is tracing already (like the
+benchmarks), so that their measurements stay untouched.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+import bpy
+
+from . import preferences
+
+LOG_FILENAME = "t113d_instrumentation.log"
+
+
+class PhaseStats:
+    """Accumulated measurements of one phase"""
+
+    calls: int
+    time: float
+    allocated: int
+    peak: int
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.allocated = 0
+        self.peak = 0
+
+    def add(self, duration: float, allocated: int, peak: int):
+        self.calls += 1
+        self.time += duration
+        self.allocated += allocated
+        self.peak = max(self.peak, peak)
+
+    def merge(self, other: "PhaseStats"):
+        self.calls += other.calls
+        self.time += other.time
+        self.allocated += other.allocated
+        self.peak = max(self.peak, other.peak)
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "allocated": self.allocated,
+            "peak": self.peak,
+        }
+
+
+class _Run:
+    """Measurements of a single operator execution"""
+
+    operator: str
+    phases: dict[str, PhaseStats]
+    trace_memory: bool
+
+    # [start memory, highest peak] of every open phase
+    _stack: list[list[int]]
+
+    def __init__(self, operator: str, trace_memory: bool):
+        self.operator = operator
+        self.phases = {}
+        self.trace_memory = trace_memory
+        self._stack = []
+
+    def _add(self, phase: str, duration: float, allocated: int, peak: int):
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = PhaseStats()
+        stats.add(duration, allocated, peak)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        if not self.trace_memory:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._add(phase, time.perf_counter() - start, 0, 0)
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        if len(self._stack) > 0:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+
+        frame = [current, current]
+        self._stack.append(frame)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            end, peak = tracemalloc.get_traced_memory()
+            frame[1] = max(frame[1], peak)
+
+            self._stack.pop()
+            if len(self._stack) > 0:
+                self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+
+            self._add(phase, duration, end - frame[0], frame[1] - frame[0])
+
+
+# operator: phase: accumulated stats of all runs in this session
+_results: dict[str, dict[str, PhaseStats]] = {}
+_run: _Run = None
+# (enabled, trace memory) overriding the preferences
+_forced: tuple[bool, bool] = None
+_null_context = contextlib.nullcontext()
+
+
+def enable(value: bool = True, trace_memory: bool = False):
+    """Enables or disables the instrumentation regardless of the
+    preferences. Pass None to use the preferences again"""
+    global _forced
+    _forced = None if value is None else (value, trace_memory)
+
+
+def is_enabled():
+    if _forced is not None:
+        return _forced[0]
+
+    prefs = preferences.get_preferences()
+    return prefs is not None and prefs.use_instrumentation
+
+
+def is_tracing_memory():
+    if _forced is not None:
+        return _forced[0] and _forced[1]
+
+    prefs = preferences.get_preferences()
+    return (
+        prefs is not None
+        and prefs.use_instrumentation
+        and prefs.use_memory_tracing)
+
+
+def get_log_path():
+    prefs = preferences.get_preferences()
+    if prefs is not None and len(prefs.instrumentation_log) > 0:
+        return bpy.path.abspath(prefs.instrumentation_log)
+
+    # blender's user config directory, which persists between sessions
+    return os.path.join(
+        bpy.utils.user_resource('CONFIG', create=True), LOG_FILENAME)
+
+
+def measure(phase: str):
+    """Context manager measuring a phase of the running operator. Does
+    nothing if the instrumentation is disabled"""
+    if _run is None:
+        return _null_context
+    return _run.measure(phase)
+
+
+def get_results(operator: str = None):
+    """Returns the accumulated results of this session as
+    {operator: {phase: {"calls", "time", "allocated", "peak"}}}, or only
+    the phases of one operator"""
+
+    results = {
+        name: {phase: s.to_dict() for phase, s in phases.items()}
+        for name, phases in _results.items()}
+
+    if operator is not None:
+        return results.get(operator, {})
+    return results
+
+
+def clear_results():
+    _results.clear()
+
+
+def _format_size(size: int):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _finish(operator: bpy.types.Operator, run: _Run):
+    totals = _results.setdefault(run.operator, {})
+    for phase, stats in run.phases.items():
+        totals.setdefault(phase, PhaseStats()).merge(stats)
+
+    summary = ", ".join(
+        f"{phase} {s.time * 1000:.2f} ms"
+        + (f" ({s.calls}x)" if s.calls > 1 else "")
+        + (f" {_format_size(s.allocated)} / peak {_format_size(s.peak)}"
+           if run.trace_memory else "")
+        for phase, s in run.phases.items())
+    operator.report({'INFO'}, f"{run.operator}: {summary}")
+
+    entry = {
+        "operator": run.operator,
+        "timestamp": time.time(),
+        "memory": run.trace_memory,
+        "phases": {p: s.to_dict() for p, s in run.phases.items()},
+    }
+
+    try:
+        with open(get_log_path(), "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+    except OSError as error:
+        operator.report(
+            {'WARNING'}, f"Could not write instrumentation log: {error}")
+
+
+def instrumented(execute):
+    """Decorator for operator execute methods, measuring the whole execution
+    as the "execute" phase, as well as all phases measured within"""
+
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        global _run
+
+        # nested operator calls get measured as part of the outer one
+        if _run is not None or not is_enabled():
+            return execute(self, context)
+
+        # an existing tracer belongs to someone else, and must not have its
+        # peak reset
+        started_tracing = (
+            is_tracing_memory() and not tracemalloc.is_tracing())
+        if started_tracing:
+            tracemalloc.start()
+
+        run = _run = _Run(self.bl_idname, started_tracing)
+        try:
+            with run.measure("execute"):
+                return execute(self, context)
+        finally:
+            _run = None
+            if started_tracing:
+                tracemalloc.stop()
+            _finish(self, run)
+
+    return wrapper
@@ -0,0 +1,859 @@
+"""Algorithms of the tools that work on plain values and arrays only.
+
+Nothing in here depends on bpy, so the kernels can be run and benchmarked
+in plain python (see benchmarks/kernels.py).
+"""
+
+import math
+import re
+from functools import lru_cache
+import numpy as np
+
+
+###############################################################################
+# bone name pairing
+
+SEPARATORS = "._- "
+
+# numeric suffixes blender and other tools add to duplicate names
+NUMBER_SUFFIX = re.compile(r"^(.+?)([._\- ]?\d+)$")
+
+# splits a name into separators, (camelCase) words and numbers
+NAME_PIECES = re.compile(r"[._\- ]+|[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+|.")
+
+
+def _match_case(source: str, target: str):
+    if source.isupper():
+        return target.upper()
+    elif source[0].isupper():
+        return target.capitalize()
+    return target.lower()
+
+
+def _pair_by_affix(name: str):
+    """left/right and L/R at the start or end of the name"""
+
+    lowercase = name.lower()
+
+    if lowercase.endswith('left'):
+        return name[:-4] + _match_case(name[-4:], 'right')
+
+    elif lowercase.startswith('left'):
+        return _match_case(name[:4], 'right') + name[4:]
+
+    elif (len(name) > 1
+            and lowercase[-1] == 'l'
+            and lowercase[-2] in SEPARATORS):
+        return name[:-1] + ('R' if name[-1] == 'L' else 'r')
+
+    elif (len(name) > 1
+            and lowercase[0] == 'l'
+            and lowercase[1] in SEPARATORS):
+        return ('R' if name[0] == 'L' else 'r') + name[1:]
+
+    return None
+
+
+def _pair_by_pieces(name: str):
+    """left/right and L/R inside of the name, either between separators or
+    as camelCase words"""
+
+    pieces = NAME_PIECES.findall(name)
+
+    for i, piece in enumerate(pieces):
+        lowercase = piece.lower()
+
+        if lowercase == 'left':
+            pieces[i] = _match_case(piece, 'right')
+
+        elif lowercase == 'l':
+            before = pieces[i - 1] if i > 0 else ""
+            after = pieces[i + 1] if i + 1 < len(pieces) else ""
+
+            # a lone letter is no side marker, so the name needs to
+            # continue past a separator on at least one side
+            separated = (
+                (before == "" or before[-1] in SEPARATORS)
+                and (after == "" or after[0] in SEPARATORS)
+                and (before != "" or after != ""))
+            camel_case = (
+                piece == 'L' and after == "" and before[-1:].islower())
+
+            if not separated and not camel_case:
+                continue
+
+            pieces[i] = 'R' if piece == 'L' else 'r'
+
+        else:
+            continue
+
+        return "".join(pieces)
+
+    return None
+
+
+@lru_cache(maxsize=65536)
+def get_symmetrized_name(
+        name: str,
+        custom_pairs: tuple[tuple[str, str], ...] = ()):
+    """Returns the right side name for a left side name, or None if the name
+    does not belong to the left side"""
+
+    for left, right in custom_pairs:
+        index = name.rfind(left)
+        if index >= 0:
+            return name[:index] + right + name[index + len(left):]
+
+    result = _pair_by_affix(name)
+    if result is not None:
+        return result
+
+    # numeric suffixes get matched without, and re-appended
+    match = NUMBER_SUFFIX.match(name)
+    if match is not None:
+        base, suffix = match.groups()
+        result = _pair_by_affix(base)
+        if result is None:
+            result = _pair_by_pieces(base)
+        if result is not None:
+            return result + suffix
+
+    return _pair_by_pieces(name)
+
+
+@lru_cache(maxsize=65536)
+def get_bone_name(data_path: str):
+    """Returns the name of the pose bone that a data path points to, or
+    None if it does not point to a pose bone"""
+
+    if not data_path.startswith("pose.bones[\""):
+        return None
+
+    end = data_path.index("\"]")
+    return data_path[12:end]
+
+
+@lru_cache(maxsize=16)
+def parse_custom_pairs(value: str):
+    """Parses comma separated left:right name pairs"""
+    result = []
+
+    for pair in value.split(","):
+        left, _, right = pair.partition(":")
+        left, right = left.strip(), right.strip()
+        if len(left) > 0 and len(right) > 0:
+            result.append((left, right))
+
+    return tuple(result)
+
+
+class BonePairingTable:
+    """Left/right pairs of bone names that exist on an armature"""
+
+    left_to_right: dict[str, str]
+    right_to_left: dict[str, str]
+
+    def __init__(
+            self,
+            bone_names: list[str],
+            custom_pairs: tuple[tuple[str, str], ...] = ()):
+
+        existing = set(bone_names)
+
+        self.left_to_right = {}
+        for name in bone_names:
+            sym_name = get_symmetrized_name(name, custom_pairs)
+            if sym_name is not None and sym_name in existing:
+                self.left_to_right[name] = sym_name
+
+        self.right_to_left = {
+            right: left for left, right in self.left_to_right.items()}
+
+    def get_mirror(self, name: str):
+        """Returns the name of the bone on the other side, or None"""
+        result = self.left_to_right.get(name)
+        if result is None:
+            result = self.right_to_left.get(name)
+        return result
+
+
+###############################################################################
+# lattice mirroring
+
+# grid axis (in a (w, v, u) shaped point array) and coordinate component
+# for each mirror axis
+AXES = {
+    'X': (2, 0),
+    'Y': (1, 1),
+    'Z': (0, 2),
+}
+
+
+@lru_cache(maxsize=16)
+def get_mirror_map(
+        resolution: tuple[int, int, int],
+        axis: str,
+        direction: str):
+    """Computes which point each lattice point copies its coordinates from.
+
+    Returns the source index of every point, a mask of the points that
+    receive mirrored coordinates and a mask of the points on the mirror
+    plane. The result is cached per resolution and shared between all
+    lattices and shape keys, so the arrays are read only.
+    """
+
+    points_u, points_v, points_w = resolution
+    grid_axis, _ = AXES[axis]
+
+    indices = np.arange(
+        points_u * points_v * points_w).reshape(points_w, points_v, points_u)
+    grid = np.indices(indices.shape)[grid_axis]
+
+    count = indices.shape[grid_axis]
+    mirrored = count - 1 - grid
+
+    if direction == 'POSITIVE':
+        targets = grid < mirrored
+    else:
+        targets = grid > mirrored
+
+    sources = np.where(targets, np.flip(indices, axis=grid_axis), indices)
+
+    result = (sources.ravel(), targets.ravel(), (grid == mirrored).ravel())
+    for array in result:
+        array.flags.writeable = False
+
+    return result
+
+
+def mirror_coordinates(
+        coordinates: np.ndarray,
+        mirror_map: tuple[np.ndarray, np.ndarray, np.ndarray],
+        axis: str):
+    """Mirrors a (n, 3) shaped coordinate array using a mirror map"""
+
+    sources, targets, center = mirror_map
+    _, component = AXES[axis]
+
+    result = coordinates[sources]
+    result[targets, component] *= -1
+    result[center, component] = 0
+    return result
+
+
+###############################################################################
+# keyframes and cycles
+
+def index_before(frames: np.ndarray, frame: float):
+    """Index of the last of the sorted frames at or before the frame, or -1"""
+    frame = np.float64(frame)
+    return int(np.searchsorted(frames, frame, side='right')) - 1
+
+
+def index_of(frames: np.ndarray, frame: float):
+    """Index of the first of the sorted frames exactly on the frame, or -1"""
+    index = int(np.searchsorted(frames, np.float64(frame)))
+    if index < len(frames) and float(frames[index]) == frame:
+        return index
+    return -1
+
+
+def is_cycle_closed(values: np.ndarray, tolerance: float = 0.001):
+    """Whether the first and last keyframe values of a cycle match"""
+    return abs(float(values[0]) - float(values[-1])) <= tolerance
+
+
+def get_cycle_repeats(
+        frames: np.ndarray,
+        interpolations: np.ndarray,
+        divisible_interpolations: set[int],
+        target_frame: float,
+        source_frame: float,
+        source_range: float):
+    """Number of times a cycle needs to be repeated to reach from the
+    source frame (first or last keyframe) past the target frame, with a
+    negative range when repeating towards the end.
+
+    Returns the repeat count and the frame within the original cycle at
+    which the repeats get cut. The count is None if the cut lands between
+    two keyframes whose interpolation can not be split there.
+    """
+
+    if target_frame == source_frame:
+        return 0, target_frame
+
+    result = math.ceil((source_frame - target_frame) / source_range)
+    cut_frame = target_frame + source_range * result
+
+    index = index_before(frames, cut_frame)
+    if index < 0:
+        raise LookupError(f"No keyframe before frame {cut_frame}")
+
+    if (float(frames[index]) != cut_frame
+            and interpolations[index] not in divisible_interpolations):
+        return None, cut_frame
+
+    return max(result, 0), cut_frame
+
+
+def repeat_keyframes(
+        data: dict[str, np.ndarray],
+        start: int,
+        stop: int,
+        repeats: int,
+        offset: float):
+    """Copies of the keyframe arrays in [start, stop), each repeated and
+    moved by one to `repeats` times the offset, grouped by source keyframe.
+
+    The arrays are keyed by keyframe property names, and need to contain
+    at least "co", "handle_left" and "handle_right".
+    """
+
+    shifts = np.tile(
+        np.arange(1, repeats + 1, dtype=np.float64), stop - start)
+    shifts *= offset
+
+    result = {
+        name: np.repeat(array[start:stop], repeats, axis=0)
+        for name, array in data.items()}
+
+    co = result["co"]
+    new_co = co.copy()
+    new_co[:, 0] = co[:, 0] + shifts
+
+    # handles keep their position relative to the control point
+    for handle in ("handle_left", "handle_right"):
+        result[handle] = new_co + (result[handle] - co)
+
+    result["co"] = new_co
+    return result
+
+
+###############################################################################
+# vertex weights
+
+def get_empty_groups(groups: np.ndarray, group_count: int):
+    """Indices of the vertex groups without any assignment, given the group
+    index of every assignment (or the unique ones)"""
+
+    has_weight = np.zeros(group_count, dtype=bool)
+    groups = np.asarray(groups)
+    has_weight[groups[groups < group_count]] = True
+    return np.flatnonzero(~has_weight)
+
+
+def clean_weights(
+        vertices: np.ndarray,
+        groups: np.ndarray,
+        weights: np.ndarray,
+        cleaned_groups: np.ndarray,
+        locked_groups: np.ndarray,
+        threshold: float,
+        limit: int,
+        normalize: bool):
+    """Prunes, limits and normalizes vertex weights in one go.
+
+    Takes the flat assignment arrays of read_vertex_weights (ordered by
+    vertex) and boolean masks over the group indices: the groups to clean,
+    and the locked groups, which are never changed, but whose weights count
+    towards the total when normalizing. Weights at or below the threshold
+    get removed, then each vertex is limited to `limit` influences among
+    the cleaned groups (no limit if 0): locked weights of cleaned groups
+    always stay and use up slots first, the remaining slots go to the
+    highest unlocked weights. Groups outside of the cleaned ones neither
+    change nor count towards the limit. Lastly the cleaned weights get
+    scaled to sum up to 1.
+
+    Returns the new assignment arrays, still ordered by vertex, and a mask
+    of the vertices whose weights changed.
+    """
+
+    vertex_count = int(vertices[-1]) + 1 if len(vertices) > 0 else 0
+    locked = locked_groups[groups] & cleaned_groups[groups]
+    cleaned = cleaned_groups[groups] & ~locked
+
+    keep = ~cleaned | (weights > threshold)
+
+    if limit > 0:
+        # locked weights take up slots first
+        fixed = np.bincount(vertices[locked], minlength=vertex_count)
+        slots = np.maximum(limit - fixed, 0)
+
+        # rank the cleaned weights of each vertex, highest first
+        candidates = np.flatnonzero(keep & cleaned)
+        order = candidates[np.lexsort(
+            (-weights[candidates], vertices[candidates]))]
+
+        sorted_vertices = vertices[order]
+        run_starts = np.flatnonzero(np.concatenate(
+            ([True], sorted_vertices[1:] != sorted_vertices[:-1])))
+        run_lengths = np.diff(np.append(run_starts, len(order)))
+        ranks = np.arange(len(order)) - np.repeat(run_starts, run_lengths)
+
+        keep[order[ranks >= slots[sorted_vertices]]] = False
+
+    changed = np.zeros(vertex_count, dtype=bool)
+    changed[vertices[~keep]] = True
+
+    vertices = vertices[keep]
+    groups = groups[keep]
+    weights = weights[keep]
+    cleaned = cleaned[keep]
+    locked = locked[keep]
+
+    if normalize:
+        totals = np.bincount(
+            vertices[cleaned], weights[cleaned], minlength=vertex_count)
+
+        available = np.maximum(1.0 - np.bincount(
+            vertices[locked], weights[locked], minlength=vertex_count), 0)
+
+        scales = np.divide(
+            available, totals,
+            out=np.ones(vertex_count), where=totals > 0)
+
+        normalized = (weights * np.where(
+            cleaned, scales[vertices], 1.0)).astype(weights.dtype)
+
+        changed[vertices[normalized != weights]] = True
+        weights = normalized
+
+    return vertices, groups, weights, changed
+
+
+# grid cells per axis at most, so that cell keys fit into 64 bits
+MATCH_GRID_RESOLUTION = 1 << 20
+
+# candidate pairs compared at once, bounding the memory of coarse grids
+MATCH_CHUNK_SIZE = 1 << 22
+
+
+def match_mirrored_points(
+        coordinates: np.ndarray,
+        axis: int,
+        tolerance: float):
+    """Finds the nearest point to the mirrored position of each of the
+    (n, 3) coordinates, within the tolerance. Returns the index of the
+    mirrored point, or -1 where there is none.
+
+    The points get sorted into grid cells of at least twice the tolerance,
+    so only the 2x2x2 cells around a mirrored position need to be searched.
+    """
+
+    count = len(coordinates)
+    result = np.full(count, -1, dtype=np.int64)
+    if count == 0:
+        return result
+
+    points = np.asarray(coordinates, dtype=np.float64)
+    mirrored = points.copy()
+    mirrored[:, axis] *= -1
+
+    # the searched cells start at the cell of the mirrored position minus
+    # the tolerance
+    corners = mirrored - tolerance
+    low = np.minimum(points.min(axis=0), corners.min(axis=0))
+    high = np.maximum(points.max(axis=0), corners.max(axis=0))
+    cell_size = max(
+        2 * tolerance,
+        float((high - low).max()) / MATCH_GRID_RESOLUTION,
+        1e-9)
+
+    cells = np.floor((points - low) / cell_size).astype(np.int64)
+    corner_cells = np.floor((corners - low) / cell_size).astype(np.int64)
+    dimensions = np.maximum(cells.max(axis=0), corner_cells.max(axis=0)) + 2
+    strides = np.array(
+        (dimensions[1] * dimensions[2], dimensions[2], 1), dtype=np.int64)
+
+    keys = cells @ strides
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    # the neighbor cells are constant offsets of the corner key, so the
+    # lookups stay sorted (and fast) with sorted corner keys
+    queries = np.argsort(corner_cells @ strides, kind='stable')
+    corner_keys = (corner_cells @ strides)[queries]
+
+    starts = []
+    lengths = []
+    for offset in np.indices((2, 2, 2)).reshape(3, -1).T:
+        neighbor_keys = corner_keys + int(offset @ strides)
+        start = np.searchsorted(sorted_keys, neighbor_keys, 'left')
+        starts.append(start)
+        lengths.append(
+            np.searchsorted(sorted_keys, neighbor_keys, 'right') - start)
+
+    starts = np.array(starts).T
+    lengths = np.array(lengths).T
+    totals = np.cumsum(lengths.sum(axis=1))
+
+    chunk_start = 0
+    while chunk_start < count:
+        offset = int(totals[chunk_start - 1]) if chunk_start > 0 else 0
+        chunk_end = max(
+            int(np.searchsorted(totals, offset + MATCH_CHUNK_SIZE, 'right')),
+            chunk_start + 1)
+
+        chunk_starts = starts[chunk_start:chunk_end].ravel()
+        chunk_lengths = lengths[chunk_start:chunk_end].ravel()
+
+        targets = np.repeat(
+            np.repeat(queries[chunk_start:chunk_end], 8), chunk_lengths)
+        candidates = order[
+            np.repeat(
+                chunk_starts - (np.cumsum(chunk_lengths) - chunk_lengths),
+                chunk_lengths)
+            + np.arange(int(chunk_lengths.sum()))]
+
+        distances = np.square(
+            points[candidates] - mirrored[targets]).sum(axis=1)
+        valid = distances <= tolerance * tolerance
+        targets = targets[valid]
+        candidates = candidates[valid]
+
+        # nearest candidate first, ties going to the lowest index
+        nearest = np.lexsort((candidates, distances[valid], targets))
+        targets = targets[nearest]
+        first = np.ones(len(targets), dtype=bool)
+        first[1:] = targets[1:] != targets[:-1]
+        result[targets[first]] = candidates[nearest][first]
+
+        chunk_start = chunk_end
+
+    return result
+
+
+def mirror_weights(
+        vertices: np.ndarray,
+        groups: np.ndarray,
+        weights: np.ndarray,
+        vertex_mirror: np.ndarray,
+        group_mirror: np.ndarray):
+    """Copies the weights of source groups onto their target groups on the
+    mirrored vertices.
+
+    Takes the flat assignment arrays of read_vertex_weights (ordered by
+    vertex), the mirrored vertex of every vertex (-1 if none) and the
+    target group of every group (-1 if it is not a source). Assignments of
+    target groups get replaced on all vertices that have a mirrored vertex.
+
+    Returns the new assignment arrays, ordered by vertex, and a mask of
+    the vertices whose weights changed.
+    """
+
+    vertex_count = len(vertex_mirror)
+    is_target = np.zeros(len(group_mirror), dtype=bool)
+    is_target[group_mirror[group_mirror >= 0]] = True
+
+    replaced = is_target[groups] & (vertex_mirror[vertices] >= 0)
+
+    # source assignments, grouped by vertex
+    sources = np.flatnonzero(group_mirror[groups] >= 0)
+    counts = np.bincount(vertices[sources], minlength=vertex_count)
+    starts = np.cumsum(counts) - counts
+
+    # each mirrored vertex receives the source assignments of its mirror
+    targets = np.flatnonzero(vertex_mirror >= 0)
+    mirrors = vertex_mirror[targets]
+    lengths = counts[mirrors]
+
+    total = int(lengths.sum())
+    offsets = np.repeat(starts[mirrors] - (np.cumsum(lengths) - lengths),
+                        lengths)
+    copied = sources[offsets + np.arange(total)]
+
+    new_vertices = np.repeat(targets, lengths).astype(vertices.dtype)
+    new_groups = group_mirror[groups[copied]].astype(groups.dtype)
+    new_weights = weights[copied]
+
+    changed = np.zeros(vertex_count, dtype=bool)
+    changed[vertices[replaced]] = True
+    changed[new_vertices] = True
+
+    keep = ~replaced
+    vertices = np.concatenate((vertices[keep], new_vertices))
+    groups = np.concatenate((groups[keep], new_groups))
+    weights = np.concatenate((weights[keep], new_weights))
+
+    order = np.argsort(vertices, kind='stable')
+    return vertices[order], groups[order], weights[order], changed
+
+
+def diff_weights(
+        previous: tuple[np.ndarray, np.ndarray, np.ndarray],
+        current: tuple[np.ndarray, np.ndarray, np.ndarray],
+        changed: np.ndarray = None):
+    """Compares two sets of assignment arrays in the format of
+    read_vertex_weights. If a mask of changed vertices is given, only
+    those get compared.
+
+    Returns the vertex and group of every assignment that got removed, and
+    the vertex, group and weight of every assignment that got added or
+    changed its weight.
+    """
+
+    if changed is not None:
+        previous = tuple(a[changed[previous[0]]] for a in previous)
+        current = tuple(a[changed[current[0]]] for a in current)
+
+    old_vertices, old_groups, old_weights = previous
+    new_vertices, new_groups, new_weights = current
+
+    group_count = max(
+        int(old_groups.max(initial=-1)), int(new_groups.max(initial=-1))) + 1
+    old_keys = old_vertices.astype(np.int64) * group_count + old_groups
+    new_keys = new_vertices.astype(np.int64) * group_count + new_groups
+
+    assigned = np.ones(len(new_keys), dtype=bool)
+    if len(old_keys) > 0:
+        order = np.argsort(old_keys)
+        sorted_keys = old_keys[order]
+
+        found = np.minimum(
+            np.searchsorted(sorted_keys, new_keys), len(sorted_keys) - 1)
+        assigned = (
+            (sorted_keys[found] != new_keys)
+            | (old_weights[order[found]] != new_weights))
+
+    removed = ~np.isin(old_keys, new_keys)
+
+    return (
+        (old_vertices[removed], old_groups[removed]),
+        (new_vertices[assigned], new_groups[assigned],
+         new_weights[assigned]))
+
+
+###############################################################################
+# mesh adjacency
+
+def build_adjacency(edges: np.ndarray, vertex_count: int):
+    """Builds the neighbors of every vertex from a (m, 2) edge array, in
+    CSR form: the neighbors of vertex i are indices[indptr[i]:indptr[i+1]]"""
+
+    rows = np.concatenate((edges[:, 0], edges[:, 1]))
+    columns = np.concatenate((edges[:, 1], edges[:, 0]))
+
+    order = np.argsort(rows, kind='stable')
+    counts = np.bincount(rows, minlength=vertex_count)
+
+    indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    return indptr, columns[order]
+
+
+def get_adjacency_rows(
+        adjacency: tuple[np.ndarray, np.ndarray],
+        rows: np.ndarray):
+    """Restricts the adjacency to the given vertices. Returns the local row
+    of every neighbor entry, the neighbor indices and the neighbor count of
+    every row"""
+
+    indptr, indices = adjacency
+    counts = indptr[rows + 1] - indptr[rows]
+
+    starts = np.repeat(indptr[rows] - (np.cumsum(counts) - counts), counts)
+    entries = starts + np.arange(int(counts.sum()))
+
+    local_rows = np.repeat(np.arange(len(rows)), counts)
+    return local_rows, indices[entries], counts
+
+
+def smooth_values(
+        values: np.ndarray,
+        rows: np.ndarray,
+        row_adjacency: tuple[np.ndarray, np.ndarray, np.ndarray],
+        factor: float,
+        iterations: int):
+    """Blends the values of the given rows towards the average of their
+    neighbors, using the adjacency of get_adjacency_rows. Values of other
+    vertices only act as neighbors and stay unchanged"""
+
+    local_rows, neighbors, counts = row_adjacency
+    has_neighbors = counts > 0
+    counts = np.maximum(counts, 1)
+
+    values = np.array(values, dtype=np.float64)
+    for _ in range(iterations):
+        averages = np.bincount(
+            local_rows, values[neighbors], minlength=len(rows)) / counts
+
+        current = values[rows]
+        values[rows] = np.where(
+            has_neighbors, current + (averages - current) * factor, current)
+
+    return values
+
+
+def get_islands(edges: np.ndarray, selected: np.ndarray):
+    """Finds the connected components of the selected vertices over a
+    (m, 2) edge array, with a union-find that processes all edges at once
+    per round. Returns the island index of every vertex (-1 if not
+    selected) and the number of islands"""
+
+    edges = edges[selected[edges[:, 0]] & selected[edges[:, 1]]]
+    parent = np.arange(len(selected))
+
+    while True:
+        # path compression, until every vertex points to its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        first = parent[edges[:, 0]]
+        second = parent[edges[:, 1]]
+        split = first != second
+        if not split.any():
+            break
+
+        # union, always hooking the higher root onto the lower one
+        first, second = first[split], second[split]
+        np.minimum.at(
+            parent, np.maximum(first, second), np.minimum(first, second))
+
+    result = np.full(len(selected), -1, dtype=np.int64)
+    roots, result[selected] = np.unique(
+        parent[selected], return_inverse=True)
+
+    return result, len(roots)
+
+
+###############################################################################
+# keyframe reduction
+
+def _hermite(
+        x: np.ndarray,
+        start: tuple[float, float, float],
+        end: tuple[float, float, float]):
+    """Evaluates the cubic between two (frame, value, slope) points, which
+    equals a bezier segment with handles at a third of the segment"""
+
+    start_x, start_y, start_slope = start
+    end_x, end_y, end_slope = end
+
+    width = end_x - start_x
+    s = (x - start_x) / width
+    s2 = s * s
+    s3 = s2 * s
+
+    return (
+        (2 * s3 - 3 * s2 + 1) * start_y
+        + (s3 - 2 * s2 + s) * width * start_slope
+        + (-2 * s3 + 3 * s2) * end_y
+        + (s3 - s2) * width * end_slope)
+
+
+def _get_slopes(co: np.ndarray, handles: np.ndarray):
+    offsets = handles - co
+    return np.divide(
+        offsets[:, 1], offsets[:, 0],
+        out=np.zeros(len(co)), where=offsets[:, 0] != 0)
+
+
+def reduce_keyframes(
+        co: np.ndarray,
+        handle_left: np.ndarray,
+        handle_right: np.ndarray,
+        bezier: np.ndarray,
+        tolerance: float):
+    """Removes keyframes of bezier curve sections that can be reproduced
+    within the tolerance, Douglas-Peucker style.
+
+    A run of bezier segments between two kept keyframes gets replaced by a
+    single segment, keeping the handle slopes of the kept keyframes. The
+    replacement is checked against the original keyframes and against
+    points within every original segment. Keyframes next to segments that
+    are not bezier (`bezier` is False for the segment starting at a
+    keyframe) are always kept.
+
+    Returns the indices of the kept keyframes, their new left and right
+    handles, and a mask of the kept keyframes whose handles changed.
+    """
+
+    count = len(co)
+    co = co.astype(np.float64)
+    handle_left = handle_left.astype(np.float64)
+    handle_right = handle_right.astype(np.float64)
+
+    if count < 3:
+        return (np.arange(count), handle_left, handle_right,
+                np.zeros(count, dtype=bool))
+
+    x = co[:, 0]
+    y = co[:, 1]
+    slopes_left = _get_slopes(co, handle_left)
+    slopes_right = _get_slopes(co, handle_right)
+
+    # points within each original segment, (segments, samples)
+    t = np.array((0.25, 0.5, 0.75))[None, :, None]
+    inverse = 1 - t
+    samples = (
+        inverse ** 3 * co[:-1, None]
+        + 3 * inverse ** 2 * t * handle_right[:-1, None]
+        + 3 * inverse * t ** 2 * handle_left[1:, None]
+        + t ** 3 * co[1:, None])
+    sample_x = samples[..., 0]
+    sample_y = samples[..., 1]
+
+    keep = np.ones(count, dtype=bool)
+    keep[1:-1] = ~(bezier[:-2] & bezier[1:-1])
+
+    fixed = np.flatnonzero(keep)
+    ranges = list(zip(fixed[:-1].tolist(), fixed[1:].tolist()))
+
+    while len(ranges) > 0:
+        start, end = ranges.pop()
+        if end - start < 2:
+            continue
+
+        keys_x = x[start + 1:end]
+        points_x = np.concatenate((keys_x, sample_x[start:end].ravel()))
+        points_y = np.concatenate(
+            (y[start + 1:end], sample_y[start:end].ravel()))
+
+        errors = np.abs(points_y - _hermite(
+            points_x,
+            (x[start], y[start], slopes_right[start]),
+            (x[end], y[end], slopes_left[end])))
+
+        if errors.max() <= tolerance:
+            continue
+
+        key_errors = errors[:len(keys_x)]
+        if key_errors.max() > tolerance:
+            split = start + 1 + int(np.argmax(key_errors))
+        else:
+            # only a point within a segment is off, keep the closer one of
+            # the segment's keyframes
+            segment = start + (int(np.argmax(errors)) - len(keys_x)) // 3
+            split = segment if segment > start else segment + 1
+
+        keep[split] = True
+        ranges.append((start, split))
+        ranges.append((split, end))
+
+    kept = np.flatnonzero(keep)
+    handle_left = handle_left[kept]
+    handle_right = handle_right[kept]
+
+    # handles next to removed keyframes span a third of the new segment
+    widths = np.diff(x[kept]) / 3
+    merged = np.diff(kept) > 1
+
+    right = np.flatnonzero(merged)
+    handle_right[right, 0] = x[kept[right]] + widths[right]
+    handle_right[right, 1] = (
+        y[kept[right]] + slopes_right[kept[right]] * widths[right])
+
+    left = right + 1
+    handle_left[left, 0] = x[kept[left]] - widths[right]
+    handle_left[left, 1] = (
+        y[kept[left]] - slopes_left[kept[left]] * widths[right])
+
+    changed = np.zeros(len(kept), dtype=bool)
+    changed[right] = True
+    changed[left] = True
+
+    return kept, handle_left, handle_right, changed
@@ -0,0 +1,111 @@
+import bpy
+import numpy as np
+
+from . import kernels
+
+# keyframe property name: (array type, values per keyframe)
+KEYFRAME_PROPERTIES = {
+    "co": (np.float32, 2),
+    "handle_left": (np.float32, 2),
+    "handle_right": (np.float32, 2),
+    "handle_left_type": (np.int32, 1),
+    "handle_right_type": (np.int32, 1),
+    "interpolation": (np.int32, 1),
+    "easing": (np.int32, 1),
+    "type": (np.int32, 1),
+    "amplitude": (np.float32, 1),
+    "back": (np.float32, 1),
+    "period": (np.float32, 1),
+    "select_control_point": (np.bool_, 1),
+    "select_left_handle": (np.bool_, 1),
+    "select_right_handle": (np.bool_, 1),
+}
+
+# properties describing the keyframe itself, excluding its selection state
+VALUE_PROPERTIES = tuple(
+    name for name in KEYFRAME_PROPERTIES if not name.startswith("select_"))
+
+
+def get_enum_value(prop: str, identifier: str):
+    """Returns the raw value that foreach_get reports for an enum item of a
+    keyframe property"""
+    enum_items = bpy.types.Keyframe.bl_rna.properties[prop].enum_items
+    return enum_items[identifier].value
+
+
+class KeyframeSnapshot:
+    """Compact array copy of the keyframe points of an fcurve"""
+
+    data: dict[str, np.ndarray]
+
+    def __init__(self, data: dict[str, np.ndarray]):
+        self.data = data
+
+    @classmethod
+    def from_fcurve(cls, fcurve: bpy.types.FCurve):
+        keyframe_points = fcurve.keyframe_points
+        count = len(keyframe_points)
+
+        data = {}
+        for name, (dtype, size) in KEYFRAME_PROPERTIES.items():
+            array = np.empty(count * size, dtype=dtype)
+            keyframe_points.foreach_get(name, array)
+            data[name] = array.reshape(count, size) if size > 1 else array
+
+        return cls(data)
+
+    @classmethod
+    def concatenate(cls, snapshots: list["KeyframeSnapshot"]):
+        return cls({
+            name: np.concatenate([s.data[name] for s in snapshots])
+            for name in snapshots[0].data})
+
+    def write(self, fcurve: bpy.types.FCurve, names=None):
+        """Writes the snapshot to the fcurve, resizing its keyframes to the
+        length of the snapshot"""
+
+        keyframe_points = fcurve.keyframe_points
+
+        missing = len(self) - len(keyframe_points)
+        if missing < 0:
+            keyframe_points.clear()
+            keyframe_points.add(len(self))
+        elif missing > 0:
+            keyframe_points.add(missing)
+
+        for name in names or self.data:
+            keyframe_points.foreach_set(
+                name, np.ascontiguousarray(self.data[name]).ravel())
+
+    def sliced(self, start: int, stop: int):
+        return KeyframeSnapshot({
+            name: array[start:stop] for name, array in self.data.items()})
+
+    def taken(self, indices: np.ndarray):
+        return KeyframeSnapshot({
+            name: array[indices] for name, array in self.data.items()})
+
+    def repeated(self, start: int, stop: int, repeats: int, offset: float):
+        """Copies of the keyframes in [start, stop), each repeated and moved
+        by one to `repeats` times the offset, grouped by source keyframe"""
+
+        return KeyframeSnapshot(kernels.repeat_keyframes(
+            self.data, start, stop, repeats, offset))
+
+    def __len__(self):
+        return len(self.data["co"])
+
+    def __getitem__(self, name: str):
+        return self.data[name]
+
+    @property
+    def frames(self):
+        return self.data["co"][:, 0]
+
+    def index_before(self, frame: float):
+        """Index of the last keyframe at or before the frame, or -1"""
+        return kernels.index_before(self.frames, frame)
+
+    def index_of(self, frame: float):
+        """Index of the first keyframe exactly on the frame, or -1"""
+        return kernels.index_of(self.frames, frame)
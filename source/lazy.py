@@ -0,0 +1,55 @@
+import importlib
+
+
+def _poll(cls, context):
+    return True
+
+
+# used when the implementation does not define the callback itself
+DEFAULT_CALLBACKS = {
+    "poll": classmethod(_poll),
+}
+
+
+class LazyOperator:
+    """Mixin for operator stubs, which only declare the metadata and
+    properties of an operator. The implementation class, given as
+    "module.Class" in `_implementation`, gets imported the first time the
+    operator is polled or run, after which its methods replace the
+    forwarding ones of the stub.
+
+    Blender only calls the callbacks that exist when the operator gets
+    registered, so only poll and execute are forwarded here. Stubs of
+    operators with invoke, check or draw methods have to forward them
+    themselves, so that the other operators keep blender's defaults.
+    """
+
+    _implementation: str
+
+    @classmethod
+    def _load(cls):
+        if "_implementation_class" in cls.__dict__:
+            return
+
+        module_name, _, class_name = cls._implementation.rpartition(".")
+        module = importlib.import_module(f".{module_name}", __package__)
+        implementation = getattr(module, class_name)
+
+        for name, value in DEFAULT_CALLBACKS.items():
+            setattr(cls, name, value)
+
+        for base in reversed(implementation.__mro__[:-1]):
+            for name, value in vars(base).items():
+                if not name.startswith("__"):
+                    setattr(cls, name, value)
+
+        cls._implementation_class = implementation
+
+    @classmethod
+    def poll(cls, context):
+        cls._load()
+        return cls.poll(context)
+
+    def execute(self, context):
+        self._load()
+        return self.execute(context)
@@ -0,0 +1,101 @@
+import hashlib
+import bpy
+import numpy as np
+
+from . import bone_pairing, caches, instrumentation, kernels, vertex_weights
+
+AXIS_INDICES = {'X': 0, 'Y': 1, 'Z': 2}
+
+# mesh pointer: (signature, mirrored vertex of every vertex)
+_vertex_mirrors: dict[int, tuple[tuple, np.ndarray]] = caches.new_cache()
+
+
+def get_vertex_mirror(mesh: bpy.types.Mesh, axis: int, tolerance: float):
+    """Returns the mirrored vertex of every vertex of the mesh (-1 if
+    there is none). Cached per mesh until its vertex positions change or a
+    file is loaded, as the vertex lookup is the expensive part"""
+
+    coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coordinates)
+
+    signature = (
+        axis,
+        tolerance,
+        hashlib.blake2b(coordinates.tobytes(), digest_size=16).digest())
+
+    key = mesh.as_pointer()
+    cached = _vertex_mirrors.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    result = kernels.match_mirrored_points(
+        coordinates.reshape(-1, 3), axis, tolerance)
+    result.flags.writeable = False
+
+    _vertex_mirrors[key] = (signature, result)
+    return result
+
+
+class MirrorWeights:
+    """Implementation of operators.T113D_OT_MirrorWeights"""
+
+    @classmethod
+    def poll(cls, context):
+        active = context.active_object
+        return (
+            active is not None
+            and active.type == 'MESH'
+            and active.mode in {'OBJECT', 'WEIGHT_PAINT'}
+            and len(active.vertex_groups) > 1
+        )
+
+    def _get_group_mirror(self, obj: bpy.types.Object, group_count: int):
+        table = kernels.BonePairingTable(
+            [g.name for g in obj.vertex_groups],
+            bone_pairing.get_custom_pairs())
+
+        pairs = table.left_to_right
+        if self.direction == 'RIGHT_TO_LEFT':
+            pairs = table.right_to_left
+
+        result = np.full(group_count, -1, dtype=np.int64)
+        for source, target in pairs.items():
+            target_group = obj.vertex_groups[target]
+            if not target_group.lock_weight:
+                result[obj.vertex_groups[source].index] = target_group.index
+
+        return result
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        obj = context.active_object
+        mesh: bpy.types.Mesh = obj.data
+
+        vertices, groups, weights = vertex_weights.read_vertex_weights(mesh)
+
+        group_count = len(obj.vertex_groups)
+        if len(groups) > 0:
+            group_count = max(group_count, int(groups.max()) + 1)
+
+        group_mirror = self._get_group_mirror(obj, group_count)
+        pair_count = int(np.count_nonzero(group_mirror >= 0))
+        if pair_count == 0:
+            self.report({'WARNING'}, "No unlocked left/right group pairs")
+            return {'CANCELLED'}
+
+        vertex_mirror = get_vertex_mirror(
+            mesh, AXIS_INDICES[self.axis], self.tolerance)
+
+        result = kernels.mirror_weights(
+            vertices, groups, weights, vertex_mirror, group_mirror)
+        vertex_weights.write_vertex_weights(
+            obj, (vertices, groups, weights), *result)
+
+        unmatched = int(np.count_nonzero(vertex_mirror < 0))
+        self.report(
+            {'INFO'},
+            f"Mirrored {pair_count} group(s),"
+            f" {unmatched} vertices without a mirrored vertex"
+        )
+
+        return {'FINISHED'}
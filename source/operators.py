@@ -0,0 +1,365 @@
+"""Operator stubs, registered on startup. The implementations live in the
+tool modules and only get imported once an operator is first used"""
+
+import bpy
+from bpy.props import (
+    BoolProperty,
+    CollectionProperty,
+    EnumProperty,
+    FloatProperty,
+    IntProperty,
+    StringProperty
+)
+
+from .lazy import LazyOperator
+
+
+class T113D_OT_AverageWeight(LazyOperator, bpy.types.Operator):
+    """Average the weights of the selected vertices"""
+    bl_idname = "paint_weight.average"
+    bl_label = "Average weight"
+    bl_description = "Average the weights of the selected vertices"
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "average_weight.AverageWeight"
+
+    group_mode: EnumProperty(
+        name="Groups",
+        items=(
+            ('ACTIVE', "Active", "Average the active vertex group"),
+            ('ALL', "All", "Average all unlocked vertex groups"),
+            ('BONES', "Selected Bones",
+             "Average all unlocked vertex groups deformed by the selected"
+             " bones of the object's armature/s"),
+        ),
+        default='ACTIVE'
+    )
+
+    use_islands: BoolProperty(
+        name="Per Island",
+        description=(
+            "Average each connected piece of the selection separately"),
+        default=False
+    )
+
+
+class T113D_OT_SmoothWeights(LazyOperator, bpy.types.Operator):
+    """Smooth the weights of the selected vertices"""
+    bl_idname = "paint_weight.smooth_selected"
+    bl_label = "Smooth weight"
+    bl_description = (
+        "Smooth the weights of the selected vertices by averaging them with"
+        " their neighbors"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "smooth_weights.SmoothWeights"
+
+    group_mode: EnumProperty(
+        name="Groups",
+        items=(
+            ('ACTIVE', "Active", "Smooth the active vertex group"),
+            ('ALL', "All", "Smooth all unlocked vertex groups"),
+            ('BONES', "Selected Bones",
+             "Smooth all unlocked vertex groups deformed by the selected"
+             " bones of the object's armature/s"),
+        ),
+        default='ACTIVE'
+    )
+
+    factor: FloatProperty(
+        name="Factor",
+        description="How far weights move towards their neighbors' average",
+        default=0.5,
+        min=0.0,
+        max=1.0
+    )
+
+    iterations: IntProperty(
+        name="Iterations",
+        default=5,
+        min=1,
+        soft_max=100
+    )
+
+
+class T113D_OT_RemoveEmptyWeights(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.remove_empty_groups"
+    bl_label = "Remove Empty"
+    bl_description = (
+        "Removes all groups with no weights"
+        " (from all selected objects)"
+    )
+    bl_options = {'UNDO'}
+    _implementation = "remove_empty_weights.RemoveEmptyWeights"
+
+
+class T113D_OT_RemoveUnusedWeights(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.remove_unused_weights"
+    bl_label = "Remove Unused"
+    bl_description = (
+        "Removes all groups that are not used in the assigned armature/s"
+        " (from the object's armature modifier/s)"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "remove_unused_weights.RemoveUnusedWeights"
+
+    mode: EnumProperty(
+        name="Mode",
+        items=(
+            ('ACTIVE', "Active", "Only process the active object"),
+            ('SELECTED', "Selected", "Process all selected objects"),
+            ('SCENE', "Scene", "Process all objects in the scene"),
+        ),
+        default='ACTIVE'
+    )
+
+
+class T113D_OT_CleanupWeights(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.cleanup_weights"
+    bl_label = "Clean Up for Export"
+    bl_description = (
+        "Removes small weights, limits the number of influences per vertex"
+        " and normalizes the remaining weights (of all selected objects)"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "cleanup_weights.CleanupWeights"
+
+    group_select_mode: EnumProperty(
+        name="Subset",
+        items=(
+            ('ALL', "All Groups", "Clean up all unlocked vertex groups"),
+            ('BONE_DEFORM', "Deform Pose Bones",
+             "Clean up all unlocked vertex groups of deforming bones of the"
+             " object's armature/s"),
+        ),
+        default='ALL'
+    )
+
+    threshold: FloatProperty(
+        name="Threshold",
+        description="Remove weights at or below this value",
+        default=0.01,
+        min=0.0,
+        max=1.0
+    )
+
+    limit: IntProperty(
+        name="Limit",
+        description="Maximum number of influences per vertex, 0 for no limit",
+        default=4,
+        min=0
+    )
+
+    normalize: BoolProperty(
+        name="Normalize",
+        description="Scale the weights of each vertex to sum up to 1",
+        default=True
+    )
+
+
+class T113D_OT_MirrorWeights(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.mirror_weights"
+    bl_label = "Mirror Paired Groups"
+    bl_description = (
+        "Mirrors the weights of all left/right vertex group pairs"
+        " (e.g. arm.L to arm.R) onto the vertices on the other side"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "mirror_weights.MirrorWeights"
+
+    axis: EnumProperty(
+        name="Axis",
+        items=(
+            ('X', "X", "Mirror along the X axis"),
+            ('Y', "Y", "Mirror along the Y axis"),
+            ('Z', "Z", "Mirror along the Z axis"),
+        ),
+        default='X'
+    )
+
+    direction: EnumProperty(
+        name="Direction",
+        items=(
+            ('LEFT_TO_RIGHT', "Left to Right",
+             "Copy the weights of the left groups to the right groups"),
+            ('RIGHT_TO_LEFT', "Right to Left",
+             "Copy the weights of the right groups to the left groups"),
+        ),
+        default='LEFT_TO_RIGHT'
+    )
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description=(
+            "Distance within which a vertex counts as mirrored, for"
+            " slightly asymmetric topology"
+        ),
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
+
+
+class T113D_OT_SymmetryizeLattice(LazyOperator, bpy.types.Operator):
+    """Symmetrizes a lattice"""
+    bl_idname = "t113d.symmetrize_lattice"
+    bl_label = "Symmetrize lattice"
+    bl_description = "Symmetrizes a lattice"
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "symmetrize_lattice.SymmetrizeLattice"
+
+    axis: EnumProperty(
+        name="Axis",
+        items=(
+            ('X', "U / X", "Mirror along the U axis"),
+            ('Y', "V / Y", "Mirror along the V axis"),
+            ('Z', "W / Z", "Mirror along the W axis"),
+        ),
+        default='X'
+    )
+
+    direction: EnumProperty(
+        name="Direction",
+        items=(
+            ('POSITIVE', "+ to -", "Copy the positive side to the negative"),
+            ('NEGATIVE', "- to +", "Copy the negative side to the positive"),
+        ),
+        default='POSITIVE'
+    )
+
+    shape_keys: EnumProperty(
+        name="Shape Keys",
+        items=(
+            ('NONE', "None", "Only symmetrize the lattice points"),
+            ('ACTIVE', "Active", "Symmetrize the active shape key"),
+            ('ALL', "All", "Symmetrize all shape keys"),
+            ('FILTER', "Filter",
+             "Symmetrize all shape keys matching the name filter"),
+        ),
+        default='NONE'
+    )
+
+    shape_key_filter: StringProperty(
+        name="Name Filter",
+        description=(
+            "Shape key names to symmetrize, supporting * and ? wildcards"),
+        default="*"
+    )
+
+
+class T113D_OT_BakeCyclicAction(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.bake_cyclic_action"
+    bl_label = "Bake cyclic action"
+    bl_description = (
+        "bakes the cyclic action so that keyframes"
+        " are only in the actions frame range"
+    )
+    bl_options = {'REGISTER', 'UNDO'}
+    _implementation = "bake_cyclic_action.BakeCyclicAction"
+
+    mode: EnumProperty(
+        name="Mode",
+        items=(
+            ('ACTIVE', "Active", "Bake the action of the active object"),
+            ('ALL', "All",
+             "Bake all cyclic actions in the file that have no baked copy"
+             " yet"),
+            ('NLA', "NLA Strips",
+             "Bake all cyclic actions used by NLA strips of the selected"
+             " objects, and replace them in the strips"),
+        ),
+        default='ACTIVE'
+    )
+
+    use_reduce: BoolProperty(
+        name="Reduce Keyframes",
+        description=(
+            "Remove baked keyframes that the remaining ones reproduce within"
+            " the tolerance"
+        ),
+        default=False
+    )
+
+    reduce_tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum value difference the reduction may introduce",
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
+
+
+class T113D_PG_SymmetrizeActionEntry(bpy.types.PropertyGroup):
+    selected: BoolProperty(
+        name="Selected",
+        default=False
+    )
+
+
+class T113D_OT_SymmetrizeAction(LazyOperator, bpy.types.Operator):
+    bl_idname = "t113d.symmetrize_action"
+    bl_label = "Symmetrize Action"
+    bl_description = (
+        "Symmetrizes the active action, or several actions"
+        " of the active armature"
+    )
+    bl_options = {'REGISTER', 'PRESET', 'UNDO'}
+    _implementation = "symmetrize_action.SymmetrizeAction"
+
+    use_custom_offset: BoolProperty(
+        name="Use Custom Offset",
+        default=False
+    )
+
+    custom_offset: FloatProperty(
+        name="Custom Offset",
+        default=0
+    )
+
+    method: EnumProperty(
+        name="Method",
+        items=(
+            ('DIRECT', "Direct",
+             "Write the mirrored keyframes directly into the curves."
+             " Works without an editor and in background mode"),
+            ('CLIPBOARD', "Clipboard",
+             "Mirror the keyframes by copying and pasting them flipped in"
+             " the graph editor"),
+        ),
+        default='DIRECT'
+    )
+
+    action_mode: EnumProperty(
+        name="Actions",
+        items=(
+            ('ACTIVE', "Active", "Symmetrize the active action"),
+            ('CHOSEN', "Chosen", "Symmetrize the chosen actions"),
+            ('RIG', "Rig",
+             "Symmetrize all actions animating bones of the active armature"),
+        ),
+        default='ACTIVE'
+    )
+
+    actions: CollectionProperty(
+        type=T113D_PG_SymmetrizeActionEntry
+    )
+
+    use_incremental: BoolProperty(
+        name="Incremental",
+        description=(
+            "Only regenerate the mirrored curves whose source curve changed"
+            " since the last run (direct method only)"
+        ),
+        default=True
+    )
+
+    def invoke(self, context, event):
+        self._load()
+        return self.invoke(context, event)
+
+    def check(self, context):
+        self._load()
+        return self.check(context)
+
+    def draw(self, context):
+        self._load()
+        self.draw(context)
@@ -0,0 +1,63 @@
+import bpy
+from bpy.props import BoolProperty, StringProperty
+
+# the add-on's root module, which the preferences are registered for
+ADDON_NAME = __package__.rpartition(".")[0]
+
+
+class T113D_Preferences(bpy.types.AddonPreferences):
+    bl_idname = ADDON_NAME
+
+    custom_side_pairs: StringProperty(
+        name="Custom Side Pairs",
+        description=(
+            "Additional left/right name parts used to pair bones, as comma"
+            " separated left:right pairs (e.g. \"Lf:Rt, Izq:Der\")"
+        ),
+        default=""
+    )
+
+    use_instrumentation: BoolProperty(
+        name="Instrumentation",
+        description=(
+            "Measure the time of each operator phase, and report it to the"
+            " info log and the instrumentation log file"
+        ),
+        default=False
+    )
+
+    use_memory_tracing: BoolProperty(
+        name="Trace Memory",
+        description=(
+            "Also measure the memory allocated by each phase. Slows down"
+            " the operators considerably"
+        ),
+        default=False
+    )
+
+    instrumentation_log: StringProperty(
+        name="Log File",
+        description=(
+            "File the measurements get appended to. Uses blender's user"
+            " config directory if empty"
+        ),
+        subtype='FILE_PATH',
+        default=""
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "custom_side_pairs")
+
+        layout.prop(self, "use_instrumentation")
+        column = layout.column()
+        column.enabled = self.use_instrumentation
+        column.prop(self, "use_memory_tracing")
+        column.prop(self, "instrumentation_log")
+
+
+def get_preferences():
+    """Returns the add-on preferences, or None if the add-on is not enabled
+    through the preferences (e.g. when loaded by a script)"""
+    addon = bpy.context.preferences.addons.get(ADDON_NAME)
+    return None if addon is None else addon.preferences
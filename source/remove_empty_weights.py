@@ -1,29 +1,49 @@
+import time
 import bpy
+import numpy as np
 
+from . import instrumentation, kernels, vertex_weights
 
-class T113D_OT_RemoveEmptyWeights(bpy.types.Operator):
-    bl_idname = "t113d.remove_empty_groups"
-    bl_label = "Remove Empty"
-    bl_description = "Removes all groups with no weights"
-    bl_options = {'UNDO'}
+
+class RemoveEmptyWeights:
+    """Implementation of operators.T113D_OT_RemoveEmptyWeights"""
 
     @classmethod
     def poll(cls, context):
-        active = context.active_object
-        return active is not None and len(active.vertex_groups) > 0
+        return len(vertex_weights.get_weighted_objects(context)) > 0
 
+    @instrumentation.instrumented
     def execute(self, context):
-        active = context.active_object
-        mesh: bpy.types.Mesh = active.data
-
-        has_weight = [False] * len(active.vertex_groups)
-        for v in mesh.vertices:
-            for g in v.groups:
-                has_weight[g.group] = True
-
-        to_remove = [
-            g for g in active.vertex_groups if not has_weight[g.index]]
-        for r in to_remove:
-            active.vertex_groups.remove(r)
+        # vertex groups are stored on the mesh, so removing them from one
+        # object removes (and reindexes) them for all objects sharing it
+        processed: set[bpy.types.Mesh] = set()
+
+        for obj in vertex_weights.get_weighted_objects(context):
+            mesh: bpy.types.Mesh = obj.data
+            if mesh in processed:
+                self.report(
+                    {'INFO'},
+                    f"{obj.name}: skipped, shares its mesh with an already"
+                    " processed object"
+                )
+                continue
+
+            processed.add(mesh)
+            start = time.perf_counter()
+
+            _, groups, _ = vertex_weights.read_vertex_weights(mesh)
+            empty = kernels.get_empty_groups(
+                np.unique(groups), len(obj.vertex_groups))
+
+            to_remove = [obj.vertex_groups[int(i)] for i in empty]
+            for r in to_remove:
+                obj.vertex_groups.remove(r)
+
+            elapsed = (time.perf_counter() - start) * 1000
+            self.report(
+                {'INFO'},
+                f"{obj.name}: removed {len(to_remove)} empty group(s)"
+                f" in {elapsed:.2f} ms"
+            )
 
         return {'FINISHED'}
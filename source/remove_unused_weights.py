@@ -1,45 +1,87 @@
 import bpy
 
+from . import instrumentation, vertex_weights
 
-class T113D_OT_RemoveUnusedWeights(bpy.types.Operator):
-    bl_idname = "t113d.remove_unused_weights"
-    bl_label = "Remove Unused"
-    bl_description = (
-        "Removes all groups that are not used in the assigned armature/s"
-        " (from the object's armature modifier/s)"
-    )
-    bl_options = {'UNDO'}
 
-    @classmethod
-    def poll(cls, context):
-        active = context.active_object
-        if active is None or len(active.vertex_groups) == 0:
+class RemoveUnusedWeights:
+    """Implementation of operators.T113D_OT_RemoveUnusedWeights"""
+
+    @staticmethod
+    def _is_bound(obj: bpy.types.Object):
+        if obj is None or len(obj.vertex_groups) == 0:
             return False
 
-        for m in active.modifiers:
+        for m in obj.modifiers:
             if m.type == 'ARMATURE' and m.object is not None:
                 return True
 
         return False
 
+    @classmethod
+    def poll(cls, context):
+        return (
+            cls._is_bound(context.active_object)
+            or any(cls._is_bound(o) for o in context.selected_objects)
+        )
+
+    def _get_objects(self, context):
+        if self.mode == 'ACTIVE':
+            objects = [context.active_object]
+        elif self.mode == 'SELECTED':
+            objects = context.selected_objects
+        else:
+            objects = context.scene.objects
+
+        return [o for o in objects if self._is_bound(o)]
+
+    @staticmethod
+    def _get_mesh_users(context, meshes: set[bpy.types.Mesh]):
+        """All bound objects using each of the meshes, including the ones
+        outside of the processed objects"""
+
+        result: dict[bpy.types.Mesh, list[bpy.types.Object]] = {}
+        for obj in context.blend_data.objects:
+            if obj.data in meshes and RemoveUnusedWeights._is_bound(obj):
+                result.setdefault(obj.data, []).append(obj)
+
+        return result
+
+    @instrumentation.instrumented
     def execute(self, context):
 
-        active = context.active_object
+        # one deform bone index per armature, shared by all bound objects
+        deform_bones: dict[bpy.types.Armature, frozenset[str]] = {}
 
-        armatures = list()
-        for m in active.modifiers:
-            if m.type == 'ARMATURE' and m.object is not None:
-                armatures.append(m.object.data)
-
-        used = list()
-        for a in armatures:
-            for b in a.bones:
-                if b.use_deform:
-                    used.append(b.name)
-
-        groups = list(active.vertex_groups)
-        for g in groups:
-            if g.name not in used:
-                active.vertex_groups.remove(g)
+        removed = 0
+        objects = self._get_objects(context)
+
+        # vertex groups are stored on the mesh, so a group stays as long as
+        # any armature of an object using the mesh deforms with it
+        mesh_users = self._get_mesh_users(context, {o.data for o in objects})
+
+        for mesh, users in mesh_users.items():
+            used = set()
+            for obj in users:
+                for armature in vertex_weights.get_armatures(obj):
+                    bones = deform_bones.get(armature)
+                    if bones is None:
+                        bones = vertex_weights.get_deform_bone_names(
+                            armature)
+                        deform_bones[armature] = bones
+
+                    used.update(bones)
+
+            vertex_groups = users[0].vertex_groups
+            to_remove = [g for g in vertex_groups if g.name not in used]
+            for g in to_remove:
+                vertex_groups.remove(g)
+
+            removed += len(to_remove)
+
+        self.report(
+            {'INFO'},
+            f"Removed {removed} unused group(s) from"
+            f" {len(objects)} object(s)"
+        )
 
         return {'FINISHED'}
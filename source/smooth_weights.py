@@ -0,0 +1,94 @@
+import bpy
+import numpy as np
+
+from . import instrumentation, kernels, vertex_weights
+from .average_weight import AverageWeight
+
+
+class SmoothWeights(AverageWeight):
+    """Implementation of operators.T113D_OT_SmoothWeights"""
+
+    def _get_adjacency(self, mesh: bpy.types.Mesh):
+        return kernels.build_adjacency(
+            self._get_edges(mesh), len(mesh.vertices))
+
+    @instrumentation.instrumented
+    def execute(self, context):
+
+        active = context.active_object
+        mesh: bpy.types.Mesh = active.data
+
+        groups = self._get_groups(active)
+        if len(groups) == 0:
+            self.report({'WARNING'}, "No vertex groups to smooth")
+            return {'CANCELLED'}
+
+        selected = np.zeros(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+
+        rows = np.flatnonzero(selected)
+        if len(rows) == 0:
+            return {'CANCELLED'}
+
+        previous = vertex_weights.read_vertex_weights(mesh)
+        vertices, group_indices, weights = previous
+
+        # built once, shared by all iterations and groups
+        row_adjacency = kernels.get_adjacency_rows(
+            self._get_adjacency(mesh), rows)
+
+        group_count = len(active.vertex_groups)
+        if len(group_indices) > 0:
+            group_count = max(group_count, int(group_indices.max()) + 1)
+        smoothed = np.zeros(group_count, dtype=bool)
+
+        new_groups = []
+        new_weights = []
+        values = np.zeros(len(mesh.vertices), dtype=np.float64)
+
+        # assignments sorted by group once, each group is a slice of them
+        by_group = np.argsort(group_indices, kind='stable')
+        sorted_groups = group_indices[by_group]
+
+        for group in groups:
+            assignments = by_group[
+                np.searchsorted(sorted_groups, group.index, 'left'):
+                np.searchsorted(sorted_groups, group.index, 'right')]
+
+            values[:] = 0
+            values[vertices[assignments]] = weights[assignments]
+
+            result = kernels.smooth_values(
+                values, rows, row_adjacency,
+                self.factor, self.iterations)[rows]
+
+            smoothed[group.index] = True
+            new_groups.append(np.full(len(rows), group.index))
+            new_weights.append(result)
+
+        # replace the smoothed groups on the selected vertices, leaving out
+        # vertices that ended up without weight
+        keep = ~(smoothed[group_indices] & selected[vertices])
+
+        new_vertices = np.tile(rows, len(groups))
+        new_groups = np.concatenate(new_groups)
+        new_weights = np.concatenate(new_weights)
+        assigned = new_weights > 0
+
+        vertices = np.concatenate(
+            (vertices[keep], new_vertices[assigned]))
+        order = np.argsort(vertices, kind='stable')
+
+        vertex_weights.write_vertex_weights(
+            active,
+            previous,
+            vertices[order],
+            np.concatenate((
+                group_indices[keep],
+                new_groups[assigned].astype(group_indices.dtype)))[order],
+            np.concatenate((
+                weights[keep],
+                new_weights[assigned].astype(weights.dtype)))[order],
+            selected)
+
+        return {'FINISHED'}
@@ -1,12 +1,74 @@
+import hashlib
 import typing
 import bpy
-from bpy.props import BoolProperty, FloatProperty
+import numpy as np
 from bpy.types import Context, Event
 
+from . import bone_pairing, instrumentation, kernels
+from .keyframe_snapshot import KeyframeSnapshot, VALUE_PROPERTIES
+
 MODIFIER_IGNORE_ATTRIBS = {
     '__doc__', '__module__', '__slots__', 'active',
     'bl_rna', 'is_valid', 'rna_type', 'type'}
 
+# properties that depend on others and need to be copied last
+MODIFIER_LATE_ATTRIBS = ('coefficients',)
+
+# bone and keyframe states that get restored after symmetrizing
+BONE_STATES = ("select", "hide")
+KEYFRAME_STATES = (
+    "select_control_point",
+    "select_left_handle",
+    "select_right_handle")
+
+# action property storing the fingerprints of the mirrored source curves
+FINGERPRINT_PROPERTY = "t113d_symmetrize_fingerprints"
+
+# transform channels (and their array indices) that get negated when
+# mirroring, same as when pasting flipped in the graph editor
+FLIPPED_CHANNELS = {
+    "location": {0},
+    "rotation_quaternion": {2, 3},
+    "rotation_euler": {1, 2},
+    "rotation_axis_angle": {2, 3},
+}
+
+
+# fmodifier type: names of the properties copied between modifiers
+_modifier_properties: dict[str, tuple[str, ...]] = {}
+
+
+def get_modifier_properties(modifier: bpy.types.FModifier):
+    """Returns the names of the copyable properties of a modifier, resolved
+    once per modifier type from RNA"""
+
+    result = _modifier_properties.get(modifier.type)
+    if result is not None:
+        return result
+
+    names = [
+        p.identifier for p in modifier.bl_rna.properties
+        if not p.is_readonly
+        and p.type not in {'POINTER', 'COLLECTION'}
+        and p.identifier not in MODIFIER_IGNORE_ATTRIBS]
+
+    names.sort(key=lambda name: name in MODIFIER_LATE_ATTRIBS)
+
+    result = tuple(names)
+    _modifier_properties[modifier.type] = result
+    return result
+
+
+def copy_modifier(source: bpy.types.FModifier, target: bpy.types.FModifier):
+    for name in get_modifier_properties(source):
+        setattr(target, name, getattr(source, name))
+
+    if source.type == 'ENVELOPE':
+        for point in source.control_points:
+            target_point = target.control_points.add(point.frame)
+            target_point.min = point.min
+            target_point.max = point.max
+
 
 class ActionSymmetrizer:
     _prev_mode: str
@@ -14,75 +76,43 @@ class ActionSymmetrizer:
     _pose: bpy.types.Pose
     _action: bpy.types.Action
 
-    _selected_bones: set[bpy.types.PoseBone]
-    _hidden_bones: set[bpy.types.PoseBone]
-    _hidden_layers: set[int]
+    _bone_states: dict[str, np.ndarray]
+    _layers: tuple[bool]
 
-    _selected_curves: set[bpy.types.FCurve]
-    _hidden_curves: set[bpy.types.FCurve]
+    # select and hide flags of the curves, in their order before running
+    _curve_select: np.ndarray
+    _curve_hide: np.ndarray
 
-    _selected_keyframes: set[bpy.types.Keyframe]
-    _selected_left_handles: set[bpy.types.Keyframe]
-    _selected_right_handles: set[bpy.types.Keyframe]
+    # per curve, identified by data path and array index:
+    # (index in the flags, keyframe count, packed keyframe selection flags)
+    _curve_states: dict[tuple[str, int], tuple[int, int, np.ndarray]]
 
+    _pairing_table: kernels.BonePairingTable
     _bone_curves: dict[str, set[bpy.types.FCurve]]
     _sym_name_pairs: dict[str, str]
     _sym_curve_pairs: dict[bpy.types.FCurve, bpy.types.FCurve]
 
-    def __init__(self):
+    def __init__(self, pairing_table: kernels.BonePairingTable = None):
         self._prev_mode = 'OBJECT'
         self._armature = None
         self._pose = None
         self._action = None
 
-        self._selected_bones = set()
-        self._hidden_bones = set()
-        self._hidden_layers = set()
-
-        self._selected_curves = set()
-        self._hidden_curves = set()
-
-        self._selected_keyframes = set()
-        self._selected_left_handles = set()
-        self._selected_right_handles = set()
+        self._bone_states = {}
+        self._layers = ()
+        self._curve_select = np.empty(0, dtype=bool)
+        self._curve_hide = np.empty(0, dtype=bool)
+        self._curve_states = {}
 
+        self._pairing_table = pairing_table
         self._bone_curves = {}
         self._sym_name_pairs = {}
         self._sym_curve_pairs = {}
 
     @staticmethod
     def _get_symmetrized_name(name: str):
-        lowercase = name.lower()
-        result = name
-
-        if lowercase.endswith('left'):
-            base_name = name[:-4]
-            if name[-4] == 'l':
-                result = base_name + 'right'
-            elif name[-3] == 'e':
-                result = base_name + 'Right'
-            else:
-                result = base_name + 'RIGHT'
-
-        elif lowercase.startswith('left'):
-            base_name = name[4:]
-            if name[0] == 'l':
-                result = 'right' + base_name
-            elif name[1] == 'e':
-                result = 'Right' + base_name
-            else:
-                result = 'RIGHT' + base_name
-
-        elif lowercase[-1] == 'l' and lowercase[-2] in ['.', '_', '-', ' ']:
-            result = result[:-1] + ('R' if name[-1] == 'L' else 'r')
-
-        elif lowercase[0] == 'l' and lowercase[1] in ['.', '_', '-', ' ']:
-            result = ('R' if name[0] == 'L' else 'r') + result[1:]
-
-        else:
-            return None
-
-        return result
+        return kernels.get_symmetrized_name(
+            name, bone_pairing.get_custom_pairs())
 
     def _collect_states(self, context: Context):
         self._prev_mode = context.mode
@@ -90,85 +120,86 @@ class ActionSymmetrizer:
         self._pose = context.active_object.pose
         self._action = context.active_object.animation_data.action
 
-        self._selected_bones = set(
-            [b for b in self._pose.bones if b.bone.select])
-        self._hidden_bones = set([b for b in self._pose.bones if b.bone.hide])
-        self._hidden_layers = set(
-            [i for i, l in enumerate(self._armature.layers) if not l])
+        bones = self._armature.bones
+        for name in BONE_STATES:
+            self._bone_states[name] = np.empty(len(bones), dtype=bool)
+            bones.foreach_get(name, self._bone_states[name])
 
-        self._selected_curves = set(
-            [f for f in self._action.fcurves if f.select])
-        self._hidden_curves = set([f for f in self._action.fcurves if f.hide])
+        self._layers = tuple(self._armature.layers)
 
-        for fcurve in self._action.fcurves:
-            for kf in fcurve.keyframe_points:
-                if kf.select_control_point:
-                    self._selected_keyframes.add(kf)
-                if kf.select_left_handle:
-                    self._selected_left_handles.add(kf)
-                if kf.select_right_handle:
-                    self._selected_right_handles.add(kf)
+        fcurves = self._action.fcurves
+        self._curve_select = np.empty(len(fcurves), dtype=bool)
+        self._curve_hide = np.empty(len(fcurves), dtype=bool)
+        fcurves.foreach_get("select", self._curve_select)
+        fcurves.foreach_get("hide", self._curve_hide)
 
-    def _collect_curves(self):
-        for bone in self._pose.bones:
-            sym_name = ActionSymmetrizer._get_symmetrized_name(bone.name)
-            if sym_name is not None:
-                self._sym_name_pairs[bone.name] = sym_name
-                self._bone_curves[bone.name] = set()
-                self._bone_curves[sym_name] = set()
+        for i, fcurve in enumerate(fcurves):
+            keyframe_points = fcurve.keyframe_points
+            count = len(keyframe_points)
+
+            flags = np.empty((len(KEYFRAME_STATES), count), dtype=bool)
+            for j, name in enumerate(KEYFRAME_STATES):
+                keyframe_points.foreach_get(name, flags[j])
+
+            self._curve_states[(fcurve.data_path, fcurve.array_index)] = (
+                i, count, np.packbits(flags, axis=1))
+
+    def _forget_curve_state(self, fcurve: bpy.types.FCurve):
+        self._curve_states.pop((fcurve.data_path, fcurve.array_index), None)
+
+    def _collect_pairs(self):
+        table = self._pairing_table
+        if table is None:
+            table = bone_pairing.get_pairing_table(self._armature)
+
+        for left_name, right_name in table.left_to_right.items():
+            self._sym_name_pairs[left_name] = right_name
+            self._bone_curves[left_name] = set()
+            self._bone_curves[right_name] = set()
 
         curves: list[bpy.types.FCurve] = list(self._action.fcurves)
         curves.sort(key=lambda x: (x.data_path, x.array_index))
 
         for fcurve in curves:
-            if not fcurve.data_path.startswith("pose.bones[\""):
-                continue
-
-            end = fcurve.data_path.index("\"]")
-            bone_name = fcurve.data_path[12:end]
-
+            bone_name = kernels.get_bone_name(fcurve.data_path)
             if bone_name in self._bone_curves:
                 self._bone_curves[bone_name].add(fcurve)
 
-        for left_name, right_name in self._sym_name_pairs.items():
-            # deleting previously existing curves
-            right_curves = self._bone_curves[right_name]
-            for right_curve in right_curves:
-                self._action.fcurves.remove(right_curve)
-
-            right_curves.clear()
+    def _remove_curve(self, fcurve: bpy.types.FCurve):
+        self._forget_curve_state(fcurve)
+        self._action.fcurves.remove(fcurve)
 
-            for left_curve in self._bone_curves[left_name]:
-                # creating right sided copy
-                right_data_path = left_curve.data_path.replace(
-                    left_name, right_name)
+    def _create_right_curve(
+            self,
+            left_curve: bpy.types.FCurve,
+            left_name: str,
+            right_name: str):
 
-                right_curve = self._action.fcurves.new(
-                    right_data_path,
-                    index=left_curve.array_index,
-                    action_group=right_name)
+        right_data_path = left_curve.data_path.replace(left_name, right_name)
 
-                right_curve.lock = False
-                right_curve.hide = False
-                right_curve.mute = left_curve.mute
-                right_curve.extrapolation = left_curve.extrapolation
+        right_curve = self._action.fcurves.new(
+            right_data_path,
+            index=left_curve.array_index,
+            action_group=right_name)
 
-                right_curve.keyframe_points.insert(
-                    left_curve.keyframe_points[0].co.x, 0, options={'FAST'})
+        right_curve.lock = False
+        right_curve.hide = False
+        right_curve.mute = left_curve.mute
+        right_curve.extrapolation = left_curve.extrapolation
 
-                for left_modifier in left_curve.modifiers:
-                    right_modifier = right_curve.modifiers.new(
-                        left_modifier.type)
+        if len(left_curve.keyframe_points) > 0:
+            right_curve.keyframe_points.insert(
+                left_curve.keyframe_points[0].co.x, 0, options={'FAST'})
 
-                    for p in dir(left_modifier):
-                        if p in MODIFIER_IGNORE_ATTRIBS:
-                            continue
-                        value = getattr(left_modifier, p)
-                        setattr(right_modifier, p, value)
+        for left_modifier in left_curve.modifiers:
+            right_modifier = right_curve.modifiers.new(left_modifier.type)
+            copy_modifier(left_modifier, right_modifier)
 
-                right_curves.add(right_curve)
-                self._sym_curve_pairs[left_curve] = right_curve
+        self._bone_curves[right_name].add(right_curve)
+        self._sym_curve_pairs[left_curve] = right_curve
+        return right_curve
 
+    def _setup_groups(self):
         for left_curve, right_curve in self._sym_curve_pairs.items():
             right_group = right_curve.group
             left_group = left_curve.group
@@ -180,24 +211,52 @@ class ActionSymmetrizer:
             if left_group is not None:
                 right_group.mute = left_group.mute
 
+    def _collect_curves(self):
+        self._collect_pairs()
+
+        for left_name, right_name in self._sym_name_pairs.items():
+            # deleting previously existing curves
+            right_curves = self._bone_curves[right_name]
+            for right_curve in right_curves:
+                self._remove_curve(right_curve)
+
+            right_curves.clear()
+
+            for left_curve in self._bone_curves[left_name]:
+                self._create_right_curve(left_curve, left_name, right_name)
+
+        self._setup_groups()
+
     def _prepare(self):
         bpy.ops.object.mode_set(mode='POSE')
 
         for i in range(len(self._armature.layers)):
             self._armature.layers[i] = True
 
-        for bone in self._pose.bones:
-            bone.bone.hide = False
-            bone.bone.select = bone.name in self._sym_name_pairs
-
-        for fcurve in self._action.fcurves:
-            fcurve.hide = False
-            fcurve.select = fcurve in self._sym_curve_pairs
-
-            for kf in fcurve.keyframe_points:
-                kf.select_control_point = fcurve.select
-                kf.select_left_handle = False
-                kf.select_right_handle = False
+        bones = self._armature.bones
+        bones.foreach_set("hide", np.zeros(len(bones), dtype=bool))
+        bones.foreach_set(
+            "select",
+            np.fromiter(
+                (b.name in self._sym_name_pairs for b in bones),
+                dtype=bool, count=len(bones)))
+
+        fcurves = self._action.fcurves
+        curve_select = np.fromiter(
+            (f in self._sym_curve_pairs for f in fcurves),
+            dtype=bool, count=len(fcurves))
+        fcurves.foreach_set("hide", np.zeros(len(fcurves), dtype=bool))
+        fcurves.foreach_set("select", curve_select)
+
+        for fcurve, select in zip(fcurves, curve_select.tolist()):
+            keyframe_points = fcurve.keyframe_points
+            count = len(keyframe_points)
+            keyframe_points.foreach_set(
+                "select_control_point", np.full(count, select))
+            keyframe_points.foreach_set(
+                "select_left_handle", np.zeros(count, dtype=bool))
+            keyframe_points.foreach_set(
+                "select_right_handle", np.zeros(count, dtype=bool))
 
         bpy.ops.graph.copy()
 
@@ -222,68 +281,259 @@ class ActionSymmetrizer:
 
     def _cleanup(self):
 
-        for layer in self._hidden_layers:
-            self._armature.layers[layer] = False
+        self._armature.layers = self._layers
 
-        for bone in self._pose.bones:
-            bone.bone.hide = bone in self._hidden_bones
-            bone.bone.select = bone in self._selected_bones
+        bones = self._armature.bones
+        for name, states in self._bone_states.items():
+            bones.foreach_set(name, states)
 
-        for fcurve in self._action.fcurves:
-            fcurve.select = fcurve in self._selected_curves
-            fcurve.hide = fcurve in self._hidden_curves
+        fcurves = self._action.fcurves
 
-            for kf in fcurve.keyframe_points:
-                kf.select_control_point = kf in self._selected_keyframes
-                kf.select_left_handle = kf in self._selected_left_handles
-                kf.select_right_handle = kf in self._selected_right_handles
+        # index of every curve in the collected flags, -1 for curves and
+        # keyframes that did not exist before (or changed), which end up
+        # deselected and visible
+        previous = np.full(len(fcurves), -1, dtype=np.int64)
+
+        for i, fcurve in enumerate(fcurves):
+            keyframe_points = fcurve.keyframe_points
+            count = len(keyframe_points)
+
+            state = self._curve_states.get(
+                (fcurve.data_path, fcurve.array_index))
+
+            if state is None or state[1] != count:
+                flags = np.zeros((len(KEYFRAME_STATES), count), dtype=bool)
+            else:
+                previous[i] = state[0]
+                flags = np.unpackbits(
+                    state[2], axis=1, count=count).view(bool)
+
+            for j, name in enumerate(KEYFRAME_STATES):
+                keyframe_points.foreach_set(name, flags[j])
+
+        # -1 picks the appended False
+        fcurves.foreach_set(
+            "select", np.append(self._curve_select, False)[previous])
+        fcurves.foreach_set(
+            "hide", np.append(self._curve_hide, False)[previous])
 
         bpy.ops.object.mode_set(mode=self._prev_mode)
 
     def execute(self, context: Context, offset: float):
-        self._collect_states(context)
-        self._collect_curves()
+        with instrumentation.measure("collect_states"):
+            self._collect_states(context)
+        with instrumentation.measure("collect_curves"):
+            self._collect_curves()
 
         context.view_layer.update()
 
-        self._prepare()
-        self._insert(offset)
-        self._cleanup()
+        with instrumentation.measure("prepare"):
+            self._prepare()
+        with instrumentation.measure("insert"):
+            self._insert(offset)
+        with instrumentation.measure("cleanup"):
+            self._cleanup()
+
+
+class DirectActionSymmetrizer(ActionSymmetrizer):
+    """Mirrors the curves by writing flipped keyframe arrays directly, without
+    using the clipboard or changing modes and selections.
+
+    A fingerprint of every source curve gets stored on the action, so that
+    incremental runs only regenerate the curves whose source changed.
+    """
+
+    _offset: float
+    _incremental: bool
+    _snapshots: dict[bpy.types.FCurve, KeyframeSnapshot]
+
+    updated_count: int
+    skipped_count: int
+
+    def __init__(
+            self,
+            incremental: bool = False,
+            pairing_table: kernels.BonePairingTable = None):
+
+        super().__init__(pairing_table)
+        self._offset = 0
+        self._incremental = incremental
+        self._snapshots = {}
+
+        self.updated_count = 0
+        self.skipped_count = 0
+
+    @staticmethod
+    def _is_flipped(fcurve: bpy.types.FCurve):
+        channel = fcurve.data_path.rpartition('.')[2]
+        indices = FLIPPED_CHANNELS.get(channel)
+        return indices is not None and fcurve.array_index in indices
+
+    @staticmethod
+    def _get_curve_key(data_path: str, array_index: int):
+        # ID property names are limited to 63 characters, so data paths
+        # can not be used directly
+        return hashlib.blake2b(
+            f"{data_path}[{array_index}]".encode(),
+            digest_size=8).hexdigest()
+
+    def _get_fingerprint(
+            self,
+            left_curve: bpy.types.FCurve,
+            snapshot: KeyframeSnapshot,
+            right_data_path: str):
+
+        digest = hashlib.blake2b(digest_size=16)
+
+        for name in VALUE_PROPERTIES:
+            digest.update(snapshot[name].tobytes())
+
+        settings = [
+            right_data_path,
+            left_curve.array_index,
+            left_curve.mute,
+            left_curve.extrapolation,
+            self._offset]
+
+        for modifier in left_curve.modifiers:
+            settings.append(modifier.type)
+            for name in get_modifier_properties(modifier):
+                value = getattr(modifier, name)
+                if hasattr(value, "__len__") and not isinstance(value, str):
+                    value = tuple(value)
+                settings.append(value)
+
+            if modifier.type == 'ENVELOPE':
+                settings.extend(
+                    (p.frame, p.min, p.max) for p in modifier.control_points)
+
+        digest.update(repr(settings).encode())
+        return digest.hexdigest()
+
+    def _collect_curves(self):
+        self._collect_pairs()
+
+        stored = self._action.get(FINGERPRINT_PROPERTY)
+        stored = {} if stored is None else stored.to_dict()
+        fingerprints = {}
+
+        for left_name, right_name in self._sym_name_pairs.items():
+            right_curves = {
+                (c.data_path, c.array_index): c
+                for c in self._bone_curves[right_name]}
+
+            for left_curve in self._bone_curves[left_name]:
+                right_data_path = left_curve.data_path.replace(
+                    left_name, right_name)
+                right_curve = right_curves.pop(
+                    (right_data_path, left_curve.array_index), None)
+
+                snapshot = KeyframeSnapshot.from_fcurve(left_curve)
+                fingerprint = self._get_fingerprint(
+                    left_curve, snapshot, right_data_path)
+                key = self._get_curve_key(
+                    right_data_path, left_curve.array_index)
+                fingerprints[key] = fingerprint
+
+                if right_curve is not None:
+                    if self._incremental and stored.get(key) == fingerprint:
+                        self.skipped_count += 1
+                        continue
+
+                    self._bone_curves[right_name].discard(right_curve)
+                    self._remove_curve(right_curve)
+
+                self._create_right_curve(left_curve, left_name, right_name)
+                self._snapshots[left_curve] = snapshot
+
+            # right curves without a left counterpart
+            for right_curve in right_curves.values():
+                self._bone_curves[right_name].discard(right_curve)
+                self._remove_curve(right_curve)
+
+        self._action[FINGERPRINT_PROPERTY] = fingerprints
+        self._setup_groups()
+
+    def _insert(self, offset: float):
+        for left_curve, right_curve in self._sym_curve_pairs.items():
+            snapshot = self._snapshots[left_curve]
+            flipped = self._is_flipped(left_curve)
+
+            for name in ("co", "handle_left", "handle_right"):
+                values = snapshot[name]
+                values[:, 0] = values[:, 0].astype(np.float64) + offset
+                if flipped:
+                    values[:, 1] *= -1
 
+            for name in KEYFRAME_STATES:
+                snapshot[name][:] = False
 
-class T113D_OT_SymmetrizeAction(bpy.types.Operator):
-    bl_idname = "t113d.symmetrize_action"
-    bl_label = "Symmetrize Action"
-    bl_description = "Symmetrizes the active action"
-    bl_options = {'REGISTER', 'PRESET', 'UNDO'}
+            snapshot.write(right_curve)
+            right_curve.update()
 
-    use_custom_offset: BoolProperty(
-        name="Use Custom Offset",
-        default=False
-    )
+        self.updated_count = len(self._sym_curve_pairs)
 
-    custom_offset: FloatProperty(
-        name="Custom Offset",
-        default=0
-    )
+    def symmetrize(
+            self,
+            armature_object: bpy.types.Object,
+            action: bpy.types.Action,
+            offset: float):
+
+        # nothing gets changed outside of the action, so there is no need
+        # to store any states
+        self._armature = armature_object.data
+        self._pose = armature_object.pose
+        self._action = action
+        self._offset = offset
+
+        with instrumentation.measure("collect_curves"):
+            self._collect_curves()
+        with instrumentation.measure("insert"):
+            self._insert(offset)
+
+    def execute(self, context: Context, offset: float):
+        obj = context.active_object
+        self.symmetrize(obj, obj.animation_data.action, offset)
+
+
+class SymmetrizeAction:
+    """Implementation of operators.T113D_OT_SymmetrizeAction"""
 
     @classmethod
     def poll(cls, context: Context):
         return (
-            context.area.type in ['GRAPH_EDITOR', 'DOPESHEET_EDITOR']
-            and context.mode in ["OBJECT", "POSE"]
+            context.mode in ["OBJECT", "POSE"]
             and context.active_object is not None
             and context.active_object.type == 'ARMATURE'
-            and context.active_object.animation_data is not None
-            and context.active_object.animation_data.action is not None
         )
 
+    @staticmethod
+    def _get_active_action(context: Context):
+        animation_data = context.active_object.animation_data
+        return None if animation_data is None else animation_data.action
+
+    @staticmethod
+    def _get_rig_actions(context: Context):
+        bone_names = {b.name for b in context.active_object.data.bones}
+
+        return [
+            a for a in context.blend_data.actions
+            if a.id_root == 'OBJECT'
+            and any(
+                kernels.get_bone_name(f.data_path) in bone_names
+                for f in a.fcurves)]
+
+    def _get_offset(self, action: bpy.types.Action):
+        if self.use_custom_offset:
+            return self.custom_offset
+
+        return (action.frame_range[1] - action.frame_range[0]) * 0.5
+
     def check(self, context: Context):
 
-        if not self.use_custom_offset:
-            action = context.active_object.animation_data.action
-            new_offset = (
-                action.frame_range[1] - action.frame_range[0]) * 0.5
+        action = self._get_active_action(context)
+        if not self.use_custom_offset and action is not None:
+            new_offset = self._get_offset(action)
 
             changed = new_offset != self.custom_offset
 
@@ -295,15 +545,99 @@ class T113D_OT_SymmetrizeAction(bpy.types.Operator):
         return False
 
     def invoke(self, context: Context, event: Event):
+        active_action = self._get_active_action(context)
+
+        self.actions.clear()
+        for action in self._get_rig_actions(context):
+            entry = self.actions.add()
+            entry.name = action.name
+            entry.selected = action == active_action
+
         self.check(context)
         return self.execute(context)
 
     def draw(self, context: Context):
+        self.layout.prop(self, "action_mode")
+        if self.action_mode == 'CHOSEN':
+            column = self.layout.column(align=True)
+            for entry in self.actions:
+                column.prop(entry, "selected", text=entry.name)
+
+        self.layout.prop(self, "method")
+        row = self.layout.row()
+        row.active = self.method == 'DIRECT'
+        row.prop(self, "use_incremental")
         self.layout.prop(self, "use_custom_offset")
         row = self.layout.row()
         row.active = self.use_custom_offset
         row.prop(self, "custom_offset")
 
+    def _get_actions(self, context: Context):
+        if self.action_mode == 'ACTIVE':
+            action = self._get_active_action(context)
+            return [] if action is None else [action]
+
+        if self.action_mode == 'RIG':
+            return self._get_rig_actions(context)
+
+        actions = context.blend_data.actions
+        return [
+            actions[e.name] for e in self.actions
+            if e.selected and e.name in actions]
+
+    def _execute_direct(self, context: Context, actions: list):
+        obj = context.active_object
+
+        # one pairing for all actions
+        pairing_table = bone_pairing.get_pairing_table(obj.data)
+
+        updated = 0
+        skipped = 0
+
+        for action in actions:
+            symmetrizer = DirectActionSymmetrizer(
+                self.use_incremental, pairing_table)
+
+            offset = self._get_offset(action)
+            if self.action_mode == 'ACTIVE':
+                offset = self.custom_offset
+
+            symmetrizer.symmetrize(obj, action, offset)
+
+            updated += symmetrizer.updated_count
+            skipped += symmetrizer.skipped_count
+
+        self.report(
+            {'INFO'},
+            f"Symmetrized {updated} curve(s) in {len(actions)} action(s),"
+            f" skipped {skipped} unchanged"
+        )
+
+        return {'FINISHED'}
+
+    @instrumentation.instrumented
     def execute(self, context: Context):
+        actions = self._get_actions(context)
+        if len(actions) == 0:
+            self.report({'WARNING'}, "No actions to symmetrize")
+            return {'CANCELLED'}
+
+        if self.method == 'DIRECT':
+            return self._execute_direct(context, actions)
+
+        if self.action_mode != 'ACTIVE':
+            self.report(
+                {'ERROR'},
+                "The clipboard method can only symmetrize the active action")
+            return {'CANCELLED'}
+
+        if (context.area is None
+                or context.area.type
+                not in ['GRAPH_EDITOR', 'DOPESHEET_EDITOR']):
+            self.report(
+                {'ERROR'},
+                "The clipboard method requires a graph or dopesheet editor")
+            return {'CANCELLED'}
+
         ActionSymmetrizer().execute(context, self.custom_offset)
         return {'FINISHED'}
@@ -1,42 +1,84 @@
+from fnmatch import fnmatchcase
 import bpy
-import math
+import numpy as np
 
+from . import instrumentation
+from .kernels import get_mirror_map, mirror_coordinates
 
-class T113D_OT_SymmetryizeLattice(bpy.types.Operator):
-    """Symmetrizes a lattice"""
-    bl_idname = "t113d.symmetrize_lattice"
-    bl_label = "Symmetrize lattice"
-    bl_description = "Symmetrizes a lattice"
-    bl_options = {'UNDO'}
+
+class SymmetrizeLattice:
+    """Implementation of operators.T113D_OT_SymmetryizeLattice"""
+
+    @staticmethod
+    def _get_lattices(context):
+        objects = [o for o in context.selected_objects if o.type == "LATTICE"]
+
+        active = context.active_object
+        if (active is not None
+                and active.type == "LATTICE"
+                and active not in objects):
+            objects.append(active)
+
+        # lattice data may be shared between objects
+        return list(dict.fromkeys(o.data for o in objects))
 
     @classmethod
     def poll(cls, context):
         return (
             context.mode == "OBJECT"
-            and context.active_object is not None
-            and context.active_object.type == "LATTICE"
+            and len(cls._get_lattices(context)) > 0
         )
 
-    def execute(self, context):
-        lattice: bpy.types.Lattice = context.active_object.data
+    def _get_key_blocks(self, context, lattice: bpy.types.Lattice):
+        if self.shape_keys == 'NONE' or lattice.shape_keys is None:
+            return []
+
+        key_blocks = lattice.shape_keys.key_blocks
+
+        if self.shape_keys == 'ALL':
+            return list(key_blocks)
 
-        row_num = lattice.points_v * lattice.points_w
-        loop_num = math.ceil(lattice.points_u / 2.0)
+        if self.shape_keys == 'ACTIVE':
+            obj = context.active_object
+            if (obj is None
+                    or obj.data != lattice
+                    or obj.active_shape_key is None):
+                return []
+            return [obj.active_shape_key]
+
+        return [
+            k for k in key_blocks
+            if fnmatchcase(k.name, self.shape_key_filter)]
+
+    def _symmetrize(self, collection, attribute: str, mirror_map):
+        coordinates = np.empty(len(collection) * 3, dtype=np.float32)
+        collection.foreach_get(attribute, coordinates)
+
+        coordinates = mirror_coordinates(
+            coordinates.reshape(-1, 3), mirror_map, self.axis)
+
+        collection.foreach_set(attribute, coordinates.ravel())
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        for lattice in self._get_lattices(context):
+            mirror_map = get_mirror_map(
+                (lattice.points_u, lattice.points_v, lattice.points_w),
+                self.axis,
+                self.direction)
 
-        for row_index in range(row_num):
-            start_index = row_index * lattice.points_u
+            key_blocks = self._get_key_blocks(context, lattice)
 
-            for loop_index in range(loop_num):
-                ni = start_index + loop_index
-                pi = start_index + lattice.points_u - (1 + loop_index)
+            # the reference key mirrors the lattice points, so they are
+            # kept in sync
+            if (self.shape_keys == 'NONE'
+                    or lattice.shape_keys is None
+                    or lattice.shape_keys.reference_key in key_blocks):
+                self._symmetrize(lattice.points, "co_deform", mirror_map)
 
-                np = lattice.points[ni]
-                pp = lattice.points[pi]
+            for key_block in key_blocks:
+                self._symmetrize(key_block.data, "co", mirror_map)
 
-                if pi == ni:
-                    pp.co_deform.x = 0
-                else:
-                    np.co_deform = pp.co_deform
-                    np.co_deform.x = -pp.co_deform.x
+            lattice.update_tag()
 
         return {'FINISHED'}
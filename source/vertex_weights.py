@@ -0,0 +1,211 @@
+from itertools import chain
+
+import bmesh
+import bpy
+import numpy as np
+
+from . import kernels
+
+
+def get_weighted_objects(context: bpy.types.Context):
+    """The selected meshes and the active one that have vertex groups"""
+
+    objects = [
+        o for o in context.selected_objects
+        if o.type == 'MESH' and len(o.vertex_groups) > 0]
+
+    active = context.active_object
+    if (active is not None
+            and active not in objects
+            and active.type == 'MESH'
+            and len(active.vertex_groups) > 0):
+        objects.append(active)
+
+    return objects
+
+
+def get_armatures(obj: bpy.types.Object):
+    """The armatures of the object's armature modifiers"""
+
+    return [
+        m.object.data for m in obj.modifiers
+        if m.type == 'ARMATURE'
+        and m.object is not None
+        and m.object.type == 'ARMATURE']
+
+
+def get_deform_bone_names(
+        armature: bpy.types.Armature,
+        selected_only: bool = False):
+    """Names of the deforming bones of the armature"""
+
+    return frozenset(
+        b.name for b in armature.bones
+        if b.use_deform and (not selected_only or b.select))
+
+
+def get_object_deform_bone_names(
+        obj: bpy.types.Object,
+        selected_only: bool = False):
+    """Deforming bone names of all armatures of the object"""
+
+    result = set()
+    for armature in get_armatures(obj):
+        result.update(get_deform_bone_names(armature, selected_only))
+
+    return result
+
+
+def _get_bmesh(mesh: bpy.types.Mesh):
+    if mesh.is_editmode:
+        return bmesh.from_edit_mesh(mesh), False
+
+    result = bmesh.new()
+    result.from_mesh(mesh)
+    return result, True
+
+
+def read_vertex_weights(mesh: bpy.types.Mesh):
+    """Reads all vertex group assignments of a mesh in one go.
+
+    Returns three flat arrays of equal length, holding the vertex index,
+    group index and weight of every assignment, ordered by vertex.
+    """
+
+    bm, owned = _get_bmesh(mesh)
+
+    try:
+        layer = bm.verts.layers.deform.active
+        if layer is None:
+            return (
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.float32))
+
+        deform = [v[layer] for v in bm.verts]
+
+        counts = np.fromiter(
+            map(len, deform), dtype=np.int32, count=len(deform))
+        total = int(counts.sum())
+
+        groups = np.fromiter(
+            chain.from_iterable(dv.keys() for dv in deform),
+            dtype=np.int32, count=total)
+        weights = np.fromiter(
+            chain.from_iterable(dv.values() for dv in deform),
+            dtype=np.float32, count=total)
+
+    finally:
+        if owned:
+            bm.free()
+
+    vertices = np.repeat(
+        np.arange(len(counts), dtype=np.int32), counts)
+
+    return vertices, groups, weights
+
+
+def _write_bmesh(
+        mesh: bpy.types.Mesh,
+        removed: tuple[np.ndarray, np.ndarray],
+        assigned: tuple[np.ndarray, np.ndarray, np.ndarray]):
+
+    bm, owned = _get_bmesh(mesh)
+
+    try:
+        layer = bm.verts.layers.deform.verify()
+        bm.verts.ensure_lookup_table()
+
+        for vertex, group in zip(*(a.tolist() for a in removed)):
+            del bm.verts[vertex][layer][group]
+
+        for vertex, group, weight in zip(*(a.tolist() for a in assigned)):
+            bm.verts[vertex][layer][group] = weight
+
+        if owned:
+            bm.to_mesh(mesh)
+            mesh.update()
+        else:
+            bmesh.update_edit_mesh(mesh)
+
+    finally:
+        if owned:
+            bm.free()
+
+
+def _group_runs(*keys: np.ndarray):
+    """Sorts by the keys (last one first) and returns the order, as well
+    as the start and end of every run of equal keys in it"""
+
+    order = np.lexsort(keys)
+    different = np.zeros(max(len(order) - 1, 0), dtype=bool)
+    for key in keys:
+        sorted_key = key[order]
+        different |= sorted_key[1:] != sorted_key[:-1]
+
+    starts = np.concatenate(([0], np.flatnonzero(different) + 1))
+    ends = np.append(starts[1:], len(order))
+    return order, starts.tolist(), ends.tolist()
+
+
+def _write_groups(
+        obj: bpy.types.Object,
+        removed: tuple[np.ndarray, np.ndarray],
+        assigned: tuple[np.ndarray, np.ndarray, np.ndarray]):
+
+    vertices, groups = removed
+    if len(vertices) > 0:
+        order, starts, ends = _group_runs(groups)
+        vertices = vertices[order]
+
+        for start, end in zip(starts, ends):
+            obj.vertex_groups[int(groups[order[start]])].remove(
+                vertices[start:end].tolist())
+
+    vertices, groups, weights = assigned
+    if len(vertices) > 0:
+        # one call for all vertices receiving the same weight in a group
+        order, starts, ends = _group_runs(weights, groups)
+        vertices = vertices[order]
+
+        for start, end in zip(starts, ends):
+            obj.vertex_groups[int(groups[order[start]])].add(
+                vertices[start:end].tolist(),
+                float(weights[order[start]]),
+                'REPLACE')
+
+
+def write_vertex_weights(
+        obj: bpy.types.Object,
+        previous: tuple[np.ndarray, np.ndarray, np.ndarray],
+        vertices: np.ndarray,
+        groups: np.ndarray,
+        weights: np.ndarray,
+        changed: np.ndarray = None):
+    """Replaces the vertex group assignments of the object's mesh with the
+    arrays in the format of read_vertex_weights. Only the assignments that
+    differ from `previous`, the arrays read before, get written. If a mask
+    of changed vertices is given, only those get compared.
+
+    Blender has no bulk setter for vertex group weights, so the cost still
+    grows with the changes: removals take one call per group, assignments
+    one call per group and distinct weight, which for smoothed, mirrored
+    or normalized weights comes close to one call per assignment. In edit
+    mode every change is a python level bmesh write. The cleanup_weights
+    benchmark cases measure both ends.
+    """
+
+    removed, assigned = kernels.diff_weights(
+        previous, (vertices, groups, weights), changed)
+
+    mesh: bpy.types.Mesh = obj.data
+    group_count = len(obj.vertex_groups)
+
+    # vertex groups can not be edited in edit mode, and assignments of
+    # groups that no longer exist only through bmesh
+    if (mesh.is_editmode
+            or int(removed[1].max(initial=-1)) >= group_count
+            or int(assigned[1].max(initial=-1)) >= group_count):
+        _write_bmesh(mesh, removed, assigned)
+    else:
+        _write_groups(obj, removed, assigned)
@@ -0,0 +1,17 @@
+"""The tests run in plain python. Blender's modules get replaced by the
+stand-ins in benchmarks/standin when they are not available"""
+
+import os
+import sys
+
+TEST_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIRECTORY = os.path.dirname(TEST_DIRECTORY)
+
+try:
+    import bpy  # noqa: F401
+except ImportError:
+    sys.path.insert(
+        0, os.path.join(ROOT_DIRECTORY, "benchmarks", "standin"))
+
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
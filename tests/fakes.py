@@ -0,0 +1,110 @@
+"""Fake meshes, vertex groups and objects for the weight operators. The
+stand-ins of benchmarks/standin do not back any mesh data"""
+
+import types
+
+import bpy
+import numpy as np
+
+
+def create_operator(implementation: type, **properties):
+    """Instance of an operator implementation with the properties set"""
+
+    cls = type(
+        implementation.__name__, (implementation, bpy.types.Operator), {})
+    return cls(**properties)
+
+
+class Group:
+    """Records the calls of the VertexGroup API in the mesh"""
+
+    def __init__(self, mesh: "Mesh", name: str, index: int):
+        self.mesh = mesh
+        self.name = name
+        self.index = index
+        self.lock_weight = False
+
+    def add(self, vertices: list[int], weight: float, mode: str):
+        self.mesh.calls.append(("add", self, sorted(vertices), weight, mode))
+
+    def remove(self, vertices: list[int]):
+        self.mesh.calls.append(("remove", self, sorted(vertices)))
+
+
+class VertexGroups(list):
+    """Removing a group also removes its assignments and reindexes the
+    following groups, like blender does"""
+
+    def __init__(self, mesh: "Mesh", names: list[str]):
+        super().__init__(Group(mesh, n, i) for i, n in enumerate(names))
+        self._mesh = mesh
+
+    def remove(self, group: Group):
+        mesh = self._mesh
+        index = self.index(group)
+        super().remove(group)
+
+        for i, g in enumerate(self):
+            g.index = i
+
+        keep = mesh.groups != index
+        mesh.vertices = mesh.vertices[keep]
+        mesh.weights = mesh.weights[keep]
+        mesh.groups = mesh.groups[keep]
+        mesh.groups[mesh.groups > index] -= 1
+
+
+class Mesh:
+    """Holds the vertex groups like blender does since 3.0, so that all
+    objects using the mesh share them. Assignments are (vertex, group,
+    weight) tuples, ordered by vertex"""
+
+    is_editmode = False
+
+    def __init__(self, names: list[str], assignments: list[tuple] = ()):
+        self.calls = []
+        self.vertex_groups = VertexGroups(self, names)
+        self.vertices = np.array([a[0] for a in assignments], np.int32)
+        self.groups = np.array([a[1] for a in assignments], np.int32)
+        self.weights = np.array([a[2] for a in assignments], np.float32)
+
+    def get_weights(self):
+        """(group name, vertex, weight) of every assignment"""
+        return {
+            (self.vertex_groups[g].name, v, w) for v, g, w in zip(
+                self.vertices.tolist(),
+                self.groups.tolist(),
+                self.weights.tolist())}
+
+
+def read_vertex_weights(mesh: Mesh):
+    """Replacement of vertex_weights.read_vertex_weights"""
+    return mesh.vertices, mesh.groups, mesh.weights
+
+
+class Armature:
+
+    def __init__(self, deform_bones: list[str]):
+        self.bones = [
+            types.SimpleNamespace(name=b, use_deform=True, select=False)
+            for b in deform_bones]
+
+
+class Object:
+
+    type = 'MESH'
+
+    def __init__(
+            self,
+            name: str,
+            mesh: Mesh,
+            armatures: list[Armature] = ()):
+
+        self.name = name
+        self.data = mesh
+        self.vertex_groups = mesh.vertex_groups
+        self.modifiers = [
+            types.SimpleNamespace(
+                type='ARMATURE',
+                object=types.SimpleNamespace(type='ARMATURE', data=a))
+            for a in armatures]
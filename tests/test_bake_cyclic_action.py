@@ -0,0 +1,85 @@
+import bpy
+import numpy as np
+import pytest
+
+from source.bake_cyclic_action import BakeCyclicAction
+
+
+class _Operator(BakeCyclicAction, bpy.types.Operator):
+    bl_idname = "t113d.bake_cyclic_action"
+    mode = 'ACTIVE'
+    use_reduce = False
+    reduce_tolerance = 0.001
+
+
+@pytest.fixture(autouse=True)
+def _clear_actions():
+    bpy.data.actions.clear()
+    yield
+    bpy.data.actions.clear()
+
+
+def _create_action(name: str, frames, values, frame_range):
+    action = bpy.data.actions.new(name)
+    action.use_cyclic = True
+    action.use_frame_range = True
+    action.frame_start, action.frame_end = frame_range
+
+    fcurve = action.fcurves.new("[\"prop\"]")
+    fcurve.keyframe_points.add(len(frames))
+    fcurve.keyframe_points.foreach_set(
+        "co", np.column_stack((frames, values)).astype(np.float32).ravel())
+    fcurve.modifiers.new('CYCLES')
+
+    return action
+
+
+def test_all_skips_baked_actions():
+    _create_action("walk", [0, 5, 10], [0, 1, 0], (0, 30))
+
+    operator = _Operator(mode='ALL')
+    assert operator.execute(bpy.types.Context()) == {'FINISHED'}
+    assert [a.name for a in bpy.data.actions] == ["walk", "walk_baked"]
+
+    # nothing uses the copy, so it needs a fake user to be saved
+    assert bpy.data.actions[1].use_fake_user
+
+    # renamed copies are still recognized, and not baked again
+    bpy.data.actions[1].name = "walk_cycle"
+
+    operator = _Operator(mode='ALL')
+    assert operator.execute(bpy.types.Context()) == {'FINISHED'}
+    assert [a.name for a in bpy.data.actions] == ["walk", "walk_cycle"]
+
+
+def _get_frames(action):
+    keyframe_points = action.fcurves[0].keyframe_points
+    co = np.empty(len(keyframe_points) * 2, dtype=np.float32)
+    keyframe_points.foreach_get("co", co)
+    return co[::2].tolist()
+
+
+def _bake(action):
+    operator = _Operator()
+    operator._divisible_interpolations = {0, 1, 2}
+    operator._reduced = {}
+    return operator, operator._bake_action(action)
+
+
+def test_trim_inserts_range_keyframes():
+    action = _create_action("walk", [0, 10, 20], [0, 1, 0], (0, 15))
+    action.fcurves[0].modifiers.clear()
+
+    _, baked = _bake(action)
+    assert _get_frames(baked) == [0.0, 10.0, 15.0]
+
+
+def test_trim_fails_on_replaced_keyframe():
+    # inserting on frame 30 replaces the value of the keyframe next to it
+    action = _create_action("walk", [0, 10, 29.995], [0, 1, 0], (0, 30))
+    action.fcurves[0].modifiers.clear()
+
+    operator, baked = _bake(action)
+    assert baked is None
+    assert "frame 30" in operator._error_message
+    assert [a.name for a in bpy.data.actions] == ["walk"]
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from source import bone_pairing
+
+
+class _Armature:
+
+    def __init__(self, names: list[str]):
+        self.bones = [SimpleNamespace(name=n) for n in names]
+
+    def as_pointer(self):
+        return 1
+
+
+def test_table_follows_renames():
+    bone_pairing.clear_cache()
+    armature = _Armature(["arm.L", "arm.R", "leg.L", "foot.R"])
+
+    table = bone_pairing.get_pairing_table(armature)
+    assert table.left_to_right == {"arm.L": "arm.R"}
+    assert bone_pairing.get_pairing_table(armature) is table
+
+    # renamed without any notification, as in background mode or on undo
+    armature.bones[3].name = "leg.R"
+    table = bone_pairing.get_pairing_table(armature)
+    assert table.left_to_right == {"arm.L": "arm.R", "leg.L": "leg.R"}
+
+
+def test_table_follows_pointer_reuse():
+    bone_pairing.clear_cache()
+    bone_pairing.get_pairing_table(_Armature(["arm.L", "arm.R"]))
+
+    table = bone_pairing.get_pairing_table(_Armature(["hand.L", "hand.R"]))
+    assert table.left_to_right == {"hand.L": "hand.R"}
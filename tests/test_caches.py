@@ -0,0 +1,9 @@
+from source import caches
+
+
+def test_caches_cleared_on_load():
+    cache = caches.new_cache()
+    cache[1] = "table"
+
+    caches._on_load_post(None)
+    assert cache == {}
@@ -0,0 +1,65 @@
+import tracemalloc
+
+import bpy
+import pytest
+
+from source import instrumentation
+
+
+class _Operator(bpy.types.Operator):
+    bl_idname = "t113d.test"
+
+    @instrumentation.instrumented
+    def execute(self, context):
+        with instrumentation.measure("phase"):
+            self.tracing = tracemalloc.is_tracing()
+            bytearray(1 << 20)
+        return {'FINISHED'}
+
+
+@pytest.fixture(autouse=True)
+def _instrumentation(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        instrumentation, "get_log_path", lambda: str(tmp_path / "log"))
+    instrumentation.clear_results()
+    yield
+    instrumentation.enable(None)
+    instrumentation.clear_results()
+
+
+def test_timing_only():
+    instrumentation.enable(True)
+    operator = _Operator()
+    operator.execute(None)
+
+    assert not operator.tracing
+    phases = instrumentation.get_results("t113d.test")
+    assert phases["phase"]["calls"] == 1
+    assert phases["phase"]["peak"] == 0
+
+
+def test_memory_tracing():
+    instrumentation.enable(True, trace_memory=True)
+    operator = _Operator()
+    operator.execute(None)
+
+    assert operator.tracing
+    assert not tracemalloc.is_tracing()
+    assert instrumentation.get_results("t113d.test")["phase"]["peak"] >= (
+        1 << 20)
+
+
+def test_outer_tracer_untouched():
+    instrumentation.enable(True, trace_memory=True)
+
+    tracemalloc.start()
+    try:
+        bytearray(4 << 20)
+        _, peak = tracemalloc.get_traced_memory()
+
+        _Operator().execute(None)
+
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= peak
+    finally:
+        tracemalloc.stop()
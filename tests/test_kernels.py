@@ -0,0 +1,631 @@
+"""Tests of the kernels against straightforward per element versions of
+the same algorithms, most of them taken from the tools before the kernels
+were split out"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+from source import kernels
+
+
+###############################################################################
+# bone name pairing
+
+def _reference_symmetrized_name(name: str):
+    """Name pairing of the original Symmetrize Action operator"""
+
+    lowercase = name.lower()
+    result = name
+
+    if lowercase.endswith('left'):
+        base_name = name[:-4]
+        if name[-4] == 'l':
+            result = base_name + 'right'
+        elif name[-3] == 'e':
+            result = base_name + 'Right'
+        else:
+            result = base_name + 'RIGHT'
+
+    elif lowercase.startswith('left'):
+        base_name = name[4:]
+        if name[0] == 'l':
+            result = 'right' + base_name
+        elif name[1] == 'e':
+            result = 'Right' + base_name
+        else:
+            result = 'RIGHT' + base_name
+
+    elif lowercase[-1] == 'l' and lowercase[-2] in ['.', '_', '-', ' ']:
+        result = result[:-1] + ('R' if name[-1] == 'L' else 'r')
+
+    elif lowercase[0] == 'l' and lowercase[1] in ['.', '_', '-', ' ']:
+        result = ('R' if name[0] == 'L' else 'r') + result[1:]
+
+    else:
+        return None
+
+    return result
+
+
+AFFIX_NAMES = [
+    "arm.L", "arm_l", "arm-L", "arm l", "L.arm", "l_arm",
+    "armLeft", "arm_left", "ARM_LEFT", "LeftArm", "left_arm", "LEFTARM",
+    "arm.R", "arm", "root", "spine.001",
+]
+
+
+def test_symmetrized_name_matches_reference():
+    for name in AFFIX_NAMES:
+        expected = _reference_symmetrized_name(name)
+        if expected is not None:
+            assert kernels.get_symmetrized_name(name) == expected, name
+
+
+def test_symmetrized_name_extensions():
+    cases = {
+        "arm.L.001": "arm.R.001",
+        "arm_left.002": "arm_right.002",
+        "thigh.L.twist": "thigh.R.twist",
+        "upperArmL": "upperArmR",
+        "footL.001": "footR.001",
+        "foot_L_ik.002": "foot_R_ik.002",
+        "l": None,
+        "L": None,
+        "hand_Left_ik": "hand_Right_ik",
+        "arm.R": None,
+        "spine": None,
+    }
+
+    for name, expected in cases.items():
+        assert kernels.get_symmetrized_name(name) == expected, name
+
+
+def test_symmetrized_name_custom_pairs():
+    pairs = kernels.parse_custom_pairs(" Lf:Rt, Izq:Der ,broken")
+    assert pairs == (("Lf", "Rt"), ("Izq", "Der"))
+    assert kernels.get_symmetrized_name("armLf", pairs) == "armRt"
+    assert kernels.get_symmetrized_name("brazo_Izq", pairs) == "brazo_Der"
+
+
+def test_pairing_table():
+    names = ["arm.L", "arm.R", "leg.L", "hand_left", "hand_right", "spine"]
+    table = kernels.BonePairingTable(names)
+
+    assert table.left_to_right == {
+        "arm.L": "arm.R", "hand_left": "hand_right"}
+    assert table.get_mirror("arm.R") == "arm.L"
+    assert table.get_mirror("leg.L") is None
+
+
+def test_bone_name():
+    assert kernels.get_bone_name("pose.bones[\"arm.L\"].location") == "arm.L"
+    assert kernels.get_bone_name("location") is None
+
+
+###############################################################################
+# lattice mirroring
+
+def _reference_mirror(
+        coordinates: np.ndarray,
+        resolution: tuple[int, int, int],
+        axis: str,
+        direction: str):
+    """Per point loop of the original Symmetrize Lattice operator,
+    extended to all axes and directions"""
+
+    points_u, points_v, points_w = resolution
+    counts = {'X': points_u, 'Y': points_v, 'Z': points_w}
+    component = "XYZ".index(axis)
+
+    result = coordinates.copy()
+    for w in range(points_w):
+        for v in range(points_v):
+            for u in range(points_u):
+                position = {'X': u, 'Y': v, 'Z': w}
+                index = position[axis]
+                mirrored = counts[axis] - 1 - index
+                position[axis] = mirrored
+
+                source = (
+                    position['Z'] * points_v * points_u
+                    + position['Y'] * points_u
+                    + position['X'])
+                target = w * points_v * points_u + v * points_u + u
+
+                if index == mirrored:
+                    result[target, component] = 0
+                elif (index < mirrored) == (direction == 'POSITIVE'):
+                    result[target] = coordinates[source]
+                    result[target, component] *= -1
+
+    return result
+
+
+def test_mirror_coordinates_matches_reference():
+    rng = np.random.default_rng(0)
+
+    for resolution in ((4, 3, 2), (5, 2, 3), (1, 3, 4)):
+        count = resolution[0] * resolution[1] * resolution[2]
+        coordinates = rng.normal(0, 1, (count, 3)).astype(np.float32)
+
+        for axis in "XYZ":
+            for direction in ('POSITIVE', 'NEGATIVE'):
+                mirror_map = kernels.get_mirror_map(
+                    resolution, axis, direction)
+                result = kernels.mirror_coordinates(
+                    coordinates, mirror_map, axis)
+
+                np.testing.assert_array_equal(
+                    result,
+                    _reference_mirror(
+                        coordinates, resolution, axis, direction))
+
+
+###############################################################################
+# keyframes and cycles
+
+def test_index_lookups():
+    frames = np.array([0.0, 1.0, 1.5, 4.0], dtype=np.float32)
+
+    for frame in (-1.0, 0.0, 0.5, 1.5, 3.0, 4.0, 5.0):
+        before = [i for i, f in enumerate(frames) if f <= frame]
+        assert kernels.index_before(frames, frame) == (
+            before[-1] if before else -1)
+
+        on = [i for i, f in enumerate(frames) if f == frame]
+        assert kernels.index_of(frames, frame) == (on[0] if on else -1)
+
+
+def _reference_cycle_repeats(
+        frames, interpolations, divisible, target, source, source_range):
+    """Repeat count of the original Bake Cyclic Action operator"""
+
+    if target == source:
+        return 0
+
+    result = math.ceil((source - target) / source_range)
+    cut_frame = target + source_range * result
+    index = max(i for i, f in enumerate(frames) if f <= cut_frame)
+
+    if frames[index] != cut_frame and interpolations[index] not in divisible:
+        return None
+
+    return max(result, 0)
+
+
+def test_cycle_repeats_match_reference():
+    frames = np.array([0.0, 10.0, 20.0, 25.0, 40.0], dtype=np.float32)
+    interpolations = np.array([2, 2, 5, 2, 2], dtype=np.int32)
+
+    for target in (-95.0, -40.0, -37.5, -3.0, 0.0):
+        assert kernels.get_cycle_repeats(
+            frames, interpolations, {0, 1, 2}, target, 0.0, 40.0)[0] == \
+            _reference_cycle_repeats(
+                frames, interpolations, {0, 1, 2}, target, 0.0, 40.0)
+
+    for target in (40.0, 62.0, 63.0, 200.5):
+        assert kernels.get_cycle_repeats(
+            frames, interpolations, {0, 1, 2}, target, 40.0, -40.0)[0] == \
+            _reference_cycle_repeats(
+                frames, interpolations, {0, 1, 2}, target, 40.0, -40.0)
+
+
+def test_repeat_keyframes_matches_reference():
+    """The tiled repeats are exactly the keyframes the original per
+    keyframe loop created, which computed offsets in double precision and
+    stored single precision values"""
+
+    rng = np.random.default_rng(0)
+    count = 7
+    co = np.column_stack((
+        np.cumsum(rng.random(count)) * 3.3,
+        rng.normal(0, 1, count))).astype(np.float32)
+    data = {
+        "co": co,
+        "handle_left": co - rng.random((count, 2)).astype(np.float32),
+        "handle_right": co + rng.random((count, 2)).astype(np.float32),
+        "interpolation": rng.integers(0, 3, count, dtype=np.int32),
+    }
+
+    start, stop, repeats, offset = 1, count, 4, 12.7
+    result = kernels.repeat_keyframes(data, start, stop, repeats, offset)
+
+    index = 0
+    for p in range(start, stop):
+        for i in range(repeats):
+            new_co = np.array(
+                (float(co[p, 0]) + (i + 1) * offset, float(co[p, 1])),
+                dtype=np.float32)
+            np.testing.assert_array_equal(result["co"][index], new_co)
+
+            for handle in ("handle_left", "handle_right"):
+                expected = new_co + (data[handle][p] - co[p])
+                np.testing.assert_array_equal(
+                    result[handle][index], expected)
+
+            assert result["interpolation"][index] == \
+                data["interpolation"][p]
+            index += 1
+
+    assert index == len(result["co"])
+
+
+###############################################################################
+# weights
+
+def _reference_clean_weights(
+        vertices, groups, weights, cleaned_groups, locked_groups,
+        threshold, limit, normalize):
+    """Per vertex loop over {group: weight} dictionaries"""
+
+    per_vertex = {}
+    for v, g, w in zip(vertices.tolist(), groups.tolist(), weights.tolist()):
+        per_vertex.setdefault(v, {})[g] = w
+
+    result = {}
+    for v, assignments in per_vertex.items():
+        fixed = {
+            g: w for g, w in assignments.items()
+            if not cleaned_groups[g] or locked_groups[g]}
+        cleaned = {
+            g: w for g, w in assignments.items()
+            if g not in fixed and w > threshold}
+
+        if limit > 0:
+            locked = [g for g in fixed if cleaned_groups[g]]
+            slots = max(limit - len(locked), 0)
+            ranked = sorted(cleaned.items(), key=lambda i: -i[1])
+            cleaned = dict(ranked[:slots])
+
+        if normalize:
+            total = sum(cleaned.values())
+            available = max(1.0 - sum(
+                w for g, w in fixed.items() if cleaned_groups[g]), 0)
+            if total > 0:
+                cleaned = {g: w * available / total
+                           for g, w in cleaned.items()}
+
+        result[v] = {**fixed, **cleaned}
+
+    return result
+
+
+def test_clean_weights_matches_reference():
+    rng = np.random.default_rng(0)
+    vertex_count, group_count = 60, 8
+
+    vertices, groups = [], []
+    for v in range(vertex_count):
+        chosen = rng.choice(group_count, rng.integers(0, 7), replace=False)
+        vertices.extend([v] * len(chosen))
+        groups.extend(chosen.tolist())
+
+    vertices = np.array(vertices, dtype=np.int32)
+    groups = np.array(groups, dtype=np.int32)
+    weights = rng.random(len(vertices)).astype(np.float32)
+
+    cleaned = np.array([1, 1, 1, 0, 1, 1, 1, 1], dtype=bool)
+    locked = np.array([0, 1, 0, 1, 0, 0, 0, 1], dtype=bool)
+
+    for threshold, limit, normalize in (
+            (0.0, 0, False), (0.2, 0, True), (0.1, 3, True),
+            (0.0, 2, False), (0.3, 1, True)):
+
+        result = kernels.clean_weights(
+            vertices, groups, weights, cleaned, locked,
+            threshold, limit, normalize)
+        expected = _reference_clean_weights(
+            vertices, groups, weights, cleaned, locked,
+            threshold, limit, normalize)
+
+        actual = {}
+        for v, g, w in zip(*(a.tolist() for a in result[:3])):
+            actual.setdefault(v, {})[g] = w
+
+        for v in range(vertex_count):
+            assert actual.get(v, {}).keys() == expected.get(v, {}).keys()
+            for g, w in expected.get(v, {}).items():
+                assert math.isclose(actual[v][g], w, rel_tol=1e-6)
+
+
+def test_clean_weights_limit_counts_locked():
+    vertices = np.array([0, 0, 0, 0, 1, 1], dtype=np.int32)
+    groups = np.array([0, 1, 2, 3, 1, 2], dtype=np.int32)
+    weights = np.array([0.5, 0.3, 0.2, 0.1, 0.6, 0.4], dtype=np.float32)
+    locked = np.array([True, False, False, False])
+
+    result = kernels.clean_weights(
+        vertices, groups, weights, np.ones(4, dtype=bool), locked,
+        0.0, 2, False)
+
+    assert result[0].tolist() == [0, 0, 1, 1]
+    assert result[1].tolist() == [0, 1, 1, 2]
+    assert result[3].tolist() == [True, False]
+
+
+def test_clean_weights_limit_ignores_other_groups():
+    # a mask and a pin group next to two deform groups
+    vertices = np.zeros(4, dtype=np.int32)
+    groups = np.array([0, 1, 2, 3], dtype=np.int32)
+    weights = np.array([1.0, 1.0, 0.6, 0.4], dtype=np.float32)
+    cleaned = np.array([False, False, True, True])
+
+    result = kernels.clean_weights(
+        vertices, groups, weights, cleaned, np.zeros(4, dtype=bool),
+        0.0, 2, False)
+
+    assert result[1].tolist() == [0, 1, 2, 3]
+    assert result[3].tolist() == [False]
+
+
+def test_clean_weights_limit_below_locked_count():
+    vertices = np.zeros(3, dtype=np.int32)
+    groups = np.array([0, 1, 2], dtype=np.int32)
+    weights = np.array([0.2, 0.3, 0.5], dtype=np.float32)
+    locked = np.array([True, True, False])
+
+    result = kernels.clean_weights(
+        vertices, groups, weights, np.ones(3, dtype=bool), locked,
+        0.0, 1, False)
+
+    # locked weights are never removed, even over the limit
+    assert result[1].tolist() == [0, 1]
+
+
+def test_diff_weights():
+    previous = (
+        np.array([0, 0, 1, 2], dtype=np.int32),
+        np.array([0, 1, 0, 1], dtype=np.int32),
+        np.array([0.5, 0.5, 1.0, 0.25], dtype=np.float32))
+    current = (
+        np.array([0, 0, 1, 1, 2], dtype=np.int32),
+        np.array([1, 0, 0, 2, 1], dtype=np.int32),
+        np.array([0.5, 0.5, 0.75, 0.25, 0.25], dtype=np.float32))
+
+    removed, assigned = kernels.diff_weights(previous, current)
+
+    assert [a.tolist() for a in removed] == [[], []]
+    assert [a.tolist() for a in assigned] == [[1, 1], [0, 2], [0.75, 0.25]]
+
+    removed, assigned = kernels.diff_weights(
+        current, previous, np.array([False, True, True]))
+
+    assert [a.tolist() for a in removed] == [[1], [2]]
+    assert [a.tolist() for a in assigned] == [[1], [0], [1.0]]
+
+
+def _brute_force_mirror(coordinates: np.ndarray, axis: int, tolerance):
+    coordinates = coordinates.astype(np.float64)
+    mirrored = coordinates.copy()
+    mirrored[:, axis] *= -1
+
+    result = []
+    for point in mirrored:
+        distances = np.square(coordinates - point).sum(axis=1)
+        nearest = int(np.argmin(distances))
+        result.append(
+            nearest if distances[nearest] <= tolerance * tolerance else -1)
+
+    return np.array(result)
+
+
+def test_match_mirrored_points_matches_brute_force(monkeypatch):
+    rng = np.random.default_rng(0)
+    half = rng.normal(0, 1, (50, 3))
+    half[:, 0] = np.abs(half[:, 0]) + 0.01
+
+    # slightly asymmetric, with several candidates within the tolerance
+    other = half * (-1, 1, 1) + rng.normal(0, 0.002, (50, 3))
+    close = other + rng.normal(0, 0.002, (50, 3))
+    center = rng.normal(0, 1, (5, 3)) * (0, 1, 1)
+    unmatched = rng.normal(0, 1, (5, 3)) + (3, 0, 0)
+    coordinates = np.concatenate(
+        (half, other, close, center, unmatched)).astype(np.float32)
+
+    for axis in range(3):
+        for tolerance in (0.0, 0.001, 0.005, 0.5):
+            np.testing.assert_array_equal(
+                kernels.match_mirrored_points(coordinates, axis, tolerance),
+                _brute_force_mirror(coordinates, axis, tolerance))
+
+    # candidates compared in several chunks
+    monkeypatch.setattr(kernels, "MATCH_CHUNK_SIZE", 16)
+    np.testing.assert_array_equal(
+        kernels.match_mirrored_points(coordinates, 0, 0.5),
+        _brute_force_mirror(coordinates, 0, 0.5))
+
+
+def test_mirror_weights():
+    vertices = np.array([0, 0, 1, 2, 2], dtype=np.int32)
+    groups = np.array([0, 2, 1, 0, 1], dtype=np.int32)
+    weights = np.array([0.75, 0.25, 0.5, 1.0, 0.125], dtype=np.float32)
+
+    # vertex 0 and 1 mirror each other, vertex 2 lies on the center
+    vertex_mirror = np.array([1, 0, 2])
+    group_mirror = np.array([1, -1, -1])
+
+    result = kernels.mirror_weights(
+        vertices, groups, weights, vertex_mirror, group_mirror)
+
+    actual = {
+        (v, g): w for v, g, w in zip(*(a.tolist() for a in result[:3]))}
+    assert actual == {
+        (0, 0): 0.75, (0, 2): 0.25,
+        (1, 1): 0.75,
+        (2, 0): 1.0, (2, 1): 1.0,
+    }
+
+
+###############################################################################
+# mesh adjacency
+
+def _grid_edges(width: int, height: int):
+    edges = []
+    for y in range(height):
+        for x in range(width):
+            index = y * width + x
+            if x + 1 < width:
+                edges.append((index, index + 1))
+            if y + 1 < height:
+                edges.append((index, index + width))
+
+    return np.array(edges, dtype=np.int32)
+
+
+def _reference_smooth(values, rows, edges, factor, iterations):
+    neighbors = {i: [] for i in range(len(values))}
+    for a, b in edges.tolist():
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+
+    values = [float(v) for v in values]
+    for _ in range(iterations):
+        new_values = list(values)
+        for row in rows:
+            if len(neighbors[row]) == 0:
+                continue
+            average = sum(values[n] for n in neighbors[row]) / len(
+                neighbors[row])
+            new_values[row] = values[row] + (average - values[row]) * factor
+        values = new_values
+
+    return np.array(values)
+
+
+def test_smooth_values_matches_reference():
+    rng = np.random.default_rng(0)
+    edges = _grid_edges(6, 5)
+    vertex_count = 31  # the last vertex has no neighbors
+
+    values = rng.random(vertex_count)
+    rows = np.flatnonzero(rng.random(vertex_count) < 0.6)
+    rows = np.append(rows, vertex_count - 1)
+
+    row_adjacency = kernels.get_adjacency_rows(
+        kernels.build_adjacency(edges, vertex_count), rows)
+
+    np.testing.assert_allclose(
+        kernels.smooth_values(values, rows, row_adjacency, 0.4, 7),
+        _reference_smooth(values, rows, edges, 0.4, 7))
+
+
+def _reference_islands(edges: np.ndarray, selected: np.ndarray):
+    neighbors = {i: [] for i in range(len(selected))}
+    for a, b in edges.tolist():
+        if selected[a] and selected[b]:
+            neighbors[a].append(b)
+            neighbors[b].append(a)
+
+    result = np.full(len(selected), -1)
+    count = 0
+    for start in np.flatnonzero(selected).tolist():
+        if result[start] >= 0:
+            continue
+
+        result[start] = count
+        queue = deque([start])
+        while queue:
+            for n in neighbors[queue.popleft()]:
+                if result[n] < 0:
+                    result[n] = count
+                    queue.append(n)
+
+        count += 1
+
+    return result, count
+
+
+def test_islands_match_reference():
+    rng = np.random.default_rng(0)
+    edges = _grid_edges(12, 9)
+    # shuffled, so that unions happen in an arbitrary order
+    edges = edges[rng.permutation(len(edges))]
+
+    for ratio in (0.3, 0.55, 0.8, 1.0):
+        selected = rng.random(12 * 9) < ratio
+        labels, count = kernels.get_islands(edges, selected)
+        expected, expected_count = _reference_islands(edges, selected)
+
+        assert count == expected_count
+        np.testing.assert_array_equal(labels < 0, expected < 0)
+
+        # same partition, possibly with different island numbers
+        pairs = set(zip(labels[selected].tolist(),
+                        expected[selected].tolist()))
+        assert len(pairs) == count
+
+
+###############################################################################
+# keyframe reduction
+
+def _evaluate_bezier(co, handle_left, handle_right, frames):
+    """Samples a bezier curve at the frames by dense evaluation"""
+
+    t = np.linspace(0, 1, 2001)[:, None]
+    points = []
+    for i in range(len(co) - 1):
+        points.append(
+            (1 - t) ** 3 * co[i]
+            + 3 * (1 - t) ** 2 * t * handle_right[i]
+            + 3 * (1 - t) * t ** 2 * handle_left[i + 1]
+            + t ** 3 * co[i + 1])
+
+    points = np.concatenate(points)
+    return np.interp(frames, points[:, 0], points[:, 1])
+
+
+def _sine_curve(count: int):
+    frames = np.arange(count, dtype=np.float64)
+    values = np.sin(frames / 25)
+    slopes = np.cos(frames / 25) / 25
+
+    co = np.column_stack((frames, values))
+    offsets = np.column_stack((np.full(count, 1 / 3), slopes / 3))
+    return co, co - offsets, co + offsets
+
+
+def test_reduce_keyframes_within_tolerance():
+    co, handle_left, handle_right = _sine_curve(101)
+    bezier = np.ones(len(co), dtype=bool)
+
+    kept, new_left, new_right, changed = kernels.reduce_keyframes(
+        co, handle_left, handle_right, bezier, 0.001)
+
+    assert kept[0] == 0 and kept[-1] == len(co) - 1
+    assert len(kept) < len(co) / 4
+    assert changed.any()
+
+    frames = np.linspace(0, 100, 1001)
+    original = _evaluate_bezier(co, handle_left, handle_right, frames)
+    reduced = _evaluate_bezier(co[kept], new_left, new_right, frames)
+    assert np.abs(original - reduced).max() <= 0.001
+
+
+def test_reduce_keyframes_keeps_other_interpolations():
+    co, handle_left, handle_right = _sine_curve(41)
+    bezier = np.ones(len(co), dtype=bool)
+    bezier[20] = False
+
+    kept, new_left, new_right, changed = kernels.reduce_keyframes(
+        co, handle_left, handle_right, bezier, 0.01)
+
+    assert 20 in kept and 21 in kept
+
+    # handles of keyframes without removed neighbors stay untouched
+    unchanged = ~changed
+    np.testing.assert_array_equal(
+        new_left[unchanged], handle_left[kept[unchanged]])
+    np.testing.assert_array_equal(
+        new_right[unchanged], handle_right[kept[unchanged]])
+
+
+def test_reduce_keyframes_keeps_noise():
+    rng = np.random.default_rng(0)
+    co = np.column_stack((np.arange(30.0), rng.normal(0, 1, 30)))
+    offsets = np.column_stack((np.full(30, 1 / 3), np.zeros(30)))
+
+    kept = kernels.reduce_keyframes(
+        co, co - offsets, co + offsets, np.ones(30, dtype=bool), 0.001)[0]
+    assert len(kept) == 30
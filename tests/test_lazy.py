@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from source import operators, remove_empty_weights
+
+from conftest import TEST_DIRECTORY
+
+# modules imported by register.py
+REGISTER_MODULES = (
+    "operators", "bone_pairing", "caches", "preferences", "menus")
+
+
+def test_registration_skips_implementations():
+    code = (
+        "import sys\n"
+        "import conftest\n"
+        + "".join(f"import source.{m}\n" for m in REGISTER_MODULES)
+        + "print(sorted(m for m in sys.modules if m.startswith('source.')))"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=TEST_DIRECTORY,
+        capture_output=True, text=True, check=True).stdout
+
+    loaded = eval(output)
+    assert "source.kernels" not in loaded
+    assert set(loaded) <= {f"source.{m}" for m in REGISTER_MODULES} | {
+        "source.lazy"}
+
+
+def test_only_defined_callbacks_are_registered():
+    for name in dir(operators):
+        cls = getattr(operators, name)
+        if not isinstance(cls, type) or not issubclass(
+                cls, operators.LazyOperator):
+            continue
+
+        forwards_dialog = cls is operators.T113D_OT_SymmetrizeAction
+        assert hasattr(cls, "invoke") == forwards_dialog, name
+        assert hasattr(cls, "check") == forwards_dialog, name
+
+
+def test_load_replaces_forwarding_methods():
+    # loading into a throwaway subclass leaves the registered stub as is
+    class Stub(operators.T113D_OT_RemoveEmptyWeights):
+        pass
+
+    Stub._load()
+
+    implementation = remove_empty_weights.RemoveEmptyWeights
+    assert Stub._implementation_class is implementation
+    assert Stub.execute is implementation.execute
+    assert not hasattr(Stub, "invoke")
+
+    stub = operators.T113D_OT_RemoveEmptyWeights
+    assert "_implementation_class" not in stub.__dict__
+    assert stub.execute is operators.LazyOperator.execute
@@ -0,0 +1,44 @@
+import bpy
+
+from source import remove_empty_weights, vertex_weights
+
+from fakes import Mesh, Object, create_operator, read_vertex_weights
+
+
+def test_shared_mesh(monkeypatch):
+    monkeypatch.setattr(
+        vertex_weights, "read_vertex_weights", read_vertex_weights)
+
+    mesh = Mesh(
+        ["used_a", "empty", "used_b", "empty_2", "used_c"],
+        [(0, 0, 1.0), (1, 2, 0.5), (1, 4, 0.5), (2, 4, 1.0)])
+    weights = mesh.get_weights()
+
+    context = bpy.types.Context()
+    context.selected_objects = [
+        Object("first", mesh), Object("second", mesh)]
+
+    operator = create_operator(remove_empty_weights.RemoveEmptyWeights)
+    assert operator.execute(context) == {'FINISHED'}
+
+    assert [g.name for g in mesh.vertex_groups] == [
+        "used_a", "used_b", "used_c"]
+    assert mesh.get_weights() == weights
+
+
+def test_separate_meshes(monkeypatch):
+    monkeypatch.setattr(
+        vertex_weights, "read_vertex_weights", read_vertex_weights)
+
+    first = Mesh(["empty", "used"], [(0, 1, 1.0)])
+    second = Mesh(["used", "empty"], [(0, 0, 1.0)])
+
+    context = bpy.types.Context()
+    context.selected_objects = [
+        Object("first", first), Object("second", second)]
+
+    operator = create_operator(remove_empty_weights.RemoveEmptyWeights)
+    operator.execute(context)
+
+    assert [g.name for g in first.vertex_groups] == ["used"]
+    assert [g.name for g in second.vertex_groups] == ["used"]
@@ -0,0 +1,48 @@
+import types
+
+import bpy
+
+from source import remove_unused_weights
+
+from fakes import Armature, Mesh, Object, create_operator
+
+
+def _execute(mode: str, objects: list[Object], selected: list[Object]):
+    context = bpy.types.Context()
+    context.active_object = selected[0]
+    context.selected_objects = selected
+    context.blend_data = types.SimpleNamespace(objects=objects)
+
+    operator = create_operator(
+        remove_unused_weights.RemoveUnusedWeights, mode=mode)
+    assert operator.execute(context) == {'FINISHED'}
+
+
+def test_shared_mesh():
+    mesh = Mesh(["a", "b", "unused", "c"])
+    first = Object("first", mesh, [Armature(["a", "c"])])
+    second = Object("second", mesh, [Armature(["b"])])
+
+    _execute('SELECTED', [first, second], [first, second])
+
+    assert [g.name for g in mesh.vertex_groups] == ["a", "b", "c"]
+
+
+def test_shared_mesh_outside_selection():
+    mesh = Mesh(["a", "b", "unused"])
+    first = Object("first", mesh, [Armature(["a"])])
+    second = Object("second", mesh, [Armature(["b"])])
+
+    _execute('ACTIVE', [first, second], [first])
+
+    assert [g.name for g in mesh.vertex_groups] == ["a", "b"]
+
+
+def test_separate_meshes():
+    first = Object("first", Mesh(["a", "b"]), [Armature(["a"])])
+    second = Object("second", Mesh(["a", "b"]), [Armature(["b"])])
+
+    _execute('SELECTED', [first, second], [first, second])
+
+    assert [g.name for g in first.vertex_groups] == ["a"]
+    assert [g.name for g in second.vertex_groups] == ["b"]
@@ -0,0 +1,46 @@
+import numpy as np
+
+from source import vertex_weights
+
+from fakes import Mesh, Object
+
+
+def _create_object(group_count: int):
+    return Object("object", Mesh([f"group_{i}" for i in range(group_count)]))
+
+
+def test_write_only_differences():
+    obj = _create_object(2)
+    groups = obj.vertex_groups
+
+    previous = (
+        np.array([0, 0, 1, 2, 3], dtype=np.int32),
+        np.array([0, 1, 0, 0, 0], dtype=np.int32),
+        np.array([0.5, 0.5, 1.0, 1.0, 0.1], dtype=np.float32))
+
+    vertex_weights.write_vertex_weights(
+        obj,
+        previous,
+        np.array([0, 1, 1, 2, 3], dtype=np.int32),
+        np.array([0, 0, 1, 0, 0], dtype=np.int32),
+        np.array([1.0, 1.0, 0.25, 0.25, 0.25], dtype=np.float32))
+
+    assert sorted(obj.data.calls, key=repr) == sorted([
+        ("remove", groups[1], [0]),
+        ("add", groups[0], [0], 1.0, 'REPLACE'),
+        ("add", groups[0], [2, 3], 0.25, 'REPLACE'),
+        ("add", groups[1], [1], 0.25, 'REPLACE'),
+    ], key=repr)
+
+
+def test_write_nothing_unchanged():
+    obj = _create_object(1)
+    previous = (
+        np.array([0, 1], dtype=np.int32),
+        np.array([0, 0], dtype=np.int32),
+        np.array([0.5, 0.5], dtype=np.float32))
+
+    vertex_weights.write_vertex_weights(
+        obj, previous, *previous, np.array([True, True]))
+
+    assert obj.data.calls == []